@@ -1,9 +1,21 @@
 // Rust FFI bindings to OSQP embedded MPC solver
 //
 // This module provides safe Rust wrappers around the generated C solver.
+//
+// Generated by mpc/generate_embedded_solver.py from
+// mpc/templates/osqp_ffi.rs.in - edit the template, not this file.
 
 use core::ffi::{c_float, c_int};
 
+/// MPC prediction horizon (steps)
+pub const N_HORIZON: usize = 25;
+/// State dimension (position, velocity, acceleration)
+pub const N_STATES: usize = 3;
+/// Input dimension (jerk)
+pub const N_INPUTS: usize = 1;
+/// Opaque workspace size reserved for the generated solver
+const WORKSPACE_BYTES: usize = 1024;
+
 // Import generated C functions
 extern "C" {
     fn osqp_setup(work: *mut OSQPWorkspace) -> c_int;
@@ -21,7 +33,7 @@ extern "C" {
 #[repr(C)]
 struct OSQPWorkspace {
     // This is a placeholder - actual structure defined in generated code
-    data: [u8; 1024],
+    data: [u8; WORKSPACE_BYTES],
 }
 
 /// Safe Rust wrapper for OSQP embedded solver
@@ -31,7 +43,7 @@ pub struct OSQPSolver {
 
 impl OSQPSolver {
     pub fn new() -> Result<Self, &'static str> {
-        let mut workspace = OSQPWorkspace { data: [0; 1024] };
+        let mut workspace = OSQPWorkspace { data: [0; WORKSPACE_BYTES] };
 
         unsafe {
             let ret = osqp_setup(&mut workspace as *mut _);
@@ -53,7 +65,7 @@ impl OSQPSolver {
             let ret = osqp_solve(&mut self.workspace as *mut _);
             if ret == 0 {
                 // Extract solution (placeholder - actual implementation needed)
-                Ok(vec![0.0; 25])
+                Ok(vec![0.0; N_HORIZON])
             } else {
                 Err("OSQP solve failed")
             }
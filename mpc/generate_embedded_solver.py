@@ -27,9 +27,11 @@ Date: 2025-10-10
 
 import numpy as np
 import scipy.sparse as sp
+import hashlib
 import json
 import os
 import shutil
+import string
 
 
 def load_system_model():
@@ -76,7 +78,8 @@ def setup_mpc_problem(A, B, N=25, dt=0.001):
     # Total: (N+1)*n + N*m = 3N + 3 + N = 4N + 3 variables
 
     n_vars = (N + 1) * n + N * m
-    n_constraints = (N + 1) * n + N * m  # Dynamics + input bounds
+    n_equality = (N + 1) * n  # Initial condition + dynamics
+    n_constraints = n_equality + 2 * (N + 1) + N * m  # + state and input bounds
 
     print(f"MPC Problem Size:")
     print(f"  Horizon: N = {N}")
@@ -87,18 +90,9 @@ def setup_mpc_problem(A, B, N=25, dt=0.001):
     # Cost function: (1/2) x'Px + q'x
     # ========================================
 
-    # P matrix (block diagonal: Q for states, R for inputs)
-    P_blocks = []
-
-    # State cost blocks (Q for each time step)
-    for k in range(N + 1):
-        P_blocks.append(Q)
-
-    # Control cost blocks (R for each time step)
-    for k in range(N):
-        P_blocks.append(R)
-
-    P = sp.block_diag(P_blocks, format="csc")
+    # P matrix (block diagonal: Q for each of the N+1 states, R for each of
+    # the N inputs)
+    P = sp.block_diag([sp.kron(sp.eye(N + 1), Q), sp.kron(sp.eye(N), R)], format="csc")
 
     # q vector (all zeros since we'll update reference at runtime)
     # At runtime: q = -Q @ x_ref for tracking error
@@ -114,66 +108,48 @@ def setup_mpc_problem(A, B, N=25, dt=0.001):
     # 3. State bounds: -v_max ≤ vel ≤ v_max, etc.
     # 4. Input bounds: -j_max ≤ u ≤ j_max
 
-    A_rows = []
-    l_vec = []
-    u_vec = []
-
     # --- Initial condition constraints ---
     # x_0 = x_init (set at runtime via l, u)
-    A_init = sp.lil_matrix((n, n_vars))
-    A_init[:n, :n] = sp.eye(n)
-    A_rows.append(A_init)
-    l_vec.extend([0.0, 0.0, 0.0])  # Will be updated at runtime
-    u_vec.extend([0.0, 0.0, 0.0])
+    A_init = sp.eye(n, n_vars)
 
     # --- Dynamics constraints ---
-    # x_{k+1} - A*x_k - B*u_k = 0
-    for k in range(N):
-        A_dyn = sp.lil_matrix((n, n_vars))
-
-        # x_{k+1} term
-        A_dyn[:n, (k + 1) * n : (k + 2) * n] = sp.eye(n)
-
-        # -A*x_k term
-        A_dyn[:n, k * n : (k + 1) * n] = -A
-
-        # -B*u_k term
-        A_dyn[:n, (N + 1) * n + k * m : (N + 1) * n + (k + 1) * m] = -B
-
-        A_rows.append(A_dyn)
-        l_vec.extend([0.0] * n)
-        u_vec.extend([0.0] * n)
+    # x_{k+1} - A*x_k - B*u_k = 0 for k = 0..N-1: the same block row shifted
+    # along the diagonal, i.e. Kronecker products with (shifted) identities
+    X_next = sp.kron(sp.eye(N, N + 1, k=1), sp.eye(n))
+    X_curr = sp.kron(sp.eye(N, N + 1), A)
+    U_curr = sp.kron(sp.eye(N), B)
+    A_dyn = sp.hstack([X_next - X_curr, -U_curr])
 
     # --- State bounds ---
     # For each time step: -v_max ≤ vel ≤ v_max, -a_max ≤ acc ≤ a_max
-    for k in range(N + 1):
-        A_bound = sp.lil_matrix((2, n_vars))
-
-        # Velocity bound
-        A_bound[0, k * n + 1] = 1.0
-        l_vec.append(-v_max)
-        u_vec.append(v_max)
-
-        # Acceleration bound
-        A_bound[1, k * n + 2] = 1.0
-        l_vec.append(-a_max)
-        u_vec.append(a_max)
-
-        A_rows.append(A_bound)
+    # (rows alternate velocity / acceleration of x_k)
+    state_cols = (np.arange(N + 1)[:, None] * n + [1, 2]).ravel()
 
     # --- Input bounds ---
     # -j_max ≤ u_k ≤ j_max
-    for k in range(N):
-        A_input = sp.lil_matrix((1, n_vars))
-        A_input[0, (N + 1) * n + k] = 1.0
-        A_rows.append(A_input)
-        l_vec.append(-j_max)
-        u_vec.append(j_max)
-
-    # Stack all constraints
-    A_osqp = sp.vstack(A_rows, format="csc")
-    l = np.array(l_vec)
-    u = np.array(u_vec)
+    input_cols = (N + 1) * n + np.arange(N)
+
+    # Both bound groups are row selectors: a single 1 per row
+    bound_cols = np.concatenate([state_cols, input_cols])
+    n_bounds = len(bound_cols)
+    A_bounds = sp.csr_matrix(
+        (np.ones(n_bounds), (np.arange(n_bounds), bound_cols)),
+        shape=(n_bounds, n_vars),
+    )
+
+    # Stack all constraints (zero entries of A and B are not stored)
+    A_osqp = sp.vstack([A_init, A_dyn, A_bounds], format="csc")
+    A_osqp.eliminate_zeros()
+
+    # Initial condition and dynamics rows are equalities (x_init is set at
+    # runtime); bound rows are symmetric
+    l = np.zeros(n_constraints)
+    u = np.zeros(n_constraints)
+    p = n_equality
+    u[p : p + 2 * (N + 1)] = np.tile([v_max, a_max], N + 1)
+    p += 2 * (N + 1)
+    u[p:] = j_max
+    l[n_equality:] = -u[n_equality:]
 
     print(f"  P matrix: {P.shape}, nnz={P.nnz}")
     print(f"  A matrix: {A_osqp.shape}, nnz={A_osqp.nnz}")
@@ -181,33 +157,92 @@ def setup_mpc_problem(A, B, N=25, dt=0.001):
     return P, q, A_osqp, l, u, N, n, m
 
 
-def generate_embedded_code(P, q, A, l, u):
+def problem_signature(P, q, A, l, u, settings=None):
+    """
+    Hash of the QP data baked into the generated solver.
+
+    Covers the sparsity pattern and the values of P and A as well as q, l
+    and u: the generated workspace embeds all of them, so any change needs
+    a fresh code generation. The solver settings are compiled in too; pass
+    them as settings when they are not fixed.
+    """
+    h = hashlib.sha256()
+    for M in (P, A):
+        h.update(np.array(M.shape, dtype=np.int64).tobytes())
+        h.update(M.indptr.tobytes())
+        h.update(M.indices.tobytes())
+        h.update(M.data.tobytes())
+    for v in (q, l, u):
+        h.update(np.ascontiguousarray(v, dtype=np.float64).tobytes())
+    if settings is not None:
+        h.update(repr(sorted(settings.items())).encode())
+    return h.hexdigest()[:16]
+
+
+def setup_osqp(P, q, A, l, u):
+    """
+    Create and set up an OSQP solver for the MPC QP.
+
+    Setup performs the symbolic KKT factorization. When iterating on values
+    only (Q/R weights, bounds) at a fixed horizon, keep the returned solver
+    and pass it to generate_embedded_code as prob: OSQP then updates the
+    data in place instead of setting up from scratch.
+    """
+    import osqp
+
+    prob = osqp.OSQP()
+    prob.setup(
+        P=P,
+        q=q,
+        A=A,
+        l=l,
+        u=u,
+        verbose=False,
+        eps_abs=1e-4,
+        eps_rel=1e-4,
+        max_iter=100,
+    )
+    return prob
+
+
+def generate_embedded_code(P, q, A, l, u, use_float=True, verbose=True, prob=None):
     """
     Generate embedded C code using OSQP code generation.
 
+    Code generation is skipped when embedded_mpc/ already holds a solver
+    generated for the same problem (see problem_signature).
+
+    Args:
+        use_float: Generate the solver in single precision (c_float =
+            float), matching the f32 slices passed by the Rust FFI bindings.
+            False generates a double-precision solver.
+        verbose: List every generated file; otherwise print only the file
+            count (batch/CI runs).
+        prob: Solver from setup_osqp for a problem with the same sparsity
+            pattern; it is updated with the new data instead of setting up
+            a new one.
+
     Note: This requires osqp Python package with codegen support.
     If codegen is not available, this will create a placeholder.
     """
+    if prob is not None:
+        # OSQP stores the upper triangle of P
+        prob.update(Px=sp.triu(P, format="csc").data, Ax=A.data, q=q, l=l, u=u)
+
+    output_dir = "embedded_mpc"
+    sig = problem_signature(P, q, A, l, u) + ("-f32" if use_float else "-f64")
+    sig_file = os.path.join(output_dir, ".codegen_sig")
+    if os.path.exists(sig_file):
+        with open(sig_file, "r") as f:
+            if f.read() == sig:
+                print(f"\n✓ {output_dir}/ is up to date (signature {sig})")
+                return True
+
     try:
-        import osqp
-
-        # Setup OSQP problem
-        prob = osqp.OSQP()
-        prob.setup(
-            P=P,
-            q=q,
-            A=A,
-            l=l,
-            u=u,
-            verbose=False,
-            eps_abs=1e-4,
-            eps_rel=1e-4,
-            max_iter=100,
-        )
+        if prob is None:
+            prob = setup_osqp(P, q, A, l, u)
 
         # Try to generate code
-        output_dir = "embedded_mpc"
-
         # Check if codegen is available
         if hasattr(prob, "codegen"):
             print(f"\n✓ Generating embedded C code to {output_dir}/")
@@ -223,17 +258,22 @@ def generate_embedded_code(P, q, A, l, u):
                     project_type="Makefile",
                     parameters="vectors",  # EMBEDDED_MODE=1 (can update q, l, u)
                     force_rewrite=True,
+                    FLOAT=use_float,
                 )
             except TypeError:
                 # Try simpler API for older/newer versions
-                prob.codegen(output_dir, parameters="vectors")
+                prob.codegen(output_dir, parameters="vectors", use_float=use_float)
 
             print(f"✓ Code generation complete!")
-            print(f"\nGenerated files:")
-            for root, dirs, files in os.walk(output_dir):
-                for f in files:
-                    rel_path = os.path.relpath(os.path.join(root, f), output_dir)
-                    print(f"  {output_dir}/{rel_path}")
+            if verbose:
+                print(f"\nGenerated files:")
+                for root, dirs, files in os.walk(output_dir):
+                    for f in files:
+                        rel_path = os.path.relpath(os.path.join(root, f), output_dir)
+                        print(f"  {output_dir}/{rel_path}")
+            else:
+                n_files = sum(len(files) for _, _, files in os.walk(output_dir))
+                print(f"✓ Generated {n_files} files in {output_dir}/")
 
             # Create README
             with open(f"{output_dir}/README.txt", "w") as f:
@@ -250,6 +290,10 @@ def generate_embedded_code(P, q, A, l, u):
                 f.write("  2. Create FFI bindings in build.rs\n")
                 f.write("  3. Call from mpc.rs module\n")
 
+            # Written last, so an interrupted run regenerates next time
+            with open(sig_file, "w") as f:
+                f.write(sig)
+
             return True
 
         else:
@@ -266,82 +310,23 @@ def generate_embedded_code(P, q, A, l, u):
         return False
 
 
+# Rust FFI bindings template (string.Template placeholders)
+FFI_TEMPLATE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "templates", "osqp_ffi.rs.in"
+)
+
+# Opaque workspace buffer reserved by the Rust wrapper (bytes)
+FFI_WORKSPACE_BYTES = 1024
+
+
 def create_rust_ffi_template(N, n, m):
-    """Create a template for Rust FFI bindings to the generated C code."""
-
-    template = f'''// Rust FFI bindings to OSQP embedded MPC solver
-//
-// This module provides safe Rust wrappers around the generated C solver.
-
-use core::ffi::{{c_float, c_int}};
-
-// Import generated C functions
-extern "C" {{
-    fn osqp_setup(work: *mut OSQPWorkspace) -> c_int;
-    fn osqp_solve(work: *mut OSQPWorkspace) -> c_int;
-    fn osqp_update_lin_cost(work: *mut OSQPWorkspace, q_new: *const c_float) -> c_int;
-    fn osqp_update_bounds(
-        work: *mut OSQPWorkspace,
-        l_new: *const c_float,
-        u_new: *const c_float
-    ) -> c_int;
-    fn osqp_cleanup(work: *mut OSQPWorkspace);
-}}
-
-// Workspace structure (must match C definition)
-#[repr(C)]
-struct OSQPWorkspace {{
-    // This is a placeholder - actual structure defined in generated code
-    data: [u8; 1024],
-}}
-
-/// Safe Rust wrapper for OSQP embedded solver
-pub struct OSQPSolver {{
-    workspace: OSQPWorkspace,
-}}
-
-impl OSQPSolver {{
-    pub fn new() -> Result<Self, &'static str> {{
-        let mut workspace = OSQPWorkspace {{ data: [0; 1024] }};
-
-        unsafe {{
-            let ret = osqp_setup(&mut workspace as *mut _);
-            if ret == 0 {{
-                Ok(Self {{ workspace }})
-            }} else {{
-                Err("OSQP setup failed")
-            }}
-        }}
-    }}
-
-    pub fn solve(&mut self, q: &[f32], l: &[f32], u: &[f32]) -> Result<Vec<f32>, &'static str> {{
-        unsafe {{
-            // Update problem parameters
-            osqp_update_lin_cost(&mut self.workspace as *mut _, q.as_ptr());
-            osqp_update_bounds(&mut self.workspace as *mut _, l.as_ptr(), u.as_ptr());
-
-            // Solve
-            let ret = osqp_solve(&mut self.workspace as *mut _);
-            if ret == 0 {{
-                // Extract solution (placeholder - actual implementation needed)
-                Ok(vec![0.0; {N}])
-            }} else {{
-                Err("OSQP solve failed")
-            }}
-        }}
-    }}
-}}
-
-impl Drop for OSQPSolver {{
-    fn drop(&mut self) {{
-        unsafe {{
-            osqp_cleanup(&mut self.workspace as *mut _);
-        }}
-    }}
-}}
-'''
-
-    return template
+    """Create Rust FFI bindings to the generated C code from FFI_TEMPLATE."""
+    with open(FFI_TEMPLATE, "r") as f:
+        template = string.Template(f.read())
+
+    return template.substitute(
+        N=N, N_STATES=n, N_INPUTS=m, WORKSPACE_BYTES=FFI_WORKSPACE_BYTES
+    )
 
 
 def main():
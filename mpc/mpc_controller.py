@@ -2,7 +2,7 @@
 """
 Model Predictive Control (MPC) Controller - Python Prototype
 
-This implements MPC for motor position control using CVXPY/OSQP.
+This implements MPC for motor position control using OSQP.
 
 MPC formulation:
   State: x = [position, velocity, acceleration]
@@ -19,11 +19,113 @@ Author: Generated for MPC implementation
 Date: 2025-10-08
 """
 
+import importlib.machinery
+import importlib.util
+import os
+import sys
+
 import numpy as np
-import cvxpy as cp
-from typing import Tuple, Dict
+import osqp
+import scipy.sparse as sp
+from numba import njit
+from typing import Dict, NamedTuple, Optional, Tuple
 import time
 
+# OSQP statuses with a usable solution (the first is fully converged). An
+# iteration-capped solve still applies its last (warm-started) iterate,
+# which tracks far better than zero jerk.
+_SOLVED = ("solved", "solved inaccurate", "maximum iterations reached")
+
+# Every status recorded in the solve statistics ("error": solver exception)
+_STATUSES = _SOLVED + (
+    "primal infeasible",
+    "primal infeasible inaccurate",
+    "dual infeasible",
+    "dual infeasible inaccurate",
+    "run time limit reached",
+    "unsolved",
+    "error",
+)
+
+# Python extension module built by OSQP code generation, suffixed with the
+# problem signature (see _setup_codegen)
+_CODEGEN_EXT = "mpc_emosqp"
+_CODEGEN_USE_FLOAT = False  # Double precision, like the osqp Python solver
+
+# OSQP settings for the MPC QP (overridden per controller by osqp_settings).
+# Warm-started from the shifted previous solution, an unconstrained solve
+# converges in ~5 iterations: check termination every 5 (default 25). Tuned
+# with active bounds (v 1.5, a 4, j 60 on the 0.6 s S-curve demo, explicit
+# law off): with adaptive rho, ~8% of those solves reach the 100-iteration
+# cap, which bounds the solve time; the capped iterate is applied (_SOLVED).
+OSQP_SETTINGS = {
+    "eps_abs": 1e-4,
+    "eps_rel": 1e-4,
+    "check_termination": 5,
+    "adaptive_rho": True,
+    "max_iter": 100,
+    "polish": False,
+}
+
+# Initial size of the solve statistics buffers (doubled when full)
+_STATS_CAPACITY = 100_000
+
+
+class MPCInfo(NamedTuple):
+    """Result details of one MPCController.solve call."""
+
+    status: str  # Solver status
+    solve_time: float  # Time to solve (s)
+    cost: float  # Optimal cost value (inf when the solve failed)
+    x_predicted: Optional[np.ndarray] = None  # Predicted states (3, N+1)
+    u_optimal: Optional[np.ndarray] = None  # Optimal input sequence (N,)
+
+
+class MPCBatchInfo(NamedTuple):
+    """Result details of one MPCController.solve_batch call (per scenario)."""
+
+    status: np.ndarray  # Solver status of each scenario (batch,)
+    solve_time: float  # Time to solve the whole batch (s)
+    cost: np.ndarray  # Optimal cost values, inf where the solve failed (batch,)
+    x_predicted: np.ndarray  # Predicted states (batch, 3, N+1)
+    u_optimal: np.ndarray  # Optimal input sequences (batch, N)
+
+
+def _load_extension(directory: str, name: str):
+    """Import the compiled extension module `name` from directory.
+
+    A loaded C extension cannot be reloaded, so a module already imported
+    under this name is returned as is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        path = os.path.join(directory, name + suffix)
+        if os.path.exists(path):
+            break
+    else:
+        raise ImportError(f"no compiled {name} extension in {directory}")
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+def _within(v: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> bool:
+    """Whether lower <= v <= upper holds elementwise."""
+    return bool(np.all(v >= lower) and np.all(v <= upper))
+
+
+def _shift_blocks(v: np.ndarray, block: int) -> np.ndarray:
+    """Shift a stacked per-step vector one step earlier, repeating the last."""
+    out = np.empty_like(v)
+    out[:-block] = v[block:]
+    out[-block:] = v[-block:]
+    return out
+
 
 class MPCController:
     """Model Predictive Controller for motor position control."""
@@ -39,6 +141,10 @@ class MPCController:
         v_max: float = 2.0,
         a_max: float = 5.0,
         j_max: float = 100.0,
+        codegen_dir: str | None = None,
+        collect_stats: bool = True,
+        osqp_settings: Dict | None = None,
+        explicit: bool = True,
     ):
         """
         Initialize MPC controller.
@@ -53,6 +159,14 @@ class MPCController:
             v_max: Maximum velocity (rad/s)
             a_max: Maximum acceleration (rad/s²)
             j_max: Maximum jerk (rad/s³)
+            codegen_dir: Directory for an OSQP code-generated solver. When
+                set, solve() calls the compiled C solver instead of the
+                osqp Python interface (generated on first use).
+            collect_stats: Time each solve and record it for get_statistics.
+                False skips the timer calls (solve_time is reported as 0).
+            osqp_settings: OSQP settings overriding OSQP_SETTINGS
+            explicit: Try the explicit control law of the unconstrained
+                region before calling OSQP (see solve)
         """
         self.A = A
         self.B = B
@@ -74,172 +188,415 @@ class MPCController:
         self.a_max = a_max
         self.j_max = j_max
 
+        self.osqp_settings = {**OSQP_SETTINGS, **(osqp_settings or {})}
+
         # Problem dimensions
         self.n_states = 3
         self.n_inputs = 1
 
         # Setup optimization problem
         self._setup_optimization()
-
-        # Statistics
-        self.solve_times = []
-        self.solve_status = []
+        if explicit:
+            # Explicit MPC, region with no active bound: the QP optimum is
+            # the affine law u = K (Φ x_0 - x_ref) with K = -H⁻¹ 2Γ'Q̃
+            self._K = -np.linalg.solve(self._P.toarray(), self._q_gain)
+            self._G = self._A_qp.toarray()
+        else:
+            self._K = None
+        self._emosqp = self._setup_codegen(codegen_dir) if codegen_dir else None
+        self._batch_solve = None  # Built by solve_batch on first use
+
+        # Statistics: solve time (s) and status (index into _STATUSES) per solve
+        self._solve_times = np.empty(_STATS_CAPACITY)
+        self._solve_codes = np.empty(_STATS_CAPACITY, dtype=np.int8)
+        self._n_solves = 0
+        self.collect_stats = collect_stats
+
+        # Shifted primal/dual iterates of the last solve (see solve)
+        self._warm_x = None
+        self._warm_y = None
+
+    @property
+    def solve_times(self) -> np.ndarray:
+        """Solve times (s) recorded since the last reset."""
+        return self._solve_times[: self._n_solves]
+
+    @property
+    def solve_status(self) -> list:
+        """Solver status of each solve recorded since the last reset."""
+        return [_STATUSES[c] for c in self._solve_codes[: self._n_solves]]
 
     def _setup_optimization(self):
-        """Setup CVXPY optimization problem (define once, solve repeatedly)."""
+        """Setup the condensed OSQP problem (build once, update each solve).
+
+        The states are eliminated through the prediction model
+        x = Φ x_0 + Γ u, with x = [x_0, ..., x_N] stacked, Φ = [I; A; ...; A^N]
+        and Γ[k, j] = A^(k-1-j) B for j < k. The decision vector is the input
+        sequence u = [u_0, ..., u_{N-1}] only. The tracking cost
+        Σ (x_k - x_ref_k)'Q(x_k - x_ref_k) + R*u_k² becomes ½ u'Hu + q'u with
+        H = 2(Γ'Q̃Γ + R̃) fixed, so the KKT factorization is reused and only q
+        and the state-bound offsets depend on x_init and x_ref.
+        """
         n = self.n_states
         m = self.n_inputs
         N = self.N
 
-        # Decision variables
-        self.x = cp.Variable((n, N + 1))  # States over horizon
-        self.u = cp.Variable((m, N))  # Inputs over horizon
-
-        # Parameters (updated each solve)
-        self.x_init = cp.Parameter(n)  # Initial state
-        self.x_ref = cp.Parameter((n, N + 1))  # Reference trajectory
-
-        # Cost function
-        cost = 0
-        for k in range(N):
-            # Tracking error cost
-            error = self.x[:, k] - self.x_ref[:, k]
-            cost += cp.quad_form(error, self.Q)
-
-            # Control effort cost
-            cost += self.R * cp.square(self.u[0, k])
-
-        # Terminal cost
-        error_N = self.x[:, N] - self.x_ref[:, N]
-        cost += cp.quad_form(error_N, self.Q)
+        # Prediction matrices: Φ stacks A^k; Γ is block Toeplitz, block (k, j)
+        # is A^(k-1-j) B = (Φ B)[k-1-j] below the diagonal and zero above
+        Phi = np.empty(((N + 1) * n, n))
+        Phi[:n] = np.eye(n)
+        for k in range(1, N + 1):
+            Phi[k * n : (k + 1) * n] = self.A @ Phi[(k - 1) * n : k * n]
+        Phi_B = (Phi @ self.B).reshape(N + 1, n, m)
+        lag = np.arange(N + 1)[:, None] - 1 - np.arange(N)
+        blocks = np.where((lag >= 0)[:, :, None, None], Phi_B[np.maximum(lag, 0)], 0.0)
+        Gamma = blocks.transpose(0, 2, 1, 3).reshape((N + 1) * n, N * m)
+        self._Phi = Phi
+        self._Gamma = Gamma
+
+        # Cost: H = 2(Γ'Q̃Γ + R̃), q = 2Γ'Q̃(Φ x_0 - x_ref). Q̃ = blkdiag(Q, ...)
+        # is applied block by block (n x n per step) instead of being formed
+        Q_Gamma = (self.Q @ Gamma.reshape(N + 1, n, N * m)).reshape(Gamma.shape)
+        R_bar = np.kron(np.eye(N), np.atleast_2d(self.R))
+        self._q_gain = 2.0 * Q_Gamma.T
+        P = sp.csc_matrix(2.0 * (Gamma.T @ Q_Gamma + R_bar))
+
+        # Bounds: velocity/acceleration of x_1..x_N (x_0 is not a decision
+        # variable), then every u_k
+        self._state_rows = (np.arange(1, N + 1)[:, None] * n + [1, 2]).ravel()
+        A_qp = sp.vstack(
+            [sp.csr_matrix(Gamma[self._state_rows]), sp.eye(N * m)], format="csc"
+        )
+        A_qp.eliminate_zeros()
+        self._P = P
+        self._A_qp = A_qp
+
+        # State bounds are shifted by the free response Φ x_0 each solve
+        self._x_bound = np.tile([self.v_max, self.a_max], N)
+        self._u_bound = np.concatenate([self._x_bound, np.full(N * m, self.j_max)])
+        self._l_bound = -self._u_bound
+
+        self._q = np.zeros(N * m)
+
+        self.prob = osqp.OSQP()
+        self.prob.setup(
+            P=P,
+            q=self._q,
+            A=A_qp,
+            l=self._l_bound,
+            u=self._u_bound,
+            verbose=False,
+            warm_start=True,  # Start from the previous solution
+            **self.osqp_settings,
+        )
 
-        # Constraints
-        constraints = []
+    def _setup_codegen(self, codegen_dir: str):
+        """Load the code-generated OSQP solver, generating it if needed.
 
-        # Initial condition
-        constraints.append(self.x[:, 0] == self.x_init)
+        The generated extension embeds P, A and the OSQP settings, so it is
+        regenerated when the problem signature (see
+        generate_embedded_solver.problem_signature) no longer matches. Only
+        q, l and u are copied into it per solve.
+        Each problem gets its own module name, as an extension imported for
+        another problem in this process cannot be replaced.
 
-        # Dynamics constraints
-        for k in range(N):
-            constraints.append(
-                self.x[:, k + 1] == self.A @ self.x[:, k] + self.B @ self.u[:, k]
-            )
+        Returns:
+            The imported extension module, or None (plain OSQP) when code
+            generation or its build toolchain (CMake, pybind11) is unavailable
+        """
+        from generate_embedded_solver import problem_signature
+
+        sig = problem_signature(
+            self._P,
+            self._q,
+            self._A_qp,
+            self._l_bound,
+            self._u_bound,
+            settings=self.osqp_settings,
+        ) + ("-f32" if _CODEGEN_USE_FLOAT else "-f64")
+        name = f"{_CODEGEN_EXT}_{sig.replace('-', '_')}"
+        sig_file = os.path.join(codegen_dir, ".codegen_sig")
 
-        # State constraints (velocity and acceleration bounds)
-        for k in range(N + 1):
-            constraints.append(self.x[1, k] <= self.v_max)  # vel <= v_max
-            constraints.append(self.x[1, k] >= -self.v_max)  # vel >= -v_max
-            constraints.append(self.x[2, k] <= self.a_max)  # accel <= a_max
-            constraints.append(self.x[2, k] >= -self.a_max)  # accel >= -a_max
+        try:
+            stale = True
+            if os.path.exists(sig_file):
+                with open(sig_file) as f:
+                    stale = f.read() != sig
+            if stale:
+                self.prob.codegen(
+                    codegen_dir,
+                    parameters="vectors",  # EMBEDDED_MODE=1 (can update q, l, u)
+                    extension_name=name,
+                    use_float=_CODEGEN_USE_FLOAT,
+                    force_rewrite=True,
+                    compile=True,
+                )
+                with open(sig_file, "w") as f:
+                    f.write(sig)
+
+            return _load_extension(codegen_dir, name)
+        except Exception as e:
+            print(f"⚠️  OSQP codegen unavailable ({e}), using the osqp solver")
+            return None
 
-        # Input constraints (jerk bounds)
-        for k in range(N):
-            constraints.append(self.u[0, k] <= self.j_max)  # jerk <= j_max
-            constraints.append(self.u[0, k] >= -self.j_max)  # jerk >= -j_max
+    def _solve_qp(self):
+        """Solve the QP with the current q, l, u (generated solver or OSQP).
 
-        # Create problem
-        self.problem = cp.Problem(cp.Minimize(cost), constraints)
+        Returns:
+            Tuple of (primal solution, dual solution or None, status,
+            objective value)
+        """
+        if self._emosqp is not None:
+            self._emosqp.update_data_vec(q=self._q, l=self._l_bound, u=self._u_bound)
+            # solve() only raises on a solver error and does not return the
+            # status: an iteration-capped or infeasible run returns normally
+            z, _, _, n_iter, _ = self._emosqp.solve()
+            # Converged (or capped) unless infeasible: z is then not primal
+            # feasible, and the osqp solver classifies the problem
+            Az = self._A_qp @ z
+            tol = self.osqp_settings["eps_abs"] + self.osqp_settings[
+                "eps_rel"
+            ] * np.max(np.abs(Az))
+            if _within(Az, self._l_bound - tol, self._u_bound + tol):
+                capped = n_iter >= self.osqp_settings["max_iter"]
+                status = "maximum iterations reached" if capped else _SOLVED[0]
+                return z, None, status, 0.5 * z @ (self._P @ z) + self._q @ z
+
+        self.prob.update(q=self._q, l=self._l_bound, u=self._u_bound)
+        if self._warm_x is not None:
+            self.prob.warm_start(x=self._warm_x, y=self._warm_y)
+        result = self.prob.solve()
+        return result.x, result.y, result.info.status, result.info.obj_val
 
     def solve(
         self, x_current: np.ndarray, x_ref_trajectory: np.ndarray, verbose: bool = False
-    ) -> Tuple[float, Dict]:
+    ) -> Tuple[float, MPCInfo]:
         """
         Solve MPC optimization problem.
 
         Args:
             x_current: Current state [pos, vel, acc] (3,)
             x_ref_trajectory: Reference trajectory over horizon (3, N+1)
-            verbose: Print solver output
+            verbose: Report a failed solve
 
         Returns:
-            Tuple of (optimal_jerk, info_dict)
-            where info_dict contains:
-                - status: Solver status
-                - solve_time: Time to solve (s)
-                - cost: Optimal cost value
-                - x_predicted: Predicted state trajectory (3, N+1)
-                - u_optimal: Optimal input sequence (N,)
+            Tuple of (optimal_jerk, MPCInfo); a failed solve returns zero
+            jerk with infinite cost and no predicted/optimal sequences
         """
-        start_time = time.perf_counter()
-
-        # Update parameters
-        self.x_init.value = x_current
-        self.x_ref.value = x_ref_trajectory
-
-        # Solve optimization
-        try:
-            self.problem.solve(
-                solver=cp.OSQP,
-                warm_start=True,
-                verbose=verbose,
-                eps_abs=1e-4,
-                eps_rel=1e-4,
-            )
-        except Exception as e:
-            print(f"MPC solve failed: {e}")
-            return 0.0, {
-                "status": "error",
-                "solve_time": time.perf_counter() - start_time,
-                "cost": float("inf"),
-            }
-
-        solve_time = time.perf_counter() - start_time
+        collect_stats = self.collect_stats
+        start_ns = time.perf_counter_ns() if collect_stats else 0
+        n_sb = len(self._state_rows)
+
+        # Update the QP vectors from the free response Φ x_0 (no input)
+        x_free = self._Phi @ x_current
+        x_err = x_free - x_ref_trajectory.ravel(order="F")
+        self._q[:] = self._q_gain @ x_err
+        offset = x_free[self._state_rows]
+        self._u_bound[:n_sb] = self._x_bound - offset
+        self._l_bound[:n_sb] = -self._x_bound - offset
+
+        # Explicit law first: exact whenever it satisfies every bound
+        z = self._K @ x_err if self._K is not None else None
+        if z is not None and _within(self._G @ z, self._l_bound, self._u_bound):
+            status = _SOLVED[0]
+            obj_val = 0.5 * z @ (self._P @ z) + self._q @ z
+            y = np.zeros(len(self._l_bound))  # No active constraint
+        else:
+            try:
+                z, y, status, obj_val = self._solve_qp()
+            except Exception as e:
+                print(f"MPC solve failed: {e}")
+                z, status = None, "error"
+
+        solve_time = (
+            (time.perf_counter_ns() - start_ns) * 1e-9 if collect_stats else 0.0
+        )
+        if collect_stats:
+            self._record_solve(solve_time, status)
 
         # Check solution status
-        if self.problem.status not in [cp.OPTIMAL, cp.OPTIMAL_INACCURATE]:
+        if status not in _SOLVED:
             if verbose:
-                print(f"Warning: MPC solver status = {self.problem.status}")
+                print(f"Warning: MPC solver status = {status}")
+            self._warm_x = None
 
             # Return zero jerk as fallback
-            return 0.0, {
-                "status": self.problem.status,
-                "solve_time": solve_time,
-                "cost": float("inf"),
-            }
+            return 0.0, MPCInfo(status, solve_time, float("inf"))
 
         # Extract solution
-        u_optimal_seq = (
-            self.u.value.flatten() if self.u.value is not None else np.zeros(self.N)
+        x_err_k = x_err.reshape(self.N + 1, -1).T
+        u_optimal_seq = z
+        x_predicted = (x_free + self._Gamma @ z).reshape(self.N + 1, -1).T
+
+        # Return first control input (receding horizon principle); an
+        # unconverged iterate may overshoot the jerk bound slightly
+        u_opt = min(self.j_max, max(-self.j_max, u_optimal_seq[0]))
+
+        # The next problem starts one step later: warm-start it from this
+        # solution shifted by one step (inputs, then state/input bound duals)
+        if self._emosqp is None:
+            m = self.n_inputs
+            self._warm_x = _shift_blocks(z, m)
+            self._warm_y = np.concatenate(
+                [
+                    _shift_blocks(y[:n_sb], n_sb // self.N),
+                    _shift_blocks(y[n_sb:], m),
+                ]
+            )
+
+        # OSQP's objective omits the constant free-response error term
+        cost = obj_val + float(np.sum(x_err_k * (self.Q @ x_err_k)))
+
+        return u_opt, MPCInfo(status, solve_time, cost, x_predicted, u_optimal_seq)
+
+    def _record_solve(self, solve_time: float, status: str):
+        """Append one solve to the statistics buffers (doubled when full)."""
+        idx = self._n_solves
+        if idx == len(self._solve_times):
+            self._solve_times = np.concatenate(
+                [self._solve_times, np.empty_like(self._solve_times)]
+            )
+            self._solve_codes = np.concatenate(
+                [self._solve_codes, np.empty_like(self._solve_codes)]
+            )
+        self._solve_times[idx] = solve_time
+        self._solve_codes[idx] = _STATUSES.index(
+            status if status in _STATUSES else "unsolved"
+        )
+        self._n_solves = idx + 1
+
+    def _setup_batch_solver(self):
+        """JIT-compile a vmapped jaxopt BoxOSQP solve of the condensed QP.
+
+        H and the constraint matrix are closed over as constants and applied
+        as matvecs; q and the bounds are rebuilt per scenario exactly as in
+        solve(). Each scenario also returns its jaxopt status code and its
+        QP objective. Requires jax and jaxopt (pip install jax jaxopt).
+        """
+        import jax
+        import jax.numpy as jnp
+        from jaxopt import BoxOSQP
+
+        H = jnp.asarray(self._P.toarray())
+        G = jnp.asarray(self._A_qp.toarray())
+        Phi = jnp.asarray(self._Phi)
+        q_gain = jnp.asarray(self._q_gain)
+        state_rows = jnp.asarray(self._state_rows)
+        x_bound = jnp.asarray(self._x_bound)
+        input_bound = jnp.asarray(self._u_bound[len(self._state_rows) :])
+
+        qp = BoxOSQP(
+            matvec_Q=lambda _, u: H @ u,
+            matvec_A=lambda _, u: G @ u,
+            tol=1e-4,
         )
-        x_predicted = self.x.value if self.x.value is not None else None
 
-        # Return first control input (receding horizon principle)
-        u_opt = u_optimal_seq[0]
+        def solve_one(x_current, x_ref_trajectory):
+            x_free = Phi @ x_current
+            q = q_gain @ (x_free - x_ref_trajectory.T.ravel())
+            offset = x_free[state_rows]
+            l = jnp.concatenate([-x_bound - offset, -input_bound])
+            u = jnp.concatenate([x_bound - offset, input_bound])
+            sol = qp.run(params_obj=(None, q), params_eq=None, params_ineq=(l, u))
+            z = sol.params.primal[0]
+            return z, sol.state.status, 0.5 * z @ (H @ z) + q @ z
+
+        return jax.jit(jax.vmap(solve_one, in_axes=(0, 0)))
+
+    def solve_batch(
+        self, x_currents: np.ndarray, x_ref_trajectories: np.ndarray
+    ) -> Tuple[np.ndarray, MPCBatchInfo]:
+        """
+        Solve independent MPC problems in one batched JAX call.
+
+        Meant for Monte-Carlo/robustness sweeps over many initial states and
+        references (CPU or GPU). The first call traces and compiles the
+        solver; later calls with the same batch size reuse it. Closed-loop
+        steps depend on the previous input, so simulate_mpc_tracking keeps
+        using solve().
+
+        Args:
+            x_currents: Initial states (batch, 3)
+            x_ref_trajectories: Reference trajectories (batch, 3, N+1)
+
+        Returns:
+            Tuple of (optimal_jerks (batch,), MPCBatchInfo); as in solve(),
+            a failed scenario returns zero jerk with infinite cost, and its
+            predicted/optimal sequences are NaN
+        """
+        from jaxopt import BoxOSQP
+
+        if self._batch_solve is None:
+            self._batch_solve = self._setup_batch_solver()
 
-        # Statistics
-        self.solve_times.append(solve_time)
-        self.solve_status.append(self.problem.status)
+        start_time = time.perf_counter()
+        u_optimal, codes, obj_val = self._batch_solve(x_currents, x_ref_trajectories)
+        u_optimal = np.array(u_optimal.block_until_ready())
+        solve_time = time.perf_counter() - start_time
 
-        info = {
-            "status": self.problem.status,
-            "solve_time": solve_time,
-            "cost": self.problem.value,
-            "x_predicted": x_predicted,
-            "u_optimal": u_optimal_seq,
+        # jaxopt status codes; an unsolved run stopped at its iteration cap
+        names = {
+            BoxOSQP.SOLVED: _SOLVED[0],
+            BoxOSQP.UNSOLVED: "maximum iterations reached",
+            BoxOSQP.PRIMAL_INFEASIBLE: "primal infeasible",
+            BoxOSQP.DUAL_INFEASIBLE: "dual infeasible",
         }
+        status = np.array([names.get(int(c), "unsolved") for c in np.asarray(codes)])
+        ok = np.isin(status, _SOLVED)
 
-        return u_opt, info
+        x_currents = np.asarray(x_currents)
+        x_ref = np.asarray(x_ref_trajectories)
+        x_free = x_currents @ self._Phi.T
+        x_predicted = x_free + u_optimal @ self._Gamma.T
+        x_predicted = x_predicted.reshape(len(u_optimal), self.N + 1, -1)
+        x_predicted = x_predicted.transpose(0, 2, 1)
+
+        # OSQP's objective omits the constant free-response error term
+        x_err = x_free.reshape(len(u_optimal), self.N + 1, -1).transpose(0, 2, 1)
+        x_err = x_err - x_ref
+        cost = np.asarray(obj_val) + np.einsum("bik,ij,bjk->b", x_err, self.Q, x_err)
+
+        cost[~ok] = np.inf
+        u_optimal[~ok] = np.nan
+        x_predicted[~ok] = np.nan
+        jerks = np.where(ok, np.clip(u_optimal[:, 0], -self.j_max, self.j_max), 0.0)
+
+        return jerks, MPCBatchInfo(status, solve_time, cost, x_predicted, u_optimal)
 
     def get_statistics(self) -> Dict:
         """Get solver statistics."""
-        if not self.solve_times:
+        n = self._n_solves
+        if n == 0:
             return {"count": 0}
 
+        times = self._solve_times[:n]
         return {
-            "count": len(self.solve_times),
-            "mean_solve_time": np.mean(self.solve_times) * 1e6,  # µs
-            "max_solve_time": np.max(self.solve_times) * 1e6,  # µs
-            "min_solve_time": np.min(self.solve_times) * 1e6,  # µs
-            "std_solve_time": np.std(self.solve_times) * 1e6,  # µs
-            "success_rate": sum([1 for s in self.solve_status if s == cp.OPTIMAL])
-            / len(self.solve_status)
-            * 100,
+            "count": n,
+            "mean_solve_time": times.mean() * 1e6,  # µs
+            "max_solve_time": times.max() * 1e6,  # µs
+            "min_solve_time": times.min() * 1e6,  # µs
+            "std_solve_time": times.std() * 1e6,  # µs
+            "success_rate": np.count_nonzero(self._solve_codes[:n] == 0) / n * 100,
         }
 
     def reset_statistics(self):
         """Reset solver statistics."""
-        self.solve_times = []
-        self.solve_status = []
+        self._n_solves = 0
+
+
+@njit(cache=True)
+def _advance(x, A, B_flat, u, noise, x_next):
+    """One simulation step x' = A x + B u + noise.
+
+    Written as scalar loops into the caller's x_next buffer: for a 3-state
+    model this beats BLAS dispatch and the temporaries of A @ x + B * u + noise.
+    """
+    n = len(x)
+    for r in range(n):
+        acc = B_flat[r] * u + noise[r]
+        for c in range(n):
+            acc += A[r, c] * x[c]
+        x_next[r] = acc
 
 
 def simulate_mpc_tracking(
@@ -248,6 +605,7 @@ def simulate_mpc_tracking(
     duration: float = 1.0,
     dt: float = 0.0001,
     x0: np.ndarray | None = None,
+    trajectory_func_vec=None,
 ) -> Dict:
     """
     Simulate MPC tracking of a reference trajectory.
@@ -258,6 +616,9 @@ def simulate_mpc_tracking(
         duration: Simulation duration (s)
         dt: Timestep (s)
         x0: Initial state [pos, vel, acc], defaults to [0, 0, 0]
+        trajectory_func_vec: Optional vectorized reference,
+            Function(t_array) -> (3, len(t_array)) array. When given, the whole
+            reference is evaluated in one call and trajectory_func is unused.
 
     Returns:
         Dictionary with simulation results:
@@ -275,7 +636,8 @@ def simulate_mpc_tracking(
     if x0 is None:
         x = np.array([0.0, 0.0, 0.0])
     else:
-        x = x0.copy()
+        x = np.array(x0, dtype=np.float64)
+    x_next = np.empty_like(x)  # Swapped with x every step
 
     # Storage
     time_vec = np.zeros(n_steps)
@@ -285,19 +647,37 @@ def simulate_mpc_tracking(
     solve_times = np.zeros(n_steps)
 
     # MPC system model (for simulation)
-    A_sim = mpc.A
-    B_sim = mpc.B
+    A_sim = np.ascontiguousarray(mpc.A, dtype=np.float64)
+    B_flat = np.ascontiguousarray(mpc.B, dtype=np.float64).flatten()
+
+    # Process noise for every step, drawn in one call (small, to make the
+    # simulation realistic)
+    noise = np.random.default_rng().standard_normal((n_steps, 3)) * 1e-6
+
+    # Reference over the prediction horizon; consecutive horizons overlap in
+    # N samples, so each step shifts it and evaluates only the new last one.
+    # A vectorized reference is evaluated once and sliced instead. Both are
+    # kept column-major: each time step's [pos, vel, acc] is contiguous, as
+    # in the solver's stacked state vector, so solve() flattens it without
+    # a copy.
+    if trajectory_func_vec is not None:
+        x_ref_all = np.asfortranarray(
+            trajectory_func_vec(np.arange(n_steps + mpc.N) * dt)
+        )
+    else:
+        x_ref_horizon = np.zeros((3, mpc.N + 1), order="F")
+        for k in range(mpc.N + 1):
+            x_ref_horizon[:, k] = trajectory_func(k * dt)
 
     for i in range(n_steps):
         t = i * dt
         time_vec[i] = t
 
-        # Get reference trajectory over prediction horizon
-        x_ref_horizon = np.zeros((3, mpc.N + 1))
-        for k in range(mpc.N + 1):
-            t_future = t + k * dt
-            pos_ref, vel_ref, acc_ref = trajectory_func(t_future)
-            x_ref_horizon[:, k] = [pos_ref, vel_ref, acc_ref]
+        if trajectory_func_vec is not None:
+            x_ref_horizon = x_ref_all[:, i : i + mpc.N + 1]
+        elif i > 0:
+            x_ref_horizon[:, :-1] = x_ref_horizon[:, 1:]
+            x_ref_horizon[:, -1] = trajectory_func(t + mpc.N * dt)
 
         # Store current reference
         x_ref_vec[:, i] = x_ref_horizon[:, 0]
@@ -308,13 +688,11 @@ def simulate_mpc_tracking(
         # Store
         x_actual[:, i] = x
         u_vec[i] = u_opt
-        solve_times[i] = info["solve_time"]
+        solve_times[i] = info.solve_time
 
         # Apply control to system (simulate dynamics)
-        x = A_sim @ x + B_sim.flatten() * u_opt
-
-        # Add small noise to make it realistic
-        x += np.random.normal(0, 1e-6, 3)
+        _advance(x, A_sim, B_flat, u_opt, noise[i], x_next)
+        x, x_next = x_next, x
 
     # Compute tracking error
     tracking_error = x_actual[0, :] - x_ref_vec[0, :]
@@ -337,27 +715,61 @@ def simulate_mpc_tracking(
     }
 
 
-def main():
-    """Test MPC controller with S-curve trajectory."""
-    print("=" * 80)
-    print("MODEL PREDICTIVE CONTROL - PYTHON PROTOTYPE")
-    print("=" * 80)
+def main(argv=None) -> Dict:
+    """Test MPC controller with S-curve trajectory.
 
-    # Load system model (from system identification)
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Simulation results dict from simulate_mpc_tracking
+    """
+    import argparse
     import json
 
+    parser = argparse.ArgumentParser(
+        description="Simulate MPC tracking of an S-curve trajectory"
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Only run the simulation: skip the report and (unless --plot) the plot",
+    )
+    parser.add_argument(
+        "--plot",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Save mpc_tracking_results.png (default: on unless --benchmark)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.6,  # 600ms (covers full trajectory)
+        help="Simulated time in seconds (default: 0.6)",
+    )
+    args = parser.parse_args(argv)
+    report = not args.benchmark
+    plot = report if args.plot is None else args.plot
+
+    if report:
+        print("=" * 80)
+        print("MODEL PREDICTIVE CONTROL - PYTHON PROTOTYPE")
+        print("=" * 80)
+
+    # Load system model (from system identification)
     with open("motor_model.json", "r") as f:
         model_data = json.load(f)
 
     A = np.array(model_data["A_matrix"])
     B = np.array(model_data["B_matrix"])
 
-    print("\nSystem model loaded:")
-    print(f"  A matrix:\n{A}")
-    print(f"  B matrix:\n{B.flatten()}")
+    if report:
+        print("\nSystem model loaded:")
+        print(f"  A matrix:\n{A}")
+        print(f"  B matrix:\n{B.flatten()}")
+        print("\nInitializing MPC controller...")
 
     # Create MPC controller
-    print("\nInitializing MPC controller...")
     mpc = MPCController(
         A=A,
         B=B,
@@ -369,15 +781,16 @@ def main():
         a_max=5.0,
         j_max=100.0,
     )
-    print("  ✓ MPC controller initialized")
-    print(f"  ✓ Prediction horizon: {mpc.N} steps ({mpc.N * mpc.dt * 1e3:.1f} ms)")
+    if report:
+        print("  ✓ MPC controller initialized")
+        horizon_ms = mpc.N * mpc.dt * 1e3
+        print(f"  ✓ Prediction horizon: {mpc.N} steps ({horizon_ms:.1f} ms)")
 
     # Import S-curve generator (do it once)
-    import sys
     from pathlib import Path
 
     sys.path.insert(0, str(Path(__file__).parent.parent / "scripts" / "demos"))
-    from demo_visualization import generate_scurve_trajectory
+    from demo_visualization import generate_scurve_trajectory, scurve_profile
 
     # Define S-curve trajectory
     def scurve_trajectory(t):
@@ -392,41 +805,65 @@ def main():
         )
         return pos, vel, acc
 
+    def scurve_trajectory_vec(t_vec):
+        """Generate the same S-curve over a whole time grid."""
+        return np.vstack(scurve_profile(t_vec, 1.57, 2.0, 5.0, 100.0))
+
     # Simulate MPC tracking
-    print("\nRunning MPC simulation...")
+    if report:
+        print("\nRunning MPC simulation...")
     results = simulate_mpc_tracking(
         mpc=mpc,
         trajectory_func=scurve_trajectory,
-        duration=0.6,  # 600ms (covers full trajectory)
+        duration=args.duration,
         dt=0.0001,
         x0=np.array([0.0, 0.0, 0.0]),
+        trajectory_func_vec=scurve_trajectory_vec,
     )
 
-    # Get MPC statistics
-    stats = mpc.get_statistics()
-    print(f"\n📊 MPC Solver Statistics:")
-    print(f"  Total solves: {stats['count']}")
-    print(f"  Success rate: {stats['success_rate']:.1f}%")
-    print(f"  Mean solve time: {stats['mean_solve_time']:.1f} µs")
-    print(f"  Max solve time: {stats['max_solve_time']:.1f} µs")
-    print(f"  Std solve time: {stats['std_solve_time']:.1f} µs")
-
-    # Compare to PID baseline
-    print(f"\n🏆 Performance Comparison:")
-    print(f"  PID (Phase 3):  RMS = 1.903°")
-    print(f"  MPC (This run): RMS = {np.rad2deg(results['rms_error']):.3f}°")
-
-    improvement = (1.903 - np.rad2deg(results["rms_error"])) / 1.903 * 100
-    print(f"  Improvement:    {improvement:+.1f}%")
-
-    if results["rms_error"] < np.deg2rad(1.0):
-        print("\n🎯 SUCCESS: MPC achieved <1° RMS target!")
-    else:
-        print(
-            f"\n⚠️  Close: Need {np.rad2deg(results['rms_error']) - 1.0:.2f}° more improvement"
-        )
+    if report:
+        # Get MPC statistics
+        stats = mpc.get_statistics()
+        print(f"\n📊 MPC Solver Statistics:")
+        print(f"  Total solves: {stats['count']}")
+        print(f"  Success rate: {stats['success_rate']:.1f}%")
+        print(f"  Mean solve time: {stats['mean_solve_time']:.1f} µs")
+        print(f"  Max solve time: {stats['max_solve_time']:.1f} µs")
+        print(f"  Std solve time: {stats['std_solve_time']:.1f} µs")
+
+        # Compare to PID baseline
+        print(f"\n🏆 Performance Comparison:")
+        print(f"  PID (Phase 3):  RMS = 1.903°")
+        print(f"  MPC (This run): RMS = {np.rad2deg(results['rms_error']):.3f}°")
+
+        improvement = (1.903 - np.rad2deg(results["rms_error"])) / 1.903 * 100
+        print(f"  Improvement:    {improvement:+.1f}%")
+
+        if results["rms_error"] < np.deg2rad(1.0):
+            print("\n🎯 SUCCESS: MPC achieved <1° RMS target!")
+        else:
+            print(
+                f"\n⚠️  Close: Need {np.rad2deg(results['rms_error']) - 1.0:.2f}° more improvement"
+            )
 
     # Plot results
+    if plot:
+        _plot_tracking_results(results)
+
+    if report:
+        print("\n" + "=" * 80)
+        print("✅ MPC PROTOTYPE TEST COMPLETE")
+        print("=" * 80)
+        print("\nNext steps:")
+        print("  1. Review mpc_tracking_results.png")
+        print("  2. If performance is good, proceed to C implementation")
+        print("  3. If not, tune Q/R weights or increase horizon N")
+
+    return results
+
+
+def _plot_tracking_results(results: Dict):
+    """Save the tracking plot to mpc_tracking_results.png."""
     try:
         import matplotlib.pyplot as plt
 
@@ -465,14 +902,6 @@ def main():
     except ImportError:
         print("\n  ⚠️  matplotlib not available, skipping plot")
 
-    print("\n" + "=" * 80)
-    print("✅ MPC PROTOTYPE TEST COMPLETE")
-    print("=" * 80)
-    print("\nNext steps:")
-    print("  1. Review mpc_tracking_results.png")
-    print("  2. If performance is good, proceed to C implementation")
-    print("  3. If not, tune Q/R weights or increase horizon N")
-
 
 if __name__ == "__main__":
     main()
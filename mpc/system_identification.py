@@ -23,10 +23,75 @@ from pathlib import Path
 from typing import Dict, Tuple
 import matplotlib.pyplot as plt
 from scipy.optimize import minimize, curve_fit
-from scipy.signal import cont2discrete
+from scipy.signal import cont2discrete, lfilter
 from dataclasses import dataclass, asdict
 
 
+def _simulate_velocity(t, i_q, J, B, K_t, tau) -> np.ndarray:
+    """
+    Simulate the motor velocity response to i_q, starting from rest.
+
+    The Euler-integrated model
+      a[i] = alpha * (K_t*i_q[i] - B*v[i-1]) / J + (1 - alpha) * a[i-1]
+      v[i] = v[i-1] + a[i] * dt,   alpha = dt / (tau + dt)
+    is, for a fixed sample period dt, a second-order IIR filter from
+    (K_t/J)*i_q to v, so it runs as a single lfilter call. dt is the
+    mean sample period of t.
+    """
+    if len(t) < 2:
+        return np.zeros(len(t))
+
+    dt = (t[-1] - t[0]) / (len(t) - 1)
+    alpha = dt / (tau + dt)
+
+    u = np.asarray(i_q, dtype=np.float64) * (K_t / J)
+    u[0] = 0.0  # The recursion starts at i=1
+
+    den = [1.0, alpha * (1.0 + B / J * dt) - 2.0, 1.0 - alpha]
+    return lfilter([alpha * dt], den, u)
+
+
+def _velocity_fit_error(params, dt, i_q, vel) -> Tuple[float, np.ndarray]:
+    """
+    Mean squared error between vel and the simulated velocity, with gradient.
+
+    The model is the filter D(z) v = b0 u of _simulate_velocity, with
+    u = (K_t/J)*i_q, b0 = alpha*dt and D = 1 + d1 z^-1 + d2 z^-2.
+    Differentiating it gives dv/dd_k = -z^-k v / D(z), so the exact gradient
+    w.r.t. [J, B, K_t, tau] costs one more lfilter pass.
+
+    dt is the sample period and i_q a float64 array whose first sample is
+    zeroed (the recursion starts at i=1); both are fixed over a fit, so the
+    caller prepares them once.
+    """
+    J, B, K_t, tau = params
+    n = len(i_q)
+
+    alpha = dt / (tau + dt)
+    b0 = alpha * dt
+    den = [1.0, alpha * (1.0 + B / J * dt) - 2.0, 1.0 - alpha]
+
+    v = lfilter([b0], den, i_q * (K_t / J))
+    w = lfilter([1.0], den, v)
+
+    error = vel - v
+    scale = -2.0 / n
+    # dL/dv . dv/dx, with v linear in both K_t/J and b0
+    g_v = scale * np.dot(error, v)
+    g_d1 = -scale * np.dot(error[1:], w[:-1])
+    g_d2 = -scale * np.dot(error[2:], w[:-2])
+
+    dalpha_dtau = -dt / (tau + dt)**2
+    grad = np.array([
+        -g_v / J - g_d1 * alpha * dt * B / J**2,             # J
+        g_d1 * alpha * dt / J,                                # B
+        g_v / K_t,                                            # K_t
+        (g_v / alpha + g_d1 * (1.0 + B / J * dt) - g_d2) * dalpha_dtau,  # tau
+    ])
+
+    return float(np.mean(error**2)), grad
+
+
 @dataclass
 class MotorParameters:
     """Physical motor parameters identified from tests."""
@@ -190,42 +255,19 @@ class SystemIdentification:
 
         # Motor dynamics: J*a + B*v = K_t * i_q
         # Rearrange: a = (K_t/J)*i_q - (B/J)*v
+        # (with a low-pass time constant on a, see _simulate_velocity)
 
-        def motor_dynamics(params, t_data, i_q_data, v_data):
-            """Simulate motor dynamics with given parameters."""
-            J, B, K_t, tau = params
-
-            # Simple Euler integration
-            v_sim = np.zeros_like(t_data)
-            a_sim = np.zeros_like(t_data)
-
-            for i in range(1, len(t_data)):
-                dt = t_data[i] - t_data[i-1]
-
-                # Motor equation with time constant
-                torque = K_t * i_q_data[i]
-                friction = B * v_sim[i-1]
-
-                # Acceleration
-                a_sim[i] = (torque - friction) / J
-
-                # Apply time constant (low-pass filter on acceleration)
-                alpha = dt / (tau + dt)
-                a_sim[i] = alpha * a_sim[i] + (1 - alpha) * a_sim[i-1]
-
-                # Integrate to velocity
-                v_sim[i] = v_sim[i-1] + a_sim[i] * dt
-
-            return v_sim
+        # Invariant over the optimization
+        dt = (t[-1] - t[0]) / (len(t) - 1)
+        i_q_fit = np.array(i_q, dtype=np.float64)
+        i_q_fit[0] = 0.0
 
         def objective(params):
             """Objective function: minimize velocity tracking error."""
             if np.any(np.array(params) <= 0):  # All params must be positive
-                return 1e10
+                return 1e10, np.zeros(len(params))
 
-            v_sim = motor_dynamics(params, t, i_q, vel)
-            error = np.mean((vel - v_sim)**2)
-            return error
+            return _velocity_fit_error(params, dt, i_q_fit, vel)
 
         # Initial guess (reasonable values for small motor)
         J_init = 0.001      # kg·m²
@@ -245,7 +287,8 @@ class SystemIdentification:
 
         # Optimize
         print("  Running optimization...")
-        result = minimize(objective, x0, method='L-BFGS-B', bounds=bounds)
+        result = minimize(objective, x0, jac=True, method='L-BFGS-B',
+                          bounds=bounds)
 
         if not result.success:
             print(f"  Warning: Optimization did not converge: {result.message}")
@@ -351,25 +394,8 @@ class SystemIdentification:
 
     def _simulate_model(self, t, i_q, params: MotorParameters) -> np.ndarray:
         """Simulate motor model forward in time."""
-        vel = np.zeros_like(t)
-        acc = 0.0
-
-        for i in range(1, len(t)):
-            dt = t[i] - t[i-1]
-
-            # Motor dynamics
-            torque = params.K_t * i_q[i]
-            friction = params.B * vel[i-1]
-            acc_new = (torque - friction) / params.J
-
-            # Apply time constant
-            alpha = dt / (params.tau_current + dt)
-            acc = alpha * acc_new + (1 - alpha) * acc
-
-            # Integrate
-            vel[i] = vel[i-1] + acc * dt
-
-        return vel
+        return _simulate_velocity(t, i_q, params.J, params.B, params.K_t,
+                                  params.tau_current)
 
     def generate_statespace_matrices(self, params: MotorParameters) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -560,13 +586,8 @@ def main():
     B_true = 0.02
     K_t_true = 0.15
 
-    vel = np.zeros_like(t)
-    for i in range(1, len(t)):
-        dt = t[i] - t[i-1]
-        torque = K_t_true * i_q[i]
-        friction = B_true * vel[i-1]
-        acc = (torque - friction) / J_true
-        vel[i] = vel[i-1] + acc * dt
+    # Motor model without current-loop lag (tau = 0)
+    vel = _simulate_velocity(t, i_q, J_true, B_true, K_t_true, 0.0)
 
     pos = np.cumsum(vel) * (t[1] - t[0])
 
@@ -19,6 +19,8 @@ Register Map:
 
 import math
 
+SQRT3_2 = 0.8660254037844386  # sin(120°)
+
 
 class AdcMock:
     """ADC peripheral mock for current sensing"""
@@ -93,21 +95,20 @@ class AdcMock:
         # Increment angle
         self.angle_rad += self.velocity_rad_s * dt_sec
 
-        # Generate 3-phase sinusoidal currents
+        # Generate 3-phase sinusoidal currents from one sin/cos pair:
+        # sin(theta -/+ 120°) = -sin(theta)/2 -/+ sqrt(3)/2 * cos(theta)
+        sin_a = math.sin(self.angle_rad)
+        half_sin = -0.5 * sin_a
+        cos_term = SQRT3_2 * math.cos(self.angle_rad)
+
         # Phase A: sin(theta)
-        self.phase_a = self.offset + int(
-            self.current_amplitude * math.sin(self.angle_rad)
-        )
+        self.phase_a = self.offset + int(self.current_amplitude * sin_a)
 
         # Phase B: sin(theta - 120°)
-        self.phase_b = self.offset + int(
-            self.current_amplitude * math.sin(self.angle_rad - 2.094)
-        )
+        self.phase_b = self.offset + int(self.current_amplitude * (half_sin - cos_term))
 
         # Phase C: sin(theta + 120°)
-        self.phase_c = self.offset + int(
-            self.current_amplitude * math.sin(self.angle_rad + 2.094)
-        )
+        self.phase_c = self.offset + int(self.current_amplitude * (half_sin + cos_term))
 
         # Clamp values
         self.phase_a = max(0, min(4095, self.phase_a))
@@ -6,11 +6,16 @@ Collects telemetry data from Renode mock peripherals and saves for post-analysis
 
 import json
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # Renode image ships without it; fall back to json
+    orjson = None
+
 
 @dataclass
 class FocSnapshot:
@@ -31,6 +36,10 @@ class FocSnapshot:
     health_score: float  # Health monitor score (0-100)
 
 
+# FocSnapshot fields, in column order
+_FIELDS = tuple(FocSnapshot.__dataclass_fields__)
+
+
 class TestDataCollector:
     """
     Collects FOC telemetry during Renode tests.
@@ -41,6 +50,10 @@ class TestDataCollector:
     - Exports to JSON/CSV
     - Compatible with analyze.py
 
+    Samples are stored column-wise (one float64 array per FocSnapshot
+    field), so recording a sample is a handful of scalar stores and the
+    exporters work on whole columns.
+
     Usage:
         collector = TestDataCollector("motion_planning_test")
         collector.add_snapshot(FocSnapshot(...))
@@ -55,7 +68,8 @@ class TestDataCollector:
             test_name: Name of the test case
         """
         self.test_name = test_name
-        self.snapshots: List[FocSnapshot] = []
+        self.columns = {name: np.empty(0) for name in _FIELDS}
+        self._count = 0
         self.start_time = time.time()
         self.metadata = {
             "test_name": test_name,
@@ -64,9 +78,44 @@ class TestDataCollector:
             "firmware_version": "iRPC v2.0",
         }
 
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def snapshots(self) -> List[FocSnapshot]:
+        """Collected samples as FocSnapshot objects (built on access)."""
+        return [FocSnapshot(*row) for row in zip(*self._column_lists())]
+
+    def preallocate(self, n: int):
+        """
+        Reserve room for n samples in total.
+
+        Args:
+            n: Expected number of samples
+        """
+        if n > len(self.columns["timestamp"]):
+            for name, col in self.columns.items():
+                grown = np.zeros(n)
+                grown[: self._count] = col[: self._count]
+                self.columns[name] = grown
+
+    def _next_index(self) -> int:
+        """Index for one new sample, growing the columns when full."""
+        k = self._count
+        if k == len(self.columns["timestamp"]):
+            self.preallocate(max(1024, 2 * k))
+        self._count = k + 1
+        return k
+
+    def _column_lists(self) -> List[list]:
+        """Filled part of every column as Python lists, in _FIELDS order."""
+        return [self.columns[name][: self._count].tolist() for name in _FIELDS]
+
     def add_snapshot(self, snapshot: FocSnapshot):
         """Add telemetry snapshot to collection."""
-        self.snapshots.append(snapshot)
+        k = self._next_index()
+        for name in _FIELDS:
+            self.columns[name][k] = getattr(snapshot, name)
 
     def add_from_peripherals(
         self,
@@ -82,6 +131,7 @@ class TestDataCollector:
         load_estimate: float = 0.0,
         temperature: float = 25.0,
         health_score: float = 100.0,
+        timestamp: Optional[float] = None,
     ):
         """
         Add snapshot from Renode mock peripheral values.
@@ -99,43 +149,132 @@ class TestDataCollector:
             load_estimate: From adaptive controller
             temperature: From motor simulator
             health_score: From health monitor
+            timestamp: Simulation time (s); defaults to wall-clock time since start
         """
-        snapshot = FocSnapshot(
-            timestamp=time.time() - self.start_time,
-            position=encoder_position,
-            velocity=encoder_velocity,
-            target_position=target_position,
-            target_velocity=target_velocity,
-            i_q=adc_i_q,
-            i_d=adc_i_d,
-            load_estimate=load_estimate,
-            pwm_duty_a=motor_pwm_a,
-            pwm_duty_b=motor_pwm_b,
-            pwm_duty_c=motor_pwm_c,
-            temperature=temperature,
-            health_score=health_score,
-        )
-        self.add_snapshot(snapshot)
+        if timestamp is None:
+            timestamp = time.time() - self.start_time
+
+        k = self._next_index()
+        cols = self.columns
+        cols["timestamp"][k] = timestamp
+        cols["position"][k] = encoder_position
+        cols["velocity"][k] = encoder_velocity
+        cols["target_position"][k] = target_position
+        cols["target_velocity"][k] = target_velocity
+        cols["i_q"][k] = adc_i_q
+        cols["i_d"][k] = adc_i_d
+        cols["load_estimate"][k] = load_estimate
+        cols["pwm_duty_a"][k] = motor_pwm_a
+        cols["pwm_duty_b"][k] = motor_pwm_b
+        cols["pwm_duty_c"][k] = motor_pwm_c
+        cols["temperature"][k] = temperature
+        cols["health_score"][k] = health_score
+
+    def extend_from_peripherals(
+        self,
+        encoder_position: np.ndarray,
+        encoder_velocity: np.ndarray,
+        adc_i_q: np.ndarray,
+        adc_i_d: np.ndarray,
+        motor_pwm_a: np.ndarray,
+        motor_pwm_b: np.ndarray,
+        motor_pwm_c: np.ndarray,
+        target_position: np.ndarray = 0.0,
+        target_velocity: np.ndarray = 0.0,
+        load_estimate: np.ndarray = 0.0,
+        temperature: np.ndarray = 25.0,
+        health_score: np.ndarray = 100.0,
+        *,
+        timestamp: np.ndarray,
+    ):
+        """
+        Append a whole recorded trace (array version of add_from_peripherals).
+
+        Every argument is an array of per-sample values, all of the same
+        length as timestamp; scalars are broadcast, and omitted channels
+        take the same defaults as in add_from_peripherals. The columns grow
+        at most once per call, so a simulation should record its trace and
+        add it here in one batch rather than sample by sample.
+        """
+        values = {
+            "timestamp": timestamp,
+            "position": encoder_position,
+            "velocity": encoder_velocity,
+            "target_position": target_position,
+            "target_velocity": target_velocity,
+            "i_q": adc_i_q,
+            "i_d": adc_i_d,
+            "load_estimate": load_estimate,
+            "pwm_duty_a": motor_pwm_a,
+            "pwm_duty_b": motor_pwm_b,
+            "pwm_duty_c": motor_pwm_c,
+            "temperature": temperature,
+            "health_score": health_score,
+        }
+        n = len(timestamp)
+        start = self._count
+        if start + n > len(self.columns["timestamp"]):
+            # Grow geometrically so repeated small batches stay amortized O(1)
+            self.preallocate(max(start + n, 2 * start))
+        for name, value in values.items():
+            self.columns[name][start : start + n] = value
+        self._count = start + n
 
     def save_json(self, filepath: str):
         """
         Save collected data to JSON.
 
+        Non-finite samples (NaN/Infinity) are kept as the NaN/Infinity
+        tokens that json.load reads back; orjson, used otherwise for speed
+        when installed, would write them as null.
+
         Args:
             filepath: Output JSON file path
         """
         output = {
             "metadata": self.metadata,
-            "samples": [asdict(s) for s in self.snapshots],
+            "samples": [dict(zip(_FIELDS, row)) for row in zip(*self._column_lists())],
             "statistics": self._calculate_statistics(),
         }
 
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
-        with open(filepath, "w") as f:
-            json.dump(output, f, indent=2)
+        n = self._count
+        if orjson is not None and all(
+            np.isfinite(self.columns[name][:n]).all() for name in _FIELDS
+        ):
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, "w") as f:
+                json.dump(output, f, indent=2)
+
+        print(f"✓ Saved {len(self)} samples to {filepath}")
+
+    def save_npz(self, filepath: str, dtype=np.float64):
+        """
+        Save collected data as columnar NumPy arrays (one array per field).
 
-        print(f"✓ Saved {len(self.snapshots)} samples to {filepath}")
+        Loading with np.load avoids building a dict per sample, which makes
+        it much faster than the JSON dump for post-analysis.
+
+        Args:
+            filepath: Output .npz file path
+            dtype: Stored column dtype. np.float32 halves the file (and the
+                memory of every array loaded from it) at ~7 significant
+                digits, plenty for plotting but coarse for tracking errors.
+        """
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+
+        np.savez_compressed(
+            filepath,
+            **{
+                name: col[: self._count].astype(dtype, copy=False)
+                for name, col in self.columns.items()
+            },
+        )
+
+        print(f"✓ Saved {len(self)} samples to {filepath}")
 
     def save_csv(self, filepath: str):
         """
@@ -149,17 +288,14 @@ class TestDataCollector:
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
         with open(filepath, "w", newline="") as f:
-            if not self.snapshots:
+            if not len(self):
                 return
 
-            fieldnames = list(asdict(self.snapshots[0]).keys())
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for snapshot in self.snapshots:
-                writer.writerow(asdict(snapshot))
+            writer = csv.writer(f)
+            writer.writerow(_FIELDS)
+            writer.writerows(zip(*self._column_lists()))
 
-        print(f"✓ Saved {len(self.snapshots)} samples to {filepath}")
+        print(f"✓ Saved {len(self)} samples to {filepath}")
 
     def save_pandas_csv(self, filepath: str):
         """
@@ -173,38 +309,38 @@ class TestDataCollector:
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
         # Format for analyze.py: time, position, velocity, load, temperature
+        n = self._count
+        columns = [
+            self.columns[name][:n].tolist()
+            for name in (
+                "timestamp",
+                "position",
+                "velocity",
+                "load_estimate",
+                "temperature",
+            )
+        ]
         with open(filepath, "w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(["time", "position", "velocity", "load", "temperature"])
+            writer.writerows(zip(*columns))
 
-            for snapshot in self.snapshots:
-                writer.writerow(
-                    [
-                        snapshot.timestamp,
-                        snapshot.position,
-                        snapshot.velocity,
-                        snapshot.load_estimate,
-                        snapshot.temperature,
-                    ]
-                )
-
-        print(
-            f"✓ Saved {len(self.snapshots)} samples (analyze.py format) to {filepath}"
-        )
+        print(f"✓ Saved {len(self)} samples (analyze.py format) to {filepath}")
 
     def _calculate_statistics(self) -> dict:
         """Calculate statistical summary of collected data."""
-        if not self.snapshots:
+        n = self._count
+        if not n:
             return {}
 
-        positions = np.array([s.position for s in self.snapshots])
-        velocities = np.array([s.velocity for s in self.snapshots])
-        currents_q = np.array([s.i_q for s in self.snapshots])
-        loads = np.array([s.load_estimate for s in self.snapshots])
+        positions = self.columns["position"][:n]
+        velocities = self.columns["velocity"][:n]
+        currents_q = self.columns["i_q"][:n]
+        loads = self.columns["load_estimate"][:n]
 
         return {
-            "sample_count": len(self.snapshots),
-            "duration_s": self.snapshots[-1].timestamp if self.snapshots else 0.0,
+            "sample_count": n,
+            "duration_s": float(self.columns["timestamp"][n - 1]),
             "position": {
                 "mean": float(np.mean(positions)),
                 "std": float(np.std(positions)),
@@ -340,8 +476,10 @@ if __name__ == "__main__":
     # Simulate 1 second of FOC loop at 10 kHz
     dt = 0.0001  # 100 µs (10 kHz)
     target = 1.57  # 90 degrees
+    n_samples = 10000
+    collector.preallocate(n_samples)
 
-    for i in range(10000):
+    for i in range(n_samples):
         t = i * dt
 
         # Simulate motion towards target
@@ -3,31 +3,116 @@
 Analyze tracking error sources to identify improvement opportunities.
 """
 
-import json
 import numpy as np
 import matplotlib.pyplot as plt
+import orjson
+from functools import lru_cache
+from numba import njit
+from scipy import signal
 from pathlib import Path
 
+# Radians to degrees (180/π), avoids ufunc dispatch on scalars
+R2D = 57.29577951308232
 
-def analyze_tracking_error(json_file: str):
-    """Analyze tracking error profile to identify improvement opportunities."""
+# Sample fields used by the analysis, in column order
+_COLUMNS = ("timestamp", "position", "velocity", "target_position", "target_velocity")
 
-    with open(json_file, "r") as f:
-        data = json.load(f)
 
+@njit(cache=True)
+def _phase_stats(x: np.ndarray) -> tuple[float, float, float]:
+    """Mean |x|, RMS and max |x| in a single pass over x."""
+    s = 0.0
+    s2 = 0.0
+    m = 0.0
+    n = len(x)
+    for i in range(n):
+        a = abs(x[i])
+        s += a
+        s2 += x[i] * x[i]
+        if a > m:
+            m = a
+    return s / n, (s2 / n) ** 0.5, m
+
+
+@njit(cache=True)
+def _zero_crossings(x: np.ndarray) -> int:
+    """Number of sign changes in x, counted in one pass without temporaries."""
+    count = 0
+    for i in range(1, len(x)):
+        if (x[i] < 0.0) != (x[i - 1] < 0.0):
+            count += 1
+    return count
+
+
+def _windowed_xcorr(a: np.ndarray, b: np.ndarray, maxlag: int) -> np.ndarray:
+    """Cross-correlation of a and b restricted to lags -maxlag..+maxlag.
+
+    Element k of the result equals np.correlate(a, b, mode="full") at lag
+    k - maxlag. Narrow windows evaluate only 2*maxlag + 1 dot products;
+    wide ones defer to scipy.signal.correlate(method="auto"), which picks
+    direct or FFT evaluation from its cost model.
+    """
+    n = len(a)
+    maxlag = min(maxlag, n - 1)
+    if 2 * maxlag + 1 > 4 * np.log2(n):
+        full = signal.correlate(a, b, mode="full", method="auto")
+        return full[n - 1 - maxlag : n + maxlag]
+
+    corr = np.empty(2 * maxlag + 1)
+    for k in range(-maxlag, maxlag + 1):
+        if k >= 0:
+            corr[k + maxlag] = np.dot(a[k:], b[: n - k])
+        else:
+            corr[k + maxlag] = np.dot(a[: n + k], b[-k:])
+    return corr
+
+
+@lru_cache(maxsize=8)
+def _load_columns_cached(json_file: str, mtime_ns: int) -> np.ndarray:
+    data = orjson.loads(Path(json_file).read_bytes())
     samples = data["samples"]
 
+    # Single pass over the samples, then transpose to contiguous columns
+    rows = [[s[key] for key in _COLUMNS] for s in samples]
+    columns = np.ascontiguousarray(np.array(rows, dtype=np.float64).T)
+
+    columns.flags.writeable = False
+    return columns
+
+
+def _load_columns(json_file: str) -> np.ndarray:
+    """Load a (5, N) array of the _COLUMNS fields for a collector dump.
+
+    Prefers the columnar .npz written next to the JSON by
+    TestDataCollector.save_npz, unless the JSON is newer (rewritten by a
+    JSON-only writer); otherwise parses the JSON (cached per path and
+    modification time).
+    """
+    json_mtime_ns = Path(json_file).stat().st_mtime_ns
+    npz_file = Path(json_file).with_suffix(".npz")
+    if npz_file.exists() and npz_file.stat().st_mtime_ns >= json_mtime_ns:
+        with np.load(npz_file) as d:
+            # Dumps may be stored as float32; analyze in float64
+            return np.stack([d[key] for key in _COLUMNS]).astype(np.float64, copy=False)
+
+    return _load_columns_cached(json_file, json_mtime_ns)
+
+
+def analyze_tracking_error(json_file: str, maxlag_ms: float = 50.0):
+    """Analyze tracking error profile to identify improvement opportunities.
+
+    Args:
+        json_file: Path to collector JSON output
+        maxlag_ms: Largest phase lag (ms) searched by the cross-correlation
+    """
     # Extract data
-    time = np.array([s["timestamp"] for s in samples])
-    position = np.array([s["position"] for s in samples])
-    velocity = np.array([s["velocity"] for s in samples])
-    target_pos = np.array([s["target_position"] for s in samples])
-    target_vel = np.array([s["target_velocity"] for s in samples])
+    time, position, velocity, target_pos, target_vel = _load_columns(json_file)
 
     # Calculate errors
     pos_error = target_pos - position
     vel_error = target_vel - velocity
-    pos_error_deg = np.rad2deg(pos_error)
+    pos_error_deg = pos_error * R2D
+    abs_err = np.abs(pos_error_deg)
 
     # Identify phases
     # Phase 1: Acceleration (velocity increasing)
@@ -51,48 +136,61 @@ def analyze_tracking_error(json_file: str):
     print("=" * 80)
 
     print(f"\nOverall Statistics:")
-    print(f"  RMS error: {np.rad2deg(np.sqrt(np.mean(pos_error**2))):.3f}°")
-    print(f"  Max error: {np.max(np.abs(pos_error_deg)):.3f}°")
-    print(f"  Mean error: {np.mean(np.abs(pos_error_deg)):.3f}°")
+    mean_error, overall_rms, max_error = _phase_stats(pos_error_deg)
+    print(f"  RMS error: {overall_rms:.3f}°")
+    print(f"  Max error: {max_error:.3f}°")
+    print(f"  Mean error: {mean_error:.3f}°")
     print(f"  Std dev: {np.std(pos_error_deg):.3f}°")
 
     print(f"\nError by Phase:")
     for phase_name, phase_mask in phases:
         if np.sum(phase_mask) > 0:
-            phase_pos_error = pos_error_deg[phase_mask]
-            phase_vel_error = vel_error[phase_mask]
+            pos_mean, pos_rms, pos_max = _phase_stats(pos_error_deg[phase_mask])
+            _, vel_rms, vel_max = _phase_stats(vel_error[phase_mask])
 
             print(f"\n  {phase_name}:")
-            print(f"    Position RMS: {np.sqrt(np.mean(phase_pos_error**2)):.3f}°")
-            print(f"    Position Max: {np.max(np.abs(phase_pos_error)):.3f}°")
-            print(f"    Position Mean: {np.mean(np.abs(phase_pos_error)):.3f}°")
-            print(f"    Velocity RMS: {np.sqrt(np.mean(phase_vel_error**2)):.3f} rad/s")
-            print(f"    Velocity Max: {np.max(np.abs(phase_vel_error)):.3f} rad/s")
+            print(f"    Position RMS: {pos_rms:.3f}°")
+            print(f"    Position Max: {pos_max:.3f}°")
+            print(f"    Position Mean: {pos_mean:.3f}°")
+            print(f"    Velocity RMS: {vel_rms:.3f} rad/s")
+            print(f"    Velocity Max: {vel_max:.3f} rad/s")
 
     # Find where error is largest
-    max_error_idx = np.argmax(np.abs(pos_error_deg))
+    max_error_idx = np.argmax(abs_err)
     print(f"\nMax Error Location:")
     print(f"  Time: {time[max_error_idx]:.3f} s")
     print(
-        f"  Position: {position[max_error_idx]:.3f} rad ({np.rad2deg(position[max_error_idx]):.1f}°)"
+        f"  Position: {position[max_error_idx]:.3f} rad ({position[max_error_idx] * R2D:.1f}°)"
     )
     print(
-        f"  Target: {target_pos[max_error_idx]:.3f} rad ({np.rad2deg(target_pos[max_error_idx]):.1f}°)"
+        f"  Target: {target_pos[max_error_idx]:.3f} rad ({target_pos[max_error_idx] * R2D:.1f}°)"
     )
     print(f"  Error: {pos_error_deg[max_error_idx]:.3f}°")
     print(f"  Velocity: {velocity[max_error_idx]:.3f} rad/s")
     print(f"  Target velocity: {target_vel[max_error_idx]:.3f} rad/s")
 
     # Analyze lag
-    # Find phase lag by cross-correlation
+    # Find phase lag by cross-correlation, searching only physically
+    # plausible lags (tens of ms) instead of the whole trace
     if len(position) > 100:
-        correlation = np.correlate(
-            target_pos - np.mean(target_pos), position - np.mean(position), mode="full"
-        )
-        lag_idx = np.argmax(correlation) - (len(position) - 1)
-        lag_time = lag_idx * (time[1] - time[0]) if len(time) > 1 else 0
+        # Median positive interval: robust to duplicated log timestamps
+        steps = np.diff(time)
+        steps = steps[steps > 0]
+        if steps.size == 0:
+            raise ValueError(f"{json_file}: time base is not increasing")
+        dt = float(np.median(steps))
+        maxlag = max(1, int(maxlag_ms * 1e-3 / dt))
+        # Zero mean, unit std so the peak is a correlation coefficient
+        a = (target_pos - np.mean(target_pos)) / (np.std(target_pos) + 1e-12)
+        b = (position - np.mean(position)) / (np.std(position) + 1e-12)
+        correlation = _windowed_xcorr(a, b, maxlag)
+        peak = np.argmax(correlation)
+        lag_idx = peak - (len(correlation) - 1) // 2
+        lag_corr = correlation[peak] / len(position)
+        lag_time = lag_idx * dt
         print(f"\nPhase Lag:")
         print(f"  Lag: {lag_idx} samples ({lag_time*1000:.1f} ms)")
+        print(f"  Peak correlation: {lag_corr:.3f}")
 
     # Steady-state error
     final_100 = pos_error_deg[-100:]
@@ -121,7 +219,7 @@ def analyze_tracking_error(json_file: str):
         issues.append("   → Solution: Increase integral gain (ki_vel)")
 
     # Check for oscillations
-    zero_crossings = np.sum(np.diff(np.sign(pos_error_deg[settling_phase])) != 0)
+    zero_crossings = _zero_crossings(pos_error_deg[settling_phase])
     if zero_crossings > 5:
         issues.append(
             f"⚠️  Oscillations in settling phase: {zero_crossings} zero crossings"
@@ -129,7 +227,7 @@ def analyze_tracking_error(json_file: str):
         issues.append("   → Solution: Increase derivative gain or reduce P/I gains")
 
     # Check for large transient errors
-    max_transient = np.max(np.abs(pos_error_deg[accel_phase | decel_phase]))
+    max_transient = np.max(abs_err[accel_phase | decel_phase])
     if max_transient > 5:
         issues.append(f"⚠️  Large transient error: {max_transient:.3f}°")
         issues.append("   → Solution: Add acceleration feedforward or increase P gain")
@@ -141,9 +239,10 @@ def analyze_tracking_error(json_file: str):
         print(issue)
 
     return {
-        "overall_rms": np.rad2deg(np.sqrt(np.mean(pos_error**2))),
-        "max_error": np.max(np.abs(pos_error_deg)),
+        "overall_rms": overall_rms,
+        "max_error": max_error,
         "lag_samples": lag_idx if len(position) > 100 else 0,
+        "lag_correlation": lag_corr if len(position) > 100 else 0.0,
         "steady_state_error": np.mean(final_100),
         "issues": issues,
     }
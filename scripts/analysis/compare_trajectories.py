@@ -8,6 +8,8 @@ trapezoidal and S-curve trajectories using the optimized Option 14 controller.
 
 import sys
 import numpy as np
+from functools import lru_cache
+from numba import njit, types
 from pathlib import Path
 from typing import Dict, Any
 
@@ -15,14 +17,187 @@ from typing import Dict, Any
 sys.path.insert(0, str(Path(__file__).parent.parent / "demos"))
 
 from demo_visualization import (
-    PIDController,
+    ScurvePlan,
+    map_in_workers,
     calculate_control_metrics,
-    generate_scurve_trajectory,
+    evaluate_scurve,
+    plan_scurve,
+    trapezoidal_phases,
+    trapezoidal_profile,
 )
 
 # Add physics model
 sys.path.insert(0, str(Path(__file__).parent.parent / "physics"))
-from motor_model import MotorDynamics, MotorParameters
+from motor_model import MotorParameters
+
+# Explicit kernel signatures: compiled (or loaded from the numba cache) once
+# at import, so every run and every pool worker skips type inference.
+_f8 = types.float64
+_f8_1d = types.Array(_f8, 1, "C")
+_f8_2d = types.Array(_f8, 2, "C")
+_ref_2d = types.Array(_f8, 2, "C", readonly=True)
+_plan = types.UniTuple(_f8, len(ScurvePlan._fields))  # tuple(ScurvePlan)
+
+# JIT-compiled point evaluation of a planned S-curve (same math as demos)
+_scurve_point = njit(types.UniTuple(_f8, 4)(_plan, _f8), cache=True)(evaluate_scurve)
+
+
+@njit(_f8_2d(types.int64, _f8, _plan), cache=True)
+def _scurve_profile(n, dt, plan):
+    """Evaluate a planned S-curve profile over n samples.
+
+    Returns:
+        (n, 3) array of (position, velocity, acceleration)
+    """
+    ref = np.empty((n, 3))
+    for i in range(n):
+        ref[i, 0], ref[i, 1], ref[i, 2], _ = _scurve_point(plan, i * dt)
+    return ref
+
+
+@lru_cache(maxsize=32)
+def _reference_trajectory(
+    trajectory_type: str,
+    n: int,
+    dt: float,
+    target: float,
+    max_vel: float,
+    max_accel: float,
+    max_jerk: float,
+    t_accel: float,
+    t_coast: float,
+    t_decel: float,
+) -> np.ndarray:
+    """Reference trajectory for one motion, cached across repeated runs.
+
+    Returns:
+        Read-only (n, 3) array of (position, velocity, acceleration)
+    """
+    if trajectory_type == "scurve":
+        plan = plan_scurve(target, max_vel, max_accel, max_jerk)
+        ref = _scurve_profile(n, dt, tuple(plan))
+    else:
+        t_arr = np.arange(n) * dt
+        ref = np.column_stack(  # C-contiguous, as _simulate expects
+            trapezoidal_profile(
+                t_arr, target, max_vel, max_accel, t_accel, t_coast, t_decel
+            )
+        )
+    ref.flags.writeable = False
+    return ref
+
+
+@njit(
+    types.UniTuple(_f8_1d, 3)(_ref_2d, *([_f8] * 18)),
+    cache=True,
+    fastmath=True,
+)
+def _simulate(
+    ref,
+    max_vel,
+    max_accel,
+    dt,
+    kp_pos,
+    ki_pos,
+    kp_vel,
+    ki_vel,
+    kd_vel,
+    kff_vel,
+    kff_accel,
+    kff_friction,
+    J,
+    kt,
+    b,
+    tau_coulomb,
+    tau_stribeck,
+    v_stribeck,
+    b_viscous,
+):
+    """Cascade controller + motor physics loop (nopython).
+
+    Tracks the precomputed (n, 3) reference trajectory. Mirrors PIDController.update
+    and MotorDynamics.update at nominal temperature.
+
+    Returns:
+        Tuple of (position, velocity, vel_error) arrays
+    """
+    n = ref.shape[0]
+    position_arr = np.empty(n)
+    velocity_arr = np.empty(n)
+    vel_error_arr = np.empty(n)
+
+    # Motor state
+    position = 0.0
+    velocity = 0.0
+
+    # Position integral term
+    pos_integral = 0.0
+
+    # Velocity PID state
+    integ = 0.0
+    prev_err = 0.0
+
+    for i in range(n):
+        target_pos = ref[i, 0]
+        target_vel = ref[i, 1]
+        target_accel = ref[i, 2]
+
+        # Controller (cascade with feedforward)
+        pos_error = target_pos - position
+
+        # Outer loop (position -> velocity) with PI control
+        pos_integral += pos_error * dt
+        pos_integral = min(0.2, max(-0.2, pos_integral))  # Anti-windup
+
+        target_vel_from_pos = kp_pos * pos_error + ki_pos * pos_integral
+        target_vel_from_pos = min(max_vel, max(-max_vel, target_vel_from_pos))
+
+        # Combine with feedforward
+        target_vel_combined = kff_vel * target_vel + target_vel_from_pos
+
+        # Inner loop (velocity -> acceleration), PID with anti-windup
+        vel_error = target_vel_combined - velocity
+        integ += vel_error * dt
+        integ = min(max_vel, max(-max_vel, integ))
+        if i == 0:
+            d_term = 0.0
+        else:
+            d_term = kd_vel * (vel_error - prev_err) / dt
+        prev_err = vel_error
+        accel_fb = kp_vel * vel_error + ki_vel * integ + d_term
+        accel_fb = min(max_accel, max(-max_accel, accel_fb))
+
+        # Add acceleration feedforward + friction compensation
+        accel_ff = kff_accel * target_accel + kff_friction * velocity
+        accel = accel_fb + accel_ff
+
+        # Apply saturation
+        accel = min(max_accel, max(-max_accel, accel))
+
+        # Convert desired acceleration to motor current
+        desired_torque = J * accel
+        i_q = desired_torque / kt
+        i_q = min(10.0, max(-10.0, i_q))  # Current limit
+
+        # Stribeck friction (temperature factor is 1.0 at nominal temp)
+        if abs(velocity) > 1e-6:
+            sign = 1.0 if velocity > 0.0 else -1.0
+        else:
+            sign = 0.0
+        stribeck = tau_stribeck * np.exp(-((velocity / v_stribeck) ** 2))
+        tau_friction = tau_coulomb * sign + stribeck * sign + b_viscous * velocity
+
+        # Motor dynamics (Euler)
+        tau_net = kt * i_q - b * velocity - tau_friction
+        velocity += tau_net / J * dt
+        position += velocity * dt
+
+        # Store data
+        position_arr[i] = position
+        velocity_arr[i] = velocity
+        vel_error_arr[i] = vel_error
+
+    return position_arr, velocity_arr, vel_error_arr
 
 
 def simulate_motion_comparison(
@@ -36,6 +211,7 @@ def simulate_motion_comparison(
     kff_accel: float = 0.3,
     kff_friction: float = 0.0,
     max_jerk: float = 50.0,
+    dt: float = 0.0001,  # 10 kHz simulation
 ) -> Dict[str, Any]:
     """Run simulation with specified trajectory type and return metrics.
 
@@ -49,6 +225,11 @@ def simulate_motion_comparison(
         kff_vel: Velocity feedforward gain
         kff_accel: Acceleration feedforward gain
         max_jerk: Maximum jerk for S-curve (rad/s³)
+        dt: Simulation/control step (s). Coarser steps (e.g. 1 kHz) run
+            proportionally faster for quick sweeps but shift the error
+            metrics by a few hundredths of a degree (stiction and
+            saturation make them non-smooth in dt), so final comparisons
+            should keep the 10 kHz default.
 
     Returns:
         Dictionary with simulation results and metrics
@@ -57,147 +238,65 @@ def simulate_motion_comparison(
     target = 1.57  # 90 degrees
     max_vel = 2.0  # rad/s
     max_accel = 5.0  # rad/s²
-    dt = 0.0001  # 10 kHz simulation
 
     # Calculate motion phases for trapezoidal
-    t_accel = max_vel / max_accel
-    t_coast = 0.0
-    t_decel = t_accel
-
-    x_accel = 0.5 * max_accel * t_accel**2
-    if 2 * x_accel < target:
-        t_coast = (target - 2 * x_accel) / max_vel
-    else:
-        t_accel = np.sqrt(target / max_accel)
-        t_decel = t_accel
-        max_vel = max_accel * t_accel
+    t_accel, t_coast, t_decel, max_vel = trapezoidal_phases(target, max_vel, max_accel)
 
     duration = t_accel + t_coast + t_decel + 0.2  # Add settling time
     n_samples = int(duration / dt)
 
-    # Initialize motor dynamics with realistic physics
+    # Realistic motor physics
     motor_params = MotorParameters(
         J=0.001,  # kg·m² - Rotor inertia
         kt=0.15,  # Nm/A - Torque constant
         b=0.0005,  # Nm·s/rad - Viscous damping
     )
-    motor = MotorDynamics(motor_params)
-    motor.reset(position=0.0, velocity=0.0)
 
-    # Position integral term
-    pos_integral = 0.0
-
-    # Initialize controller
-    vel_controller = PIDController(
-        kp=kp_vel,
-        ki=ki_vel,
-        kd=kd_vel,
-        max_integral=max_vel,
-        max_output=max_accel,
+    time_arr = np.arange(n_samples) * dt
+
+    # Reference trajectory (independent of controller state)
+    ref = _reference_trajectory(
+        trajectory_type,
+        n_samples,
+        dt,
+        target,
+        max_vel,
+        max_accel,
+        max_jerk,
+        t_accel,
+        t_coast,
+        t_decel,
     )
 
-    # Storage for analysis
-    position_arr = []
-    velocity_arr = []
-    target_pos_arr = []
-    target_vel_arr = []
-    target_accel_arr = []
-    pos_error_arr = []
-    vel_error_arr = []
-    time_arr = []
-
-    # Simulation loop
-    for i in range(n_samples):
-        t = i * dt
-
-        # Generate trajectory
-        if trajectory_type == "scurve":
-            target_pos, target_vel, target_accel, _ = generate_scurve_trajectory(
-                t, target, max_vel, max_accel, max_jerk
-            )
-        else:
-            # Trapezoidal
-            if t < t_accel:
-                target_vel = max_accel * t
-                target_pos = 0.5 * max_accel * t**2
-                target_accel = max_accel
-            elif t < t_accel + t_coast:
-                target_vel = max_vel
-                target_pos = 0.5 * max_accel * t_accel**2 + max_vel * (t - t_accel)
-                target_accel = 0.0
-            elif t < t_accel + t_coast + t_decel:
-                t_dec = t - t_accel - t_coast
-                target_vel = max_vel - max_accel * t_dec
-                target_pos = (
-                    0.5 * max_accel * t_accel**2
-                    + max_vel * t_coast
-                    + max_vel * t_dec
-                    - 0.5 * max_accel * t_dec**2
-                )
-                target_accel = -max_accel
-            else:
-                target_vel = 0.0
-                target_pos = target
-                target_accel = 0.0
-
-        # Controller (cascade with feedforward)
-        pos_error = target_pos - motor.position
-
-        # Outer loop (position -> velocity) with PI control
-        pos_integral += pos_error * dt
-        pos_integral = np.clip(pos_integral, -0.2, 0.2)  # Anti-windup
-
-        target_vel_from_pos = kp_pos * pos_error + ki_pos * pos_integral
-        target_vel_from_pos = np.clip(target_vel_from_pos, -max_vel, max_vel)
-
-        # Combine with feedforward
-        target_vel_combined = kff_vel * target_vel + target_vel_from_pos
-
-        # Inner loop (velocity -> acceleration)
-        vel_error = target_vel_combined - motor.velocity
-        accel_fb = vel_controller.update(vel_error, dt, feedforward=0.0)
-
-        # Add acceleration feedforward + friction compensation
-        accel_ff = kff_accel * target_accel + kff_friction * motor.velocity
-        accel = accel_fb + accel_ff
-
-        # Apply saturation
-        accel = np.clip(accel, -max_accel, max_accel)
-
-        # Convert desired acceleration to motor current
-        desired_torque = motor_params.J * accel
-        i_q = desired_torque / motor_params.kt
-        i_q = np.clip(i_q, -10.0, 10.0)  # Current limit
-
-        # Update motor dynamics with realistic physics
-        state = motor.update(i_q, external_load=0.0, dt=dt)
-        position = state["position"]
-        velocity = state["velocity"]
-
-        # Store data
-        position_arr.append(position)
-        velocity_arr.append(velocity)
-        target_pos_arr.append(target_pos)
-        target_vel_arr.append(target_vel)
-        target_accel_arr.append(target_accel)
-        pos_error_arr.append(pos_error)
-        vel_error_arr.append(vel_error)
-        time_arr.append(t)
-
-    # Convert to numpy arrays
-    position_arr = np.array(position_arr)
-    velocity_arr = np.array(velocity_arr)
-    target_pos_arr = np.array(target_pos_arr)
-    target_vel_arr = np.array(target_vel_arr)
-    target_accel_arr = np.array(target_accel_arr)
-    pos_error_arr = np.array(pos_error_arr)
-    vel_error_arr = np.array(vel_error_arr)
-    time_arr = np.array(time_arr)
+    # Simulation loop (compiled)
+    position_arr, velocity_arr, vel_error_arr = _simulate(
+        ref,
+        max_vel,
+        max_accel,
+        dt,
+        kp_pos,
+        ki_pos,
+        kp_vel,
+        ki_vel,
+        kd_vel,
+        kff_vel,
+        kff_accel,
+        kff_friction,
+        motor_params.J,
+        motor_params.kt,
+        motor_params.b,
+        motor_params.tau_coulomb,
+        motor_params.tau_stribeck,
+        motor_params.v_stribeck,
+        motor_params.b_viscous,
+    )
 
     # Calculate tracking error (position - target_position at each timestep)
-    tracking_error_arr = position_arr - target_pos_arr
-    rms_tracking_error = np.rad2deg(np.sqrt(np.mean(tracking_error_arr**2)))
-    max_tracking_error = np.rad2deg(np.max(np.abs(tracking_error_arr)))
+    tracking_error_arr = position_arr - ref[:, 0]
+    abs_err = np.abs(tracking_error_arr)
+    sq_err = tracking_error_arr**2
+    rms_tracking_error = np.rad2deg(np.sqrt(np.mean(sq_err)))
+    max_tracking_error = np.rad2deg(np.max(abs_err))
 
     # Calculate metrics using final target for overshoot detection
     metrics = calculate_control_metrics(position_arr, target, velocity_arr, max_vel, dt)
@@ -206,47 +305,35 @@ def simulate_motion_comparison(
     metrics["rms_error_deg"] = rms_tracking_error
     metrics["max_error_deg"] = max_tracking_error
 
-    # Additional phase-specific analysis
-    accel_phase_idx = np.where(time_arr < t_accel)[0]
+    # Additional phase-specific analysis (boolean masks, no index arrays)
+    accel_mask = time_arr < t_accel
     decel_phase_start = t_accel + t_coast
-    decel_phase_idx = np.where(
-        (time_arr >= decel_phase_start) & (time_arr < decel_phase_start + t_decel)
-    )[0]
-    settling_phase_idx = np.where(time_arr >= decel_phase_start + t_decel)[0]
+    decel_mask = (time_arr >= decel_phase_start) & (
+        time_arr < decel_phase_start + t_decel
+    )
+    settling_mask = time_arr >= decel_phase_start + t_decel
 
     # Phase metrics (using tracking error = actual - target)
-    if len(accel_phase_idx) > 0:
-        accel_phase_rms = np.rad2deg(
-            np.sqrt(np.mean(tracking_error_arr[accel_phase_idx] ** 2))
-        )
-        accel_phase_max = np.rad2deg(
-            np.max(np.abs(tracking_error_arr[accel_phase_idx]))
-        )
-        accel_vel_rms = np.sqrt(np.mean(vel_error_arr[accel_phase_idx] ** 2))
+    if accel_mask.any():
+        accel_phase_rms = np.rad2deg(np.sqrt(np.mean(sq_err[accel_mask])))
+        accel_phase_max = np.rad2deg(np.max(abs_err[accel_mask]))
+        accel_vel_rms = np.sqrt(np.mean(vel_error_arr[accel_mask] ** 2))
     else:
         accel_phase_rms = 0.0
         accel_phase_max = 0.0
         accel_vel_rms = 0.0
 
-    if len(decel_phase_idx) > 0:
-        decel_phase_rms = np.rad2deg(
-            np.sqrt(np.mean(tracking_error_arr[decel_phase_idx] ** 2))
-        )
-        decel_phase_max = np.rad2deg(
-            np.max(np.abs(tracking_error_arr[decel_phase_idx]))
-        )
+    if decel_mask.any():
+        decel_phase_rms = np.rad2deg(np.sqrt(np.mean(sq_err[decel_mask])))
+        decel_phase_max = np.rad2deg(np.max(abs_err[decel_mask]))
     else:
         decel_phase_rms = 0.0
         decel_phase_max = 0.0
 
-    if len(settling_phase_idx) > 0:
-        settling_mean = np.rad2deg(np.mean(tracking_error_arr[settling_phase_idx]))
-        settling_rms = np.rad2deg(
-            np.sqrt(np.mean(tracking_error_arr[settling_phase_idx] ** 2))
-        )
-        settling_max = np.rad2deg(
-            np.max(np.abs(tracking_error_arr[settling_phase_idx]))
-        )
+    if settling_mask.any():
+        settling_mean = np.rad2deg(np.mean(tracking_error_arr[settling_mask]))
+        settling_rms = np.rad2deg(np.sqrt(np.mean(sq_err[settling_mask])))
+        settling_max = np.rad2deg(np.max(abs_err[settling_mask]))
     else:
         settling_mean = 0.0
         settling_rms = 0.0
@@ -271,8 +358,14 @@ def simulate_motion_comparison(
     return metrics
 
 
-def compare_trajectories():
-    """Compare trapezoidal vs S-curve trajectories."""
+def compare_trajectories(max_workers: int = 1):
+    """Compare trapezoidal vs S-curve trajectories.
+
+    Args:
+        max_workers: Worker processes for the configuration sweep. The
+            default runs it in-process: the seven JIT-compiled simulations
+            take milliseconds, far below the cost of spawning a worker.
+    """
     print("=" * 80)
     print("TRAJECTORY COMPARISON: TRAPEZOIDAL VS S-CURVE")
     print("=" * 80)
@@ -292,23 +385,22 @@ def compare_trajectories():
         {"name": "S-curve (Jerk: 200 rad/s³)", "type": "scurve", "jerk": 200.0},
     ]
 
-    results = []
+    # Configs are independent (and can run across worker processes)
+    jobs = [
+        (
+            simulate_motion_comparison,
+            (
+                {"trajectory_type": "trapezoidal", "max_jerk": 50.0}  # Jerk not used
+                if config["type"] == "trapezoidal"
+                else {"trajectory_type": "scurve", "max_jerk": config["jerk"]}
+            ),
+        )
+        for config in configs
+    ]
+    results = map_in_workers(jobs, max_workers)
 
-    for config in configs:
+    for config, metrics in zip(configs, results):
         print(f"Testing: {config['name']}...")
-
-        if config["type"] == "trapezoidal":
-            metrics = simulate_motion_comparison(
-                trajectory_type="trapezoidal",
-                max_jerk=50.0,  # Not used
-            )
-        else:
-            metrics = simulate_motion_comparison(
-                trajectory_type="scurve",
-                max_jerk=config["jerk"],
-            )
-
-        results.append(metrics)
         print(f"  ✓ RMS error: {metrics['rms_error_deg']:.3f}°")
         print(f"  ✓ Max error: {metrics['max_error_deg']:.3f}°")
         print(f"  ✓ Overshoot: {metrics['overshoot_percent']:.1f}%")
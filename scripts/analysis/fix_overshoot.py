@@ -6,11 +6,46 @@ The system overshoots by 4.3° due to excessive ki_vel=3.5.
 Test configurations with reduced integral gain and increased damping.
 """
 
-from compare_trajectories import simulate_motion_comparison
+import sys
+from pathlib import Path
+from typing import Dict
 
+# Add demo_visualization from scripts/demos
+sys.path.insert(0, str(Path(__file__).parent.parent / "demos"))
 
-def fix_overshoot():
-    """Test configurations to fix overshoot/settling error."""
+from compare_trajectories import simulate_motion_comparison
+from demo_visualization import map_in_workers
+
+# Metrics of gain sets already simulated in this process, keyed by
+# (ki_vel, kd_vel, kff_accel) and stored as sorted item tuples so a caller
+# mutating its dict cannot corrupt the cache
+_metrics_cache: Dict[tuple, tuple] = {}
+
+
+def _sim_kwargs(ki_vel: float, kd_vel: float, kff_accel: float) -> dict:
+    """simulate_motion_comparison arguments for one sweep configuration."""
+    return {
+        "trajectory_type": "scurve",
+        "kp_pos": 6.0,
+        "ki_pos": 0.0,
+        "kp_vel": 3.5,
+        "ki_vel": ki_vel,
+        "kd_vel": kd_vel,
+        "kff_vel": 1.0,
+        "kff_accel": kff_accel,
+        "max_jerk": 100.0,
+    }
+
+
+def fix_overshoot(max_workers: int = 1):
+    """Test configurations to fix overshoot/settling error.
+
+    Args:
+        max_workers: Worker processes for the configuration sweep. The
+            default runs it in-process: the JIT-compiled simulations take
+            milliseconds, far below the cost of spawning a worker. Gain
+            sets already simulated by an earlier call are reused.
+    """
     print("=" * 80)
     print("FIX OVERSHOOT PROBLEM")
     print("=" * 80)
@@ -76,23 +111,23 @@ def fix_overshoot():
         },
     ]
 
+    # Only the three swept gains differ; simulate each new gain set once
+    keys = [(c["ki_vel"], c["kd_vel"], c["kff_accel"]) for c in configs]
+    missing = [key for key in dict.fromkeys(keys) if key not in _metrics_cache]
+    jobs = [(simulate_motion_comparison, _sim_kwargs(*key)) for key in missing]
+
+    # Configs are independent: run them across worker processes
+    new_metrics = map_in_workers(jobs, max_workers)
+
+    for key, metrics in zip(missing, new_metrics):
+        _metrics_cache[key] = tuple(sorted(metrics.items()))
+    metrics_list = [dict(_metrics_cache[key]) for key in keys]
+
     results = []
 
-    for config in configs:
+    for config, metrics in zip(configs, metrics_list):
         print(f"Testing: {config['name']}...")
 
-        metrics = simulate_motion_comparison(
-            trajectory_type="scurve",
-            kp_pos=6.0,
-            ki_pos=0.0,
-            kp_vel=3.5,
-            ki_vel=config["ki_vel"],
-            kd_vel=config["kd_vel"],
-            kff_vel=1.0,
-            kff_accel=config["kff_accel"],
-            max_jerk=100.0,
-        )
-
         config["metrics"] = metrics
         results.append(config)
 
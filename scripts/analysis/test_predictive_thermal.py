@@ -14,6 +14,7 @@ from demo_visualization import (
     PredictiveThermalManager,
     apply_current_limit,
     simulate_temperature,
+    simulate_temperature_batch,
 )
 
 
@@ -40,11 +41,11 @@ def test_prediction_accuracy():
         predicted = manager.predict_temperature(start_temp, current, duration)
 
         # Simulate actual
-        temp = start_temp
         dt = 0.01  # 10ms steps
         steps = int(duration / dt)
-        for _ in range(steps):
-            temp = simulate_temperature(current, temp, dt, hw_config)
+        temp = simulate_temperature_batch(
+            np.full(steps, current), start_temp, dt, hw_config
+        )[-1]
 
         error = abs(predicted - temp)
         error_pct = error / max(1, predicted - start_temp) * 100
@@ -7,7 +7,11 @@ from pathlib import Path
 
 # Add demo_visualization module from scripts/demos
 sys.path.insert(0, str(Path(__file__).parent / "scripts" / "demos"))
-from demo_visualization import HardwareConfig, apply_current_limit, simulate_temperature
+from demo_visualization import (
+    HardwareConfig,
+    apply_current_limit,
+    simulate_temperature_batch,
+)
 
 
 def main():
@@ -69,8 +73,10 @@ def main():
     for t in [0, 1, 2, 5, 10]:
         # Simulate temperature rise
         steps = int(t / dt)
-        for _ in range(steps):
-            temp = simulate_temperature(current, temp, dt, hw_config)
+        if steps > 0:
+            temp = simulate_temperature_batch(
+                np.full(steps, current), temp, dt, hw_config
+            )[-1]
 
         # Apply current limit
         i_lim, _ = apply_current_limit(current, temp, hw_config)
@@ -6,9 +6,17 @@ Generates example FOC telemetry data and visualization reports
 to demonstrate the test visualization capabilities.
 """
 
+import contextlib
+import io
+import math
+import multiprocessing as mp
+import os
 import sys
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from numba import njit, vectorize
+from typing import NamedTuple, Optional
 
 # Add renode/tests to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "renode" / "tests"))
@@ -18,38 +26,45 @@ from test_report_generator import FocTestReportGenerator, generate_test_suite_su
 
 # Add physics model
 sys.path.insert(0, str(Path(__file__).parent.parent / "physics"))
-from motor_model import MotorDynamics, MotorParameters
+from motor_model import MotorParameters
 
 
 # Hardware configuration (matches firmware)
-class HardwareConfig:
-    """Hardware limits and thermal protection settings."""
+class HardwareConfig(NamedTuple):
+    """Hardware limits and thermal protection settings.
+
+    Immutable (NamedTuple) so it can be passed straight into nopython code.
+    """
 
     # Current limits
-    MAX_CONTINUOUS_CURRENT = 5.0  # A - Safe continuous operation
-    MAX_PEAK_CURRENT = 10.0  # A - Short-term peak (< 1s)
-    THERMAL_SHUTDOWN_CURRENT = 12.0  # A - Emergency shutdown
+    MAX_CONTINUOUS_CURRENT: float = 5.0  # A - Safe continuous operation
+    MAX_PEAK_CURRENT: float = 10.0  # A - Short-term peak (< 1s)
+    THERMAL_SHUTDOWN_CURRENT: float = 12.0  # A - Emergency shutdown
 
     # Temperature limits
-    TEMP_NOMINAL = 25.0  # °C - Ambient temperature
-    TEMP_WARNING = 60.0  # °C - Start derating
-    TEMP_CRITICAL = 80.0  # °C - Heavy derating
-    TEMP_SHUTDOWN = 90.0  # °C - Emergency shutdown
+    TEMP_NOMINAL: float = 25.0  # °C - Ambient temperature
+    TEMP_WARNING: float = 60.0  # °C - Start derating
+    TEMP_CRITICAL: float = 80.0  # °C - Heavy derating
+    TEMP_SHUTDOWN: float = 90.0  # °C - Emergency shutdown
 
     # Thermal derating (reduces current limit based on temperature)
-    DERATING_START_TEMP = 60.0  # °C - Start reducing current
-    DERATING_FULL_TEMP = 80.0  # °C - Maximum derating
-    DERATING_MIN_FACTOR = 0.5  # Minimum 50% current at hot temps
+    DERATING_START_TEMP: float = 60.0  # °C - Start reducing current
+    DERATING_FULL_TEMP: float = 80.0  # °C - Maximum derating
+    DERATING_MIN_FACTOR: float = 0.5  # Minimum 50% current at hot temps
 
     # Motor parameters (from telemetry.rs)
-    KT = 0.15  # Nm/A - Torque constant
-    R_PHASE = 1.0  # Ω - Phase resistance
-    THERMAL_MASS = 100.0  # J/K - Motor thermal mass
-    COOLING_RATE = 0.5  # W/K - Heat dissipation rate
+    KT: float = 0.15  # Nm/A - Torque constant
+    R_PHASE: float = 1.0  # Ω - Phase resistance
+    THERMAL_MASS: float = 100.0  # J/K - Motor thermal mass
+    COOLING_RATE: float = 0.5  # W/K - Heat dissipation rate
+
+
+# Shared default instance (avoids one HardwareConfig per default argument)
+DEFAULT_HW_CONFIG = HardwareConfig()
 
 
 def apply_current_limit(
-    i_q: float, temperature: float, config: HardwareConfig = HardwareConfig()
+    i_q: float, temperature: float, config: HardwareConfig = DEFAULT_HW_CONFIG
 ) -> tuple[float, bool]:
     """Apply current limit with temperature derating.
 
@@ -84,20 +99,27 @@ def apply_current_limit(
     continuous_limit = config.MAX_CONTINUOUS_CURRENT * derating_factor
 
     # Clamp current
-    i_q_limited = np.clip(i_q, -effective_limit, effective_limit)
+    i_q_limited = min(effective_limit, max(-effective_limit, i_q))
     is_saturated = abs(i_q) > effective_limit
 
     return i_q_limited, is_saturated
 
 
 def simulate_temperature(
-    i_q: float, temperature: float, dt: float, config: HardwareConfig = HardwareConfig()
+    i_q: float,
+    temperature: float,
+    dt: float,
+    config: HardwareConfig = DEFAULT_HW_CONFIG,
 ) -> float:
     """Simulate motor temperature based on current and cooling.
 
     Simple thermal model: dT/dt = (P_loss - P_cooling) / C_thermal
     where P_loss = I²R and P_cooling = k * (T - T_ambient)
 
+    The ODE is linear, so each step uses its exact solution for constant
+    current instead of an Euler step (stable for any dt):
+        T(t+dt) = T_ss + (T - T_ss) * exp(-k*dt/C),  T_ss = T_ambient + I²R/k
+
     Args:
         i_q: Q-axis current (A)
         temperature: Current temperature (°C)
@@ -107,24 +129,112 @@ def simulate_temperature(
     Returns:
         New temperature (°C)
     """
-    # Power loss (I²R heating)
-    power_loss = i_q**2 * config.R_PHASE
+    # Steady-state temperature for this current (I²R heating vs cooling)
+    temp_ss = config.TEMP_NOMINAL + i_q * i_q * config.R_PHASE / config.COOLING_RATE
+
+    # Exponential approach to steady state over one step
+    alpha = math.exp(-config.COOLING_RATE * dt / config.THERMAL_MASS)
+    new_temp = temp_ss + (temperature - temp_ss) * alpha
 
-    # Cooling power (proportional to temperature difference)
-    temp_diff = temperature - config.TEMP_NOMINAL
-    power_cooling = config.COOLING_RATE * temp_diff
+    # Clamp to realistic range
+    return min(config.TEMP_SHUTDOWN + 10.0, max(config.TEMP_NOMINAL, new_temp))
 
-    # Net power
-    power_net = power_loss - power_cooling
 
-    # Temperature change: dT = P * dt / C
-    dT = power_net * dt / config.THERMAL_MASS
+@vectorize(cache=True, fastmath=True)
+def _derated_limit(
+    temperature, peak_current, start_temp, full_temp, min_factor, shutdown_temp
+):
+    """Temperature-derated current limit (same curve as apply_current_limit)."""
+    if temperature >= shutdown_temp:
+        return 0.0
+    if temperature >= start_temp:
+        factor = 1.0 - (1.0 - min_factor) * (
+            (temperature - start_temp) / (full_temp - start_temp)
+        )
+        return peak_current * max(min_factor, factor)
+    return peak_current
 
-    # Update temperature
-    new_temp = temperature + dT
 
-    # Clamp to realistic range
-    return np.clip(new_temp, config.TEMP_NOMINAL, config.TEMP_SHUTDOWN + 10.0)
+def apply_current_limit_batch(
+    i_q: np.ndarray,
+    temperature: np.ndarray,
+    config: HardwareConfig = DEFAULT_HW_CONFIG,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized apply_current_limit over whole current/temperature traces.
+
+    Args:
+        i_q: Requested Q-axis current array (A)
+        temperature: Motor temperature array (°C)
+        config: Hardware configuration
+
+    Returns:
+        Tuple of (limited_current, is_saturated) arrays
+    """
+    i_q = np.asarray(i_q, dtype=np.float64)
+    temperature = np.asarray(temperature, dtype=np.float64)
+
+    effective_limit = _derated_limit(
+        temperature,
+        config.MAX_PEAK_CURRENT,
+        config.DERATING_START_TEMP,
+        config.DERATING_FULL_TEMP,
+        config.DERATING_MIN_FACTOR,
+        config.TEMP_SHUTDOWN,
+    )
+
+    i_q_limited = np.clip(i_q, -effective_limit, effective_limit)
+    # Emergency shutdown counts as saturated even for zero current
+    is_saturated = (np.abs(i_q) > effective_limit) | (
+        temperature >= config.TEMP_SHUTDOWN
+    )
+
+    return i_q_limited, is_saturated
+
+
+def simulate_temperature_batch(
+    i_q: np.ndarray,
+    temperature: float,
+    dt: float,
+    config: HardwareConfig = DEFAULT_HW_CONFIG,
+) -> np.ndarray:
+    """Integrate the thermal model over a whole current trace.
+
+    Equivalent to calling simulate_temperature once per sample. The update
+    is linear in T, so the recurrence runs as a single IIR filter pass.
+    The first step goes through simulate_temperature so a start below
+    TEMP_NOMINAL is clamped exactly as in the scalar model; the rest of the
+    output is clamped afterwards, so results match the per-sample version
+    as long as the trace stays below TEMP_SHUTDOWN + 10 °C.
+
+    Args:
+        i_q: Q-axis current array (A)
+        temperature: Initial temperature (°C)
+        dt: Time step (s)
+        config: Hardware configuration
+
+    Returns:
+        Temperature after each step (°C)
+    """
+    # Imported lazily: scipy.signal adds ~1 s to every module import
+    from scipy import signal
+
+    i_q = np.asarray(i_q, dtype=np.float64)
+    if i_q.size == 0:
+        return np.empty(0)
+
+    # First step applies the scalar clamp (e.g. a cold start below nominal)
+    first = simulate_temperature(i_q[0], temperature, dt, config)
+
+    # T[k+1] = α·T[k] + (1 - α)·T_ss[k],  α = exp(-k·dt/C)
+    alpha = math.exp(-config.COOLING_RATE * dt / config.THERMAL_MASS)
+    temp_ss = config.TEMP_NOMINAL + i_q[1:] ** 2 * config.R_PHASE / config.COOLING_RATE
+    b = [1.0 - alpha]
+    a = [1.0, -alpha]
+    zi = signal.lfiltic(b, a, [first])
+    temps, _ = signal.lfilter(b, a, temp_ss, zi=zi)
+
+    temps = np.clip(temps, config.TEMP_NOMINAL, config.TEMP_SHUTDOWN + 10.0)
+    return np.concatenate(([first], temps))
 
 
 # ============================================================================
@@ -159,22 +269,22 @@ class FrictionModel:
         Returns:
             Friction torque (Nm)
         """
+        if isinstance(velocity, np.ndarray):
+            return self.calculate_batch(velocity, temperature)
+
         # Temperature factor (friction increases with temperature)
         temp_factor = 1.0 + self.temp_coeff * (temperature - 25.0)
 
         # Stribeck effect: friction peak at low speeds
         # τ_stribeck = τ_s * exp(-(v/v_s)²)
-        stribeck = self.tau_stribeck * np.exp(-((velocity / self.v_stribeck) ** 2))
+        stribeck = self.tau_stribeck * math.exp(-((velocity / self.v_stribeck) ** 2))
 
         # Viscous friction (linear with velocity)
         tau_viscous = self.b_viscous * velocity * temp_factor
 
-        # Coulomb friction (constant, direction-dependent)
-        if abs(velocity) < 0.001:
-            # At very low speeds, friction is not well-defined (stiction)
-            sign = 0.0
-        else:
-            sign = np.sign(velocity)
+        # Coulomb friction (constant, direction-dependent). Below 0.001 rad/s
+        # friction is not well-defined (stiction), so the sign is 0 there.
+        sign = float(velocity >= 0.001) - float(velocity <= -0.001)
 
         tau_coulomb = sign * self.tau_coulomb * temp_factor
 
@@ -183,6 +293,45 @@ class FrictionModel:
 
         return tau_friction
 
+    def calculate_batch(
+        self, velocities: np.ndarray, temperature: float | np.ndarray = 25.0
+    ) -> np.ndarray:
+        """Calculate friction torque for a whole velocity trace.
+
+        Same model as calculate, evaluated with whole-array ufuncs that
+        reuse a single output buffer.
+
+        Args:
+            velocities: Angular velocity array (rad/s)
+            temperature: Motor temperature (°C), scalar or an array that
+                broadcasts with velocities
+
+        Returns:
+            Friction torque array (Nm), in the broadcast shape of both inputs
+        """
+        # Output buffer needs the full shape (e.g. scalar v, temperature sweep)
+        v, temperature = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(velocities, dtype=np.float64)),
+            np.asarray(temperature, dtype=np.float64),
+        )
+        temp_factor = 1.0 + self.temp_coeff * (temperature - 25.0)
+
+        # Stribeck term τ_s·exp(-(v/v_s)²), built in place
+        out = np.divide(v, self.v_stribeck)
+        np.square(out, out=out)
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        out *= self.tau_stribeck
+
+        # Coulomb + Stribeck share the direction sign (0 in the stiction band)
+        out += self.tau_coulomb * temp_factor
+        out *= np.sign(v) * (np.abs(v) >= 0.001)
+
+        # Viscous friction (linear with velocity)
+        out += self.b_viscous * temp_factor * v
+
+        return out
+
 
 class PredictiveThermalManager:
     """Predictive thermal management with look-ahead current limiting.
@@ -197,7 +346,7 @@ class PredictiveThermalManager:
     - Smooth derating (no sudden shutdowns)
     """
 
-    def __init__(self, config: HardwareConfig = HardwareConfig()):
+    def __init__(self, config: HardwareConfig = DEFAULT_HW_CONFIG):
         self.config = config
 
         # Thermal time constant (seconds)
@@ -236,7 +385,7 @@ class PredictiveThermalManager:
 
         # Exponential approach to steady state
         # T(t) = T_ss - (T_ss - T_0) * exp(-t/τ)
-        temp_predicted = temp_ss - (temp_ss - current_temp) * np.exp(
+        temp_predicted = temp_ss - (temp_ss - current_temp) * math.exp(
             -duration / self.tau_thermal
         )
 
@@ -273,7 +422,7 @@ class PredictiveThermalManager:
 
         # Time factor: how much of steady state we'll reach
         # exp(-t/τ): 0 = instant, 1 = full steady state
-        time_factor = 1.0 - np.exp(-duration / self.tau_thermal)
+        time_factor = 1.0 - math.exp(-duration / self.tau_thermal)
 
         # Safe current calculation:
         # Solve: temp_margin = (P_safe/k) * (1 - exp(-t/τ))
@@ -284,13 +433,13 @@ class PredictiveThermalManager:
             i_safe_squared = (temp_margin * self.config.COOLING_RATE) / (
                 self.config.R_PHASE * time_factor
             )
-            i_safe = np.sqrt(max(0, i_safe_squared))
+            i_safe = math.sqrt(max(0, i_safe_squared))
         else:
             # Very short duration: thermal capacity limits
             # Use thermal mass for very fast transients
             max_energy = self.config.THERMAL_MASS * temp_margin
             max_power = max_energy / duration if duration > 0 else 0
-            i_safe = np.sqrt(max_power / self.config.R_PHASE) if max_power > 0 else 0
+            i_safe = math.sqrt(max_power / self.config.R_PHASE) if max_power > 0 else 0
 
         # Clamp to hardware limits
         i_safe = min(i_safe, self.config.MAX_PEAK_CURRENT)
@@ -326,7 +475,7 @@ class PredictiveThermalManager:
         # Time at current steady-state before warning
         # (assuming we're at steady state for current temp)
         temp_margin = self.config.TEMP_WARNING - current_temp
-        time_at_current = -self.tau_thermal * np.log(
+        time_at_current = -self.tau_thermal * math.log(
             max(
                 0.01,
                 temp_margin / (self.config.TEMP_WARNING - self.config.TEMP_NOMINAL),
@@ -374,7 +523,7 @@ class PredictiveThermalManager:
             return i_q_requested, False, "OK"
 
         # Apply limit
-        i_q_limited = np.clip(i_q_requested, -i_safe, i_safe)
+        i_q_limited = min(i_safe, max(-i_safe, i_q_requested))
 
         # Determine reason
         if current_temp >= self.config.TEMP_CRITICAL:
@@ -408,6 +557,7 @@ class DisturbanceObserver:
         alpha: float = 0.05,  # Filter coefficient (0-1)
         friction_model: FrictionModel | None = None,
         compensate_friction: bool = True,
+        max_history: int = 1_000_000,  # Initial diagnostics capacity
     ):
         self.J = J
         self.b = b
@@ -421,10 +571,10 @@ class DisturbanceObserver:
         self.prev_velocity = 0.0
         self.initialized = False
 
-        # Diagnostics
-        self.tau_motor_history = []
-        self.tau_motion_history = []
-        self.tau_friction_history = []
+        # Diagnostics: rows are (tau_motor, tau_motion, tau_friction),
+        # grown by doubling when full
+        self._history = np.empty((3, max_history))
+        self._hist_idx = 0
 
     def update(
         self, velocity: float, i_q: float, dt: float, temperature: float = 25.0
@@ -477,42 +627,164 @@ class DisturbanceObserver:
         )
 
         # Store for diagnostics
-        self.tau_motor_history.append(tau_motor)
-        self.tau_motion_history.append(tau_motion)
-        self.tau_friction_history.append(tau_friction)
+        k = self._hist_idx
+        if k == self._history.shape[1]:
+            self._reserve_history(k + 1)
+        history = self._history
+        history[0, k] = tau_motor
+        history[1, k] = tau_motion
+        history[2, k] = tau_friction
+        self._hist_idx = k + 1
 
         return self.load_estimate
 
+    def replay(
+        self,
+        velocity: np.ndarray,
+        i_q: np.ndarray,
+        dt: float,
+        temperature: float | np.ndarray = 25.0,
+    ) -> np.ndarray:
+        """Run the observer over a logged trace in one vectorized pass.
+
+        Equivalent to calling update() once per sample (continuing from the
+        current observer state), with the low-pass filter evaluated as a
+        single IIR filter call.
+
+        Args:
+            velocity: Angular velocity array (rad/s)
+            i_q: Q-axis current array (A)
+            dt: Time step (s)
+            temperature: Motor temperature (°C), scalar or per-sample array
+
+        Returns:
+            Estimated external load torque after each sample (Nm)
+        """
+        from scipy import signal
+
+        velocity = np.asarray(velocity, dtype=np.float64)
+        i_q = np.asarray(i_q, dtype=np.float64)
+        n = len(velocity)
+        if n == 0:
+            return np.empty(0)
+
+        # Acceleration (numerical derivative, zero on the very first sample)
+        accel = np.zeros(n)
+        if dt > 0:
+            if self.initialized:
+                accel[0] = (velocity[0] - self.prev_velocity) / dt
+            accel[1:] = np.diff(velocity) / dt
+        self.prev_velocity = velocity[-1]
+        self.initialized = True
+
+        tau_motor = self.kt * i_q
+        tau_motion = self.J * accel + self.b * velocity
+        tau_friction = self.friction_model.calculate_batch(velocity, temperature)
+
+        if self.compensate_friction:
+            tau_disturbance = tau_motor - tau_motion - tau_friction
+        else:
+            tau_disturbance = tau_motor - tau_motion
+
+        # load_estimate[k] = α·τ_dist[k] + (1-α)·load_estimate[k-1]
+        decay = 1 - self.alpha
+        estimates, _ = signal.lfilter(
+            [self.alpha],
+            [1.0, -decay],
+            tau_disturbance,
+            zi=[decay * self.load_estimate],
+        )
+        self.load_estimate = float(estimates[-1])
+
+        # Store for diagnostics
+        k = self._hist_idx
+        self._reserve_history(k + n)
+        self._history[0, k : k + n] = tau_motor
+        self._history[1, k : k + n] = tau_motion
+        self._history[2, k : k + n] = tau_friction
+        self._hist_idx = k + n
+
+        return estimates
+
+    def _reserve_history(self, n: int):
+        """Grow the diagnostics buffer (at least doubling) to hold n samples."""
+        capacity = self._history.shape[1]
+        if n > capacity:
+            grown = np.empty((3, max(n, 2 * capacity)))
+            grown[:, : self._hist_idx] = self._history[:, : self._hist_idx]
+            self._history = grown
+
     def reset(self):
         """Reset observer state."""
         self.load_estimate = 0.0
         self.prev_velocity = 0.0
         self.initialized = False
-        self.tau_motor_history.clear()
-        self.tau_motion_history.clear()
-        self.tau_friction_history.clear()
+        self._hist_idx = 0  # Keep the buffer, just rewind
 
     def get_diagnostics(self) -> dict:
-        """Get diagnostic information for analysis."""
+        """Get diagnostic information for analysis.
+
+        The arrays are views into the history buffer (no copy); they are
+        overwritten by updates after the next reset.
+        """
+        n = self._hist_idx
         return {
-            "tau_motor": (
-                np.array(self.tau_motor_history)
-                if self.tau_motor_history
-                else np.array([])
-            ),
-            "tau_motion": (
-                np.array(self.tau_motion_history)
-                if self.tau_motion_history
-                else np.array([])
-            ),
-            "tau_friction": (
-                np.array(self.tau_friction_history)
-                if self.tau_friction_history
-                else np.array([])
-            ),
+            "tau_motor": self._history[0, :n],
+            "tau_motion": self._history[1, :n],
+            "tau_friction": self._history[2, :n],
         }
 
 
+@njit(cache=True)
+def _metrics_scan(position, target_position, velocity, tolerance, settle_samples):
+    """Single pass over a step response for calculate_control_metrics.
+
+    Returns:
+        Tuple of (first crossing index or -1, max position, sum of squared
+        error, max |error|, max |velocity|, settling index or -1). The
+        settling index is the start of the first run of settle_samples
+        samples after the crossing that stays within tolerance of the target
+        and ends before the last sample.
+    """
+    n = len(position)
+    n_vel = len(velocity)
+    first_cross = -1
+    settle_idx = -1
+    run = 0
+    max_pos = -np.inf
+    sum_sq = 0.0
+    max_err = 0.0
+    max_vel = 0.0
+
+    for i in range(n):
+        p = position[i]
+        err = p - target_position
+        abs_err = abs(err)
+        sum_sq += err * err
+        if abs_err > max_err:
+            max_err = abs_err
+        if p > max_pos:
+            max_pos = p
+
+        if first_cross < 0 and p >= target_position:
+            first_cross = i
+        if first_cross >= 0 and settle_idx < 0 and i < n - 1:
+            # Length of the current in-tolerance run
+            run = run + 1 if abs_err < tolerance else 0
+            if run == settle_samples:
+                settle_idx = i - settle_samples + 1
+
+        # Velocity is sampled alongside position: fold it into the same pass
+        if i < n_vel and abs(velocity[i]) > max_vel:
+            max_vel = abs(velocity[i])
+
+    for i in range(n, n_vel):
+        if abs(velocity[i]) > max_vel:
+            max_vel = abs(velocity[i])
+
+    return first_cross, max_pos, sum_sq, max_err, max_vel, settle_idx
+
+
 def calculate_control_metrics(
     position: np.ndarray,
     target_position: float,
@@ -532,55 +804,47 @@ def calculate_control_metrics(
     Returns:
         Dictionary with control metrics
     """
-    # Find when position first crosses target
-    cross_idx = np.where(position >= target_position)[0]
+    # Settling band is 2% of target; settled means staying there 100 samples
+    tolerance = 0.02 * target_position
+    first_cross, max_pos, sum_sq, max_error, max_velocity, settle_idx = _metrics_scan(
+        np.asarray(position, dtype=np.float64),
+        target_position,
+        np.asarray(velocity, dtype=np.float64),
+        tolerance,
+        100,
+    )
+
+    # Tracking error
+    rms_error_rad = math.sqrt(sum_sq / len(position))
 
-    if len(cross_idx) == 0:
+    if first_cross < 0:
         # Never reached target
         return {
             "overshoot_percent": 0.0,
             "overshoot_rad": 0.0,
-            "max_position": np.max(position),
+            "max_position": max_pos,
             "final_position": position[-1],
             "settling_time": None,
-            "rms_error_deg": np.rad2deg(
-                np.sqrt(np.mean((position - target_position) ** 2))
-            ),
-            "max_error_deg": np.rad2deg(np.max(np.abs(position - target_position))),
-            "max_velocity": np.max(np.abs(velocity)),
+            "rms_error_deg": np.rad2deg(rms_error_rad),
+            "max_error_deg": np.rad2deg(max_error),
+            "max_velocity": max_velocity,
             "velocity_violation_percent": max(
-                0.0, (np.max(np.abs(velocity)) - max_vel) / max_vel * 100
+                0.0, (max_velocity - max_vel) / max_vel * 100
             ),
             "reached_target": False,
         }
 
-    first_cross = cross_idx[0]
-
-    # Overshoot
-    max_pos = np.max(position[first_cross:])
+    # Overshoot (positions before the first crossing are all below target,
+    # so the overall maximum is the maximum after crossing)
     overshoot_rad = max_pos - target_position
     overshoot_percent = (
         (overshoot_rad / target_position * 100) if target_position > 0 else 0.0
     )
 
     # Settling time (within 2% of target)
-    tolerance = 0.02 * target_position
-    settled = np.abs(position[first_cross:] - target_position) < tolerance
-
-    # Find first index where it settles and stays settled (at least 100 samples)
-    settling_time = None
-    for idx in range(len(settled) - 100):
-        if np.all(settled[idx : idx + 100]):
-            settling_time = (first_cross + idx) * dt
-            break
-
-    # Tracking error
-    error = position - target_position
-    rms_error_rad = np.sqrt(np.mean(error**2))
-    max_error = np.max(np.abs(error))
+    settling_time = settle_idx * dt if settle_idx >= 0 else None
 
     # Velocity violations
-    max_velocity = np.max(np.abs(velocity))
     velocity_violation = max(0.0, max_velocity - max_vel)
     velocity_violation_percent = (
         (velocity_violation / max_vel * 100) if max_vel > 0 else 0.0
@@ -621,7 +885,7 @@ class PIDController:
 
         self.integral = 0.0
         self.prev_error = 0.0
-        self.initialized = False
+        self._d_scale = 0.0  # 0 until prev_error holds a real sample
 
     def update(self, error: float, dt: float, feedforward: float = 0.0) -> float:
         """Update PID controller with error and return control output.
@@ -638,25 +902,26 @@ class PIDController:
         p_term = self.kp * error
 
         # Integral term with anti-windup
-        self.integral += error * dt
-        self.integral = np.clip(self.integral, -self.max_integral, self.max_integral)
-        i_term = self.ki * self.integral
-
-        # Derivative term (with initialization protection)
-        if not self.initialized:
-            d_term = 0.0
-            self.prev_error = error
-            self.initialized = True
+        max_integral = self.max_integral
+        integral = min(max_integral, max(-max_integral, self.integral + error * dt))
+        self.integral = integral
+        i_term = self.ki * integral
+
+        # Derivative term (zero on the first update after construction/reset)
+        if dt > 0:
+            d_term = self._d_scale * self.kd * (error - self.prev_error) / dt
         else:
-            d_term = self.kd * (error - self.prev_error) / dt if dt > 0 else 0.0
-            self.prev_error = error
+            d_term = 0.0
+        self.prev_error = error
+        self._d_scale = 1.0
 
         # Compute output
         output = p_term + i_term + d_term + feedforward + self.output_offset
 
         # Apply saturation
-        if self.max_output is not None:
-            output = np.clip(output, -self.max_output, self.max_output)
+        max_output = self.max_output
+        if max_output is not None:
+            output = min(max_output, max(-max_output, output))
 
         return output
 
@@ -664,30 +929,53 @@ class PIDController:
         """Reset controller state."""
         self.integral = 0.0
         self.prev_error = 0.0
-        self.initialized = False
-
-
-def generate_scurve_trajectory(
-    t: float,
+        self._d_scale = 0.0
+
+
+class ScurvePlan(NamedTuple):
+    """Time-independent part of an S-curve profile (see plan_scurve)."""
+
+    # Phase boundaries (s)
+    t1: float
+    t2: float
+    t3: float
+    t4: float
+    t5: float
+    t6: float
+    t7: float
+
+    # Phase durations and limits
+    t_jerk: float
+    t_accel_const: float
+    effective_accel: float
+    max_jerk: float
+    v_max: float
+
+    # Phase distances (rad)
+    x_jerk1: float
+    x_accel_const: float
+    x_jerk2: float
+    x_accel: float
+    x_coast: float
+    target_pos: float
+
+
+def plan_scurve(
     target_pos: float,
     max_vel: float,
     max_accel: float,
     max_jerk: float,
-) -> tuple[float, float, float, float]:
-    """Generate S-curve (jerk-limited) trajectory at time t.
-
-    S-curve trajectory eliminates acceleration discontinuities by limiting jerk,
-    resulting in smoother motion that's easier for the controller to track.
+) -> ScurvePlan:
+    """Compute the phase boundaries and distances of an S-curve move.
 
     Args:
-        t: Current time (s)
         target_pos: Target position (rad)
         max_vel: Maximum velocity (rad/s)
         max_accel: Maximum acceleration (rad/s²)
         max_jerk: Maximum jerk (rad/s³)
 
     Returns:
-        Tuple of (position, velocity, acceleration, jerk)
+        ScurvePlan for evaluate_scurve
     """
     # Phase durations
     t_jerk = max_accel / max_jerk  # Time to reach max acceleration
@@ -727,7 +1015,7 @@ def generate_scurve_trajectory(
         effective_accel = effective_accel * scale
         v_max = v_max * scale
         x_accel = target_pos / 2
-        x_coast = 0
+        x_coast = 0.0
 
     # Phase boundaries
     t1 = t_jerk  # End of jerk-up
@@ -738,6 +1026,62 @@ def generate_scurve_trajectory(
     t6 = t5 + t_accel_const  # End of constant decel
     t7 = t6 + t_jerk  # End of decel jerk-up (stopped)
 
+    return ScurvePlan(
+        t1,
+        t2,
+        t3,
+        t4,
+        t5,
+        t6,
+        t7,
+        t_jerk,
+        t_accel_const,
+        effective_accel,
+        max_jerk,
+        v_max,
+        x_jerk1,
+        x_accel_const,
+        x_jerk2,
+        x_accel,
+        x_coast,
+        target_pos,
+    )
+
+
+def evaluate_scurve(plan: ScurvePlan, t: float) -> tuple[float, float, float, float]:
+    """Evaluate a planned S-curve at time t.
+
+    Only unpacks the plan by position, so it also accepts tuple(plan) and
+    compiles unchanged under numba.njit.
+
+    Args:
+        plan: Result of plan_scurve (or the equivalent plain tuple)
+        t: Current time (s)
+
+    Returns:
+        Tuple of (position, velocity, acceleration, jerk)
+    """
+    (
+        t1,
+        t2,
+        t3,
+        t4,
+        t5,
+        t6,
+        t7,
+        t_jerk,
+        t_accel_const,
+        effective_accel,
+        max_jerk,
+        v_max,
+        x_jerk1,
+        x_accel_const,
+        x_jerk2,
+        x_accel,
+        x_coast,
+        target_pos,
+    ) = plan
+
     # Calculate trajectory at time t
     if t < t1:
         # Phase 1: Jerk up (increasing acceleration)
@@ -824,6 +1168,147 @@ def generate_scurve_trajectory(
     return pos, vel, accel, jerk
 
 
+@njit(cache=True)
+def generate_scurve_trajectory(
+    t: float,
+    target_pos: float,
+    max_vel: float,
+    max_accel: float,
+    max_jerk: float,
+) -> tuple[float, float, float, float]:
+    """Generate S-curve (jerk-limited) trajectory at time t.
+
+    S-curve trajectory eliminates acceleration discontinuities by limiting jerk,
+    resulting in smoother motion that's easier for the controller to track.
+    Compiled (plan and evaluation) so per-sample reference callbacks stay
+    cheap; for a whole time grid use scurve_profile instead.
+
+    Args:
+        t: Current time (s)
+        target_pos: Target position (rad)
+        max_vel: Maximum velocity (rad/s)
+        max_accel: Maximum acceleration (rad/s²)
+        max_jerk: Maximum jerk (rad/s³)
+
+    Returns:
+        Tuple of (position, velocity, acceleration, jerk)
+    """
+    return _evaluate_scurve(_plan_scurve(target_pos, max_vel, max_accel, max_jerk), t)
+
+
+def trapezoidal_phases(
+    target: float, max_vel: float, max_accel: float
+) -> tuple[float, float, float, float]:
+    """Phase durations of a rest-to-rest trapezoidal move.
+
+    Moves too short to reach max_vel become triangular, with the peak
+    velocity lowered accordingly.
+
+    Args:
+        target: Move distance (rad)
+        max_vel: Cruise velocity limit (rad/s)
+        max_accel: Acceleration magnitude (rad/s²)
+
+    Returns:
+        Tuple of (t_accel, t_coast, t_decel, peak velocity)
+    """
+    t_accel = max_vel / max_accel
+    t_coast = 0.0
+
+    x_accel = 0.5 * max_accel * t_accel**2
+    if 2 * x_accel < target:
+        # Has coast phase
+        t_coast = (target - 2 * x_accel) / max_vel
+    else:
+        # Pure triangular
+        t_accel = math.sqrt(target / max_accel)
+        max_vel = max_accel * t_accel
+
+    return t_accel, t_coast, t_accel, max_vel
+
+
+def trapezoidal_profile(
+    t_arr: np.ndarray,
+    target: float,
+    max_vel: float,
+    max_accel: float,
+    t_accel: float,
+    t_coast: float,
+    t_decel: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate the trapezoidal motion profile over a whole time grid.
+
+    Accelerate, coast, decelerate, then hold at target; each phase is
+    filled through one boolean mask.
+
+    Args:
+        t_arr: Sample times (s)
+        target: Target position (rad)
+        max_vel: Cruise velocity (rad/s)
+        max_accel: Acceleration magnitude (rad/s²)
+        t_accel: Acceleration phase duration (s)
+        t_coast: Coast phase duration (s)
+        t_decel: Deceleration phase duration (s)
+
+    Returns:
+        Tuple of (position, velocity, acceleration) arrays
+    """
+    m1 = t_arr < t_accel
+    m2 = ~m1 & (t_arr < t_accel + t_coast)
+    m3 = ~m1 & ~m2 & (t_arr < t_accel + t_coast + t_decel)
+
+    target_pos_arr = np.full_like(t_arr, target)
+    target_vel_arr = np.zeros_like(t_arr)
+    target_accel_arr = np.zeros_like(t_arr)
+
+    t = t_arr[m1]
+    target_vel_arr[m1] = max_accel * t
+    target_pos_arr[m1] = 0.5 * max_accel * t**2
+    target_accel_arr[m1] = max_accel
+
+    target_vel_arr[m2] = max_vel
+    target_pos_arr[m2] = 0.5 * max_accel * t_accel**2 + max_vel * (t_arr[m2] - t_accel)
+
+    t_dec = t_arr[m3] - t_accel - t_coast
+    target_vel_arr[m3] = max_vel - max_accel * t_dec
+    target_pos_arr[m3] = (
+        0.5 * max_accel * t_accel**2
+        + max_vel * t_coast
+        + max_vel * t_dec
+        - 0.5 * max_accel * t_dec**2
+    )
+    target_accel_arr[m3] = -max_accel
+
+    return target_pos_arr, target_vel_arr, target_accel_arr
+
+
+def scurve_profile(
+    t_arr: np.ndarray,
+    target_pos: float,
+    max_vel: float,
+    max_accel: float,
+    max_jerk: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate an S-curve move over a whole time grid.
+
+    Array counterpart of generate_scurve_trajectory: the move is planned
+    once and every sample is evaluated in one compiled loop.
+
+    Args:
+        t_arr: Sample times (s)
+        target_pos: Target position (rad)
+        max_vel: Maximum velocity (rad/s)
+        max_accel: Maximum acceleration (rad/s²)
+        max_jerk: Maximum jerk (rad/s³)
+
+    Returns:
+        Tuple of (position, velocity, acceleration) arrays
+    """
+    # Plain tuple: a NamedTuple type defined in __main__ defeats numba's cache
+    plan = tuple(plan_scurve(target_pos, max_vel, max_accel, max_jerk))
+    return _scurve_profile(np.asarray(t_arr, dtype=np.float64), plan)
+
+
 # ============================================================================
 # Input Shaping for Vibration Suppression
 # ============================================================================
@@ -855,7 +1340,7 @@ class InputShaper:
 
         # Damped natural frequency
         if zeta < 1.0:
-            self.omega_d = omega_n * np.sqrt(1 - zeta**2)
+            self.omega_d = omega_n * math.sqrt(1 - zeta**2)
         else:
             self.omega_d = 0.0  # Overdamped
 
@@ -959,13 +1444,13 @@ class ZVShaper(InputShaper):
         # ZV uses 2 impulses separated by half period
         if self.omega_d == 0:
             # No damping info, use undamped frequency
-            T = 2 * np.pi / self.omega_n
+            T = 2 * math.pi / self.omega_n
         else:
-            T = 2 * np.pi / self.omega_d
+            T = 2 * math.pi / self.omega_d
 
         # Impulse amplitudes for ZV
         K = (
-            np.exp(-self.zeta * np.pi / np.sqrt(1 - self.zeta**2))
+            math.exp(-self.zeta * math.pi / math.sqrt(1 - self.zeta**2))
             if self.zeta < 1.0
             else 0.0
         )
@@ -991,13 +1476,13 @@ class ZVDShaper(InputShaper):
     def compute_impulses(self):
         """Compute ZVD impulse sequence."""
         if self.omega_d == 0:
-            T = 2 * np.pi / self.omega_n
+            T = 2 * math.pi / self.omega_n
         else:
-            T = 2 * np.pi / self.omega_d
+            T = 2 * math.pi / self.omega_d
 
         # Impulse amplitudes for ZVD
         K = (
-            np.exp(-self.zeta * np.pi / np.sqrt(1 - self.zeta**2))
+            math.exp(-self.zeta * math.pi / math.sqrt(1 - self.zeta**2))
             if self.zeta < 1.0
             else 0.0
         )
@@ -1025,14 +1510,14 @@ class EIShaper(InputShaper):
     def compute_impulses(self):
         """Compute EI impulse sequence."""
         if self.omega_d == 0:
-            T = 2 * np.pi / self.omega_n
+            T = 2 * math.pi / self.omega_n
         else:
-            T = 2 * np.pi / self.omega_d
+            T = 2 * math.pi / self.omega_d
 
         # EI parameters (optimized for insensitivity)
         V_tol = 0.05  # 5% vibration tolerance
         K = (
-            np.exp(-self.zeta * np.pi / np.sqrt(1 - self.zeta**2))
+            math.exp(-self.zeta * math.pi / math.sqrt(1 - self.zeta**2))
             if self.zeta < 1.0
             else 0.0
         )
@@ -1049,6 +1534,15 @@ class EIShaper(InputShaper):
         ]
 
 
+@njit(cache=True)
+def _first_ge(values, threshold):
+    """Index of the first element >= threshold, or -1 (stops at the match)."""
+    for i in range(len(values)):
+        if values[i] >= threshold:
+            return i
+    return -1
+
+
 def detect_resonance_frequency(
     time: np.ndarray, position: np.ndarray, target_position: float, dt: float
 ) -> tuple[float, float]:
@@ -1069,14 +1563,12 @@ def detect_resonance_frequency(
     # Find overshoot oscillations
     error = position - target_position
 
-    # Find first crossing
-    cross_idx = np.where(position >= target_position)[0]
-    if len(cross_idx) == 0:
+    # Find first crossing (linear scan: the response is not monotonic)
+    first_cross = _first_ge(np.asarray(position, dtype=np.float64), target_position)
+    if first_cross < 0:
         # No overshoot, well damped
         return 0.0, 1.0
 
-    first_cross = cross_idx[0]
-
     # Analyze oscillation after first crossing
     oscillation = error[first_cross:]
     time_osc = time[first_cross:]
@@ -1100,257 +1592,319 @@ def detect_resonance_frequency(
 
     # Calculate period from peak spacing
     period = (peak_times[-1] - peak_times[0]) / (len(peak_times) - 1)
-    omega_n = 2 * np.pi / period if period > 0 else 10.0
+    omega_n = 2 * math.pi / period if period > 0 else 10.0
 
     # Estimate damping from decay rate
     # Logarithmic decrement: δ = ln(x_n / x_{n+1})
     if len(peaks) >= 2:
-        delta = np.log(peaks[0] / peaks[-1]) / (len(peaks) - 1)
-        zeta = delta / np.sqrt(4 * np.pi**2 + delta**2)
-        zeta = np.clip(zeta, 0.0, 1.0)
+        delta = math.log(peaks[0] / peaks[-1]) / (len(peaks) - 1)
+        zeta = delta / math.sqrt(4 * math.pi**2 + delta**2)
+        zeta = min(1.0, max(0.0, zeta))
     else:
         zeta = 0.1
 
     return omega_n, zeta
 
 
-def simulate_trapezoidal_motion(
-    use_improved_controller: bool = True,
-    kp_pos: float = 8.0,
-    kp_vel: float = 3.0,
-    ki_vel: float = 0.5,
-    kd_vel: float = 0.1,
-    kff_vel: float = 1.0,
-    kff_accel: float = 0.0,
-    trajectory_type: str = "trapezoidal",
-    max_jerk: float = 50.0,
+# ============================================================================
+# Simulation kernels (nopython)
+# ============================================================================
+
+# add_from_peripherals keyword for each column of a recorded trace
+_TRACE_FIELDS = (
+    "encoder_position",
+    "encoder_velocity",
+    "adc_i_q",
+    "adc_i_d",
+    "motor_pwm_a",
+    "motor_pwm_b",
+    "motor_pwm_c",
+    "target_position",
+    "target_velocity",
+    "load_estimate",
+    "temperature",
+    "health_score",
+)
+
+# Samples per recorded trace row (10 kHz loop -> 1 kHz trace)
+_RECORD_EVERY = 10
+
+_SQRT3_2 = 0.8660254037844386  # sin(2π/3)
+
+_evaluate_scurve = njit(cache=True)(evaluate_scurve)
+_plan_scurve = njit(cache=True)(plan_scurve)
+
+
+@njit(cache=True)
+def _limit_current(
+    i_q, temperature, peak_current, start_temp, full_temp, min_factor, shutdown_temp
 ):
-    """Simulate motion profile with FOC control.
+    """Scalar apply_current_limit on constants pre-extracted from HardwareConfig.
 
-    Args:
-        use_improved_controller: If True, use improved PID cascade controller
-        kp_pos: Position proportional gain
-        kp_vel: Velocity proportional gain
-        ki_vel: Velocity integral gain
-        kd_vel: Velocity derivative gain
-        kff_vel: Velocity feedforward gain (0-1, typically 1.0)
-        kff_accel: Acceleration feedforward gain (typically 0.1-0.3)
-        trajectory_type: "trapezoidal" or "scurve"
-        max_jerk: Maximum jerk for S-curve trajectory (rad/s³)
+    Returns:
+        Tuple of (limited_current, is_saturated)
     """
-    controller_type = "improved" if use_improved_controller else "original"
-    print(
-        f"\n📊 Simulating {trajectory_type.upper()} Motion Profile ({controller_type})..."
-    )
+    if temperature >= shutdown_temp:
+        return 0.0, True
+    limit = peak_current
+    if temperature >= start_temp:
+        factor = 1.0 - (1.0 - min_factor) * (
+            (temperature - start_temp) / (full_temp - start_temp)
+        )
+        limit = peak_current * max(min_factor, factor)
+    return min(limit, max(-limit, i_q)), abs(i_q) > limit
 
-    collector = TestDataCollector("demo_trapezoidal_profile")
 
-    # Motion parameters
-    target = 1.57  # 90 degrees
-    max_vel = 2.0  # rad/s
-    max_accel = 20.0  # rad/s² - For NEMA 17 stepper
-    # Note: NEMA 17 with J=0.000054: τ = 0.000054·20 = 0.001Nm << 0.56Nm holding torque ✓
+@njit(cache=True)
+def _thermal_step(i_q, temperature, temp_nominal, heat_gain, alpha, temp_max):
+    """Scalar simulate_temperature step.
 
-    # Calculate motion phases
-    t_accel = max_vel / max_accel
-    t_coast = 0.0  # No coast for this profile
-    t_decel = t_accel
+    Args:
+        heat_gain: R_PHASE / COOLING_RATE (°C per A²)
+        alpha: exp(-COOLING_RATE * dt / THERMAL_MASS), fixed for a given dt
+        temp_max: Upper clamp (TEMP_SHUTDOWN + 10 °C)
+    """
+    temp_ss = temp_nominal + i_q * i_q * heat_gain
+    new_temp = temp_ss + (temperature - temp_ss) * alpha
+    return min(temp_max, max(temp_nominal, new_temp))
 
-    x_accel = 0.5 * max_accel * t_accel**2
-    if 2 * x_accel < target:
-        # Has coast phase
-        t_coast = (target - 2 * x_accel) / max_vel
-    else:
-        # Pure triangular
-        t_accel = np.sqrt(target / max_accel)
-        t_decel = t_accel
-        max_vel = max_accel * t_accel
 
-    # Simulate at 10 kHz
-    dt = 0.0001
-    duration = t_accel + t_coast + t_decel + 0.2  # Add settling time
-    n_samples = int(duration / dt)
+def _feed_collector(collector: TestDataCollector, trace: np.ndarray, dt: float):
+    """Append a recorded trace to the collector in one call.
 
-    # Initialize motor dynamics with realistic physics
-    # NEMA 17 56Ncm (0.56 Nm) stepper motor parameters
-    motor_params = MotorParameters(
-        J=0.000054,  # kg·m² - NEMA 17 rotor inertia (~54 gcm²)
-        kt=0.33,  # Nm/A - Torque constant (0.56Nm / 1.7A ≈ 0.33)
-        b=0.00005,  # Nm·s/rad - Very low damping (stepper has good bearings)
-        tau_coulomb=0.002,  # Nm - Low friction for stepper
-        tau_stribeck=0.001,  # Nm - Minimal stribeck
-        v_stribeck=0.1,  # rad/s
-        b_viscous=0.0001,  # Nm·s/rad - Low viscous friction
+    Args:
+        collector: Destination collector
+        trace: (n, len(_TRACE_FIELDS)) array written by a simulation kernel
+        dt: Simulation time between trace rows (s)
+    """
+    collector.extend_from_peripherals(
+        **dict(zip(_TRACE_FIELDS, trace.T)), timestamp=np.arange(len(trace)) * dt
     )
-    motor = MotorDynamics(motor_params)
-
-    # Initialize improved controller (cascade: position -> velocity)
-    if use_improved_controller:
-        vel_controller = PIDController(
-            kp=kp_vel,
-            ki=ki_vel,
-            kd=kd_vel,
-            max_integral=max_vel,  # Limit integral windup to max velocity
-            max_output=max_accel,  # Acceleration saturation
-        )
 
-    for i in range(n_samples):
-        t = i * dt
 
-        # Motion profile with acceleration tracking
-        if trajectory_type == "scurve":
-            # S-curve trajectory (jerk-limited)
-            target_pos, target_vel, target_accel, target_jerk = (
-                generate_scurve_trajectory(t, target, max_vel, max_accel, max_jerk)
-            )
-        else:
-            # Trapezoidal trajectory (original)
-            if t < t_accel:
-                # Acceleration phase
-                target_vel = max_accel * t
-                target_pos = 0.5 * max_accel * t**2
-                target_accel = max_accel
-            elif t < t_accel + t_coast:
-                # Coast phase
-                target_vel = max_vel
-                target_pos = 0.5 * max_accel * t_accel**2 + max_vel * (t - t_accel)
-                target_accel = 0.0
-            elif t < t_accel + t_coast + t_decel:
-                # Deceleration phase
-                t_dec = t - t_accel - t_coast
-                target_vel = max_vel - max_accel * t_dec
-                target_pos = (
-                    0.5 * max_accel * t_accel**2
-                    + max_vel * t_coast
-                    + max_vel * t_dec
-                    - 0.5 * max_accel * t_dec**2
-                )
-                target_accel = -max_accel
-            else:
-                # Settling
-                target_vel = 0.0
-                target_pos = target
-                target_accel = 0.0
+def _pwm_duties(
+    theta: np.ndarray,
+    i_q: np.ndarray,
+    gain: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Clamped 3-phase duty cycles 0.5 + gain·i_q·cos(θ - k·2π/3), k = 0, 1, 2.
 
-        # FOC Controller
-        pos_error = target_pos - motor.position
+    The shifted phases use cos(θ ∓ 2π/3) = -cos(θ)/2 ± (√3/2)·sin(θ), so
+    only one sin/cos pair is evaluated per sample. Everything after the
+    two trig calls runs in place, so the only temporaries are those two
+    arrays.
 
-        if use_improved_controller:
-            # Improved cascade control architecture with feedforward
-            # Outer loop (position): P controller -> target velocity
-            target_vel_from_pos = kp_pos * pos_error
-            target_vel_from_pos = np.clip(target_vel_from_pos, -max_vel, max_vel)
+    Args:
+        theta: Electrical angle per recorded sample (rad)
+        i_q: Q-axis current per recorded sample (A)
+        gain: Duty-cycle swing per ampere
+        out: Optional (n, 3) destination, e.g. the PWM columns of a trace
 
-            # Combine with feedforward velocity from trajectory
-            target_vel_combined = kff_vel * target_vel + target_vel_from_pos
+    Returns:
+        (n, 3) array of duty_a, duty_b, duty_c columns
+    """
+    if out is None:
+        out = np.empty((len(theta), 3))
+
+    c = np.cos(theta)
+    c *= i_q
+    s = np.sin(theta)
+    s *= i_q
 
-            # Inner loop (velocity): PID controller -> acceleration (feedback)
-            vel_error = target_vel_combined - motor.velocity
-            accel_fb = vel_controller.update(vel_error, dt, feedforward=0.0)
+    # duty_a = 0.5 + gain·i_q·cos θ
+    np.multiply(c, gain, out=out[:, 0])
+    out[:, 0] += 0.5
 
-            # Add acceleration feedforward (reduces lag)
-            accel_ff = kff_accel * target_accel
-            accel = accel_fb + accel_ff
+    # duty_b/c = (0.5 - gain/2·i_q·cos θ) ± gain·√3/2·i_q·sin θ
+    c *= -0.5 * gain
+    c += 0.5
+    s *= _SQRT3_2 * gain
+    np.add(c, s, out=out[:, 1])
+    np.subtract(c, s, out=out[:, 2])
+
+    np.clip(out, 0.0, 1.0, out=out)
+    return out
+
+
+@njit(cache=True)
+def _scurve_profile(t_arr, plan):
+    """Evaluate a planned S-curve (as a plain tuple) over a whole time grid.
+
+    Returns:
+        Tuple of (position, velocity, acceleration) arrays
+    """
+    n = len(t_arr)
+    target_pos_arr = np.empty(n)
+    target_vel_arr = np.empty(n)
+    target_accel_arr = np.empty(n)
+    for i in range(n):
+        target_pos_arr[i], target_vel_arr[i], target_accel_arr[i], _ = _evaluate_scurve(
+            plan, t_arr[i]
+        )
+    return target_pos_arr, target_vel_arr, target_accel_arr
+
+
+@njit(cache=True, fastmath=True)
+def _trapezoidal_loop(
+    target_pos_arr,
+    target_vel_arr,
+    target_accel_arr,
+    dt,
+    max_vel,
+    max_accel,
+    use_improved_controller,
+    kp_pos,
+    kp_vel,
+    ki_vel,
+    kd_vel,
+    kff_vel,
+    kff_accel,
+    J,
+    kt,
+    b,
+    tau_coulomb,
+    tau_stribeck,
+    v_stribeck,
+    b_viscous,
+):
+    """Control loop + motor physics for simulate_trapezoidal_motion.
 
-            # Apply acceleration with saturation
-            accel = np.clip(accel, -max_accel, max_accel)
+    Tracks the precomputed reference arrays. Mirrors PIDController.update and
+    MotorDynamics.update at nominal temperature.
 
-            # Convert desired acceleration to motor current WITH FULL COMPENSATION
-            # τ_total = J·α + τ_friction + b·ω + τ_load
-            # We need to compensate for ALL resistive forces that motor.update() will subtract
+    Returns:
+        (n, len(_TRACE_FIELDS)) trace, one row every _RECORD_EVERY samples.
+        The PWM and time-only temperature/health columns are left for the
+        caller.
+    """
+    n_samples = len(target_pos_arr)
+    trace = np.empty(((n_samples - 1) // _RECORD_EVERY + 1, len(_TRACE_FIELDS)))
+    inv_dt = 1.0 / dt
 
-            # Get friction torque from motor's friction model (includes Coulomb + Stribeck + viscous)
-            friction_comp = motor.friction.calculate(motor.velocity, motor.temperature)
+    # Motor state
+    position = 0.0
+    velocity = 0.0
 
-            # Get damping torque
-            damping_comp = motor_params.b * motor.velocity
+    # Velocity PID state (max_integral=max_vel, max_output=max_accel)
+    integral = 0.0
+    prev_error = 0.0
 
-            # Total desired torque (feedforward compensation)
-            desired_torque = motor_params.J * accel + friction_comp + damping_comp
-            i_q = desired_torque / motor_params.kt
-            i_q = np.clip(i_q, -10.0, 10.0)  # Current limit
+    for i in range(n_samples):
+        target_pos = target_pos_arr[i]
+        target_vel = target_vel_arr[i]
+        target_accel = target_accel_arr[i]
 
+        # Stribeck friction (Coulomb + Stribeck + viscous, nominal temperature)
+        if abs(velocity) > 1e-6:
+            sign = 1.0 if velocity > 0.0 else -1.0
         else:
-            # Original (broken) controller for comparison
-            vel_error = target_vel - motor.velocity
+            sign = 0.0
+        stribeck = tau_stribeck * math.exp(-((velocity / v_stribeck) ** 2))
+        tau_friction = tau_coulomb * sign + stribeck * sign + b_viscous * velocity
 
-            # Original PI gains (with issues)
-            kp_pos_orig = 20.0
-            kp_vel_orig = 0.5
-            # ki_vel = 2.0  # Declared but never used in original!
+        # FOC Controller
+        pos_error = target_pos - position
 
-            # Original control law (incorrect) - still kinematic for comparison
-            accel = kp_pos_orig * pos_error + kp_vel_orig * vel_error
-            desired_torque = motor_params.J * accel
-            i_q = desired_torque / motor_params.kt
-            i_q = np.clip(i_q, -10.0, 10.0)
+        if use_improved_controller:
+            # Outer loop (position): P controller -> target velocity
+            target_vel_from_pos = kp_pos * pos_error
+            target_vel_from_pos = min(max_vel, max(-max_vel, target_vel_from_pos))
 
-        # Update motor dynamics with realistic physics
-        state = motor.update(i_q, external_load=0.0, dt=dt)
-        position = state["position"]
-        velocity = state["velocity"]
-        accel_actual = state["acceleration"]
+            # Combine with feedforward velocity from trajectory
+            target_vel_combined = kff_vel * target_vel + target_vel_from_pos
 
-        i_d = 0.0  # Field weakening not used
+            # Inner loop (velocity): PID with anti-windup -> acceleration
+            vel_error = target_vel_combined - velocity
+            integral += vel_error * dt
+            integral = min(max_vel, max(-max_vel, integral))
+            if i == 0:
+                d_term = 0.0
+            else:
+                d_term = kd_vel * (vel_error - prev_error) * inv_dt
+            prev_error = vel_error
+            accel_fb = kp_vel * vel_error + ki_vel * integral + d_term
+            accel_fb = min(max_accel, max(-max_accel, accel_fb))
 
-        # Load estimation (from current)
-        load = 0.15 * i_q
+            # Add acceleration feedforward (reduces lag) and saturate
+            accel = accel_fb + kff_accel * target_accel
+            accel = min(max_accel, max(-max_accel, accel))
 
-        # PWM duty cycles (3-phase, simplified)
-        theta = position  # Electrical angle
-        duty_a = 0.5 + 0.3 * i_q * np.cos(theta)
-        duty_b = 0.5 + 0.3 * i_q * np.cos(theta - 2 * np.pi / 3)
-        duty_c = 0.5 + 0.3 * i_q * np.cos(theta + 2 * np.pi / 3)
+            # τ_total = J·α + τ_friction + b·ω (full compensation)
+            desired_torque = J * accel + tau_friction + b * velocity
+        else:
+            # Original (broken) controller for comparison
+            vel_error = target_vel - velocity
 
-        # Clamp
-        duty_a = np.clip(duty_a, 0.0, 1.0)
-        duty_b = np.clip(duty_b, 0.0, 1.0)
-        duty_c = np.clip(duty_c, 0.0, 1.0)
+            # Original PI gains (kp_pos_orig, kp_vel_orig), kinematic control law
+            accel = 20.0 * pos_error + 0.5 * vel_error
+            desired_torque = J * accel
 
-        # Temperature (slowly rising with I²R losses)
-        temp = 25.0 + 5.0 * np.tanh(t * 0.5)
+        i_q = desired_torque / kt
+        i_q = min(10.0, max(-10.0, i_q))  # Current limit
 
-        # Health score (slowly degrading with stress)
-        health = 100.0 - 2.0 * np.tanh(t * 0.2)
+        # Motor dynamics (Euler)
+        tau_net = kt * i_q - b * velocity - tau_friction
+        velocity += tau_net / J * dt
+        position += velocity * dt
 
         # Record every 10th sample (1 kHz effective rate for demo)
-        if i % 10 == 0:
-            collector.add_from_peripherals(
-                encoder_position=position,
-                encoder_velocity=velocity,
-                adc_i_q=i_q,
-                adc_i_d=i_d,
-                motor_pwm_a=duty_a,
-                motor_pwm_b=duty_b,
-                motor_pwm_c=duty_c,
-                target_position=target_pos,
-                target_velocity=target_vel,
-                load_estimate=load,
-                temperature=temp,
-                health_score=health,
-            )
+        if i % _RECORD_EVERY == 0:
+            row = trace[i // _RECORD_EVERY]
+            row[0] = position
+            row[1] = velocity
+            row[2] = i_q
+            row[3] = 0.0  # Field weakening not used
+            row[7] = target_pos
+            row[8] = target_vel
+            row[9] = 0.15 * i_q  # Load estimation (from current)
 
-    # Save
-    output_dir = Path("demo_results")
-    output_dir.mkdir(exist_ok=True)
+    return trace
 
-    collector.save_json(str(output_dir / "demo_trapezoidal_profile.json"))
-    collector.save_pandas_csv(str(output_dir / "demo_trapezoidal_profile.csv"))
 
-    print(f"   ✓ Generated {len(collector.snapshots)} samples")
-    print(f"   ✓ Duration: {duration:.2f} s")
+def simulate_trapezoidal_motion(
+    use_improved_controller: bool = True,
+    kp_pos: float = 8.0,
+    kp_vel: float = 3.0,
+    ki_vel: float = 0.5,
+    kd_vel: float = 0.1,
+    kff_vel: float = 1.0,
+    kff_accel: float = 0.0,
+    trajectory_type: str = "trapezoidal",
+    max_jerk: float = 50.0,
+):
+    """Simulate motion profile with FOC control.
 
-    return str(output_dir / "demo_trapezoidal_profile.json")
+    Args:
+        use_improved_controller: If True, use improved PID cascade controller
+        kp_pos: Position proportional gain
+        kp_vel: Velocity proportional gain
+        ki_vel: Velocity integral gain
+        kd_vel: Velocity derivative gain
+        kff_vel: Velocity feedforward gain (0-1, typically 1.0)
+        kff_accel: Acceleration feedforward gain (typically 0.1-0.3)
+        trajectory_type: "trapezoidal" or "scurve"
+        max_jerk: Maximum jerk for S-curve trajectory (rad/s³)
+    """
+    controller_type = "improved" if use_improved_controller else "original"
+    print(
+        f"\n📊 Simulating {trajectory_type.upper()} Motion Profile ({controller_type})..."
+    )
 
+    collector = TestDataCollector("demo_trapezoidal_profile")
 
-def simulate_adaptive_control_load_step():
-    """Simulate adaptive control response to load disturbance with improved load estimation."""
-    print("\n📊 Simulating Adaptive Control Load Step...")
+    # Motion parameters
+    target = 1.57  # 90 degrees
+    max_vel = 2.0  # rad/s
+    max_accel = 20.0  # rad/s² - For NEMA 17 stepper
+    # Note: NEMA 17 with J=0.000054: τ = 0.000054·20 = 0.001Nm << 0.56Nm holding torque ✓
 
-    collector = TestDataCollector("demo_adaptive_load_step")
+    # Calculate motion phases
+    t_accel, t_coast, t_decel, max_vel = trapezoidal_phases(target, max_vel, max_accel)
 
+    # Simulate at 10 kHz
     dt = 0.0001
-    duration = 0.6  # 600 ms
+    duration = t_accel + t_coast + t_decel + 0.2  # Add settling time
     n_samples = int(duration / dt)
 
     # Initialize motor dynamics with realistic physics
@@ -1364,20 +1918,97 @@ def simulate_adaptive_control_load_step():
         v_stribeck=0.1,  # rad/s
         b_viscous=0.0001,  # Nm·s/rad - Low viscous friction
     )
-    motor = MotorDynamics(motor_params)
-    motor.reset(position=0.0, velocity=0.0)
 
-    target_pos = 1.0  # Hold position at 1.0 rad
+    # Reference trajectory depends only on t: evaluate it up front
+    t_arr = np.arange(n_samples) * dt
+    if trajectory_type == "scurve":
+        target_pos_arr, target_vel_arr, target_accel_arr = scurve_profile(
+            t_arr, target, max_vel, max_accel, max_jerk
+        )
+    else:
+        target_pos_arr, target_vel_arr, target_accel_arr = trapezoidal_profile(
+            t_arr, target, max_vel, max_accel, t_accel, t_coast, t_decel
+        )
+
+    trace = _trapezoidal_loop(
+        target_pos_arr,
+        target_vel_arr,
+        target_accel_arr,
+        dt,
+        max_vel,
+        max_accel,
+        use_improved_controller,
+        kp_pos,
+        kp_vel,
+        ki_vel,
+        kd_vel,
+        kff_vel,
+        kff_accel,
+        motor_params.J,
+        motor_params.kt,
+        motor_params.b,
+        motor_params.tau_coulomb,
+        motor_params.tau_stribeck,
+        motor_params.v_stribeck,
+        motor_params.b_viscous,
+    )
+    # PWM duty cycles (3-phase, simplified), electrical angle = position
+    _pwm_duties(trace[:, 0], trace[:, 2], 0.3, out=trace[:, 4:7])
+    t_rec = t_arr[::_RECORD_EVERY]
+    trace[:, 10] = 25.0 + 5.0 * np.tanh(t_rec * 0.5)  # Slow I²R temperature rise
+    trace[:, 11] = 100.0 - 2.0 * np.tanh(t_rec * 0.2)  # Slow health degradation
+    _feed_collector(collector, trace, _RECORD_EVERY * dt)
+
+    # Save
+    output_dir = Path("demo_results")
+    output_dir.mkdir(exist_ok=True)
+
+    collector.save_json(str(output_dir / "demo_trapezoidal_profile.json"))
+    collector.save_npz(str(output_dir / "demo_trapezoidal_profile.npz"))
+    collector.save_pandas_csv(str(output_dir / "demo_trapezoidal_profile.csv"))
+
+    print(f"   ✓ Generated {len(collector)} samples")
+    print(f"   ✓ Duration: {duration:.2f} s")
+
+    return str(output_dir / "demo_trapezoidal_profile.json")
+
+
+@njit(cache=True, fastmath=True)
+def _load_step_loop(
+    n_samples,
+    dt,
+    target_pos,
+    J,
+    kt,
+    b,
+    tau_coulomb,
+    tau_stribeck,
+    v_stribeck,
+    b_viscous,
+):
+    """Position hold + load estimation loop for simulate_adaptive_control_load_step.
+
+    Mirrors MotorDynamics.update at nominal temperature.
+
+    Returns:
+        Tuple of ((n, len(_TRACE_FIELDS)) trace, learned baseline current).
+        The PWM, temperature and health columns are derived by the caller.
+    """
+    trace = np.empty(((n_samples - 1) // _RECORD_EVERY + 1, len(_TRACE_FIELDS)))
+
+    # Motor state
+    position = 0.0
+    velocity = 0.0
 
     # Load estimation state with baseline learning
     load_estimate = 0.0
     i_q_baseline = 0.0
     baseline_learned = False
-    baseline_samples = []
+    baseline_sum = 0.0
+    n_baseline = 0
 
     # coolStep state
     coolstep_enabled = True
-    current_reduction_factor = 1.0
 
     for i in range(n_samples):
         t = i * dt
@@ -1389,7 +2020,7 @@ def simulate_adaptive_control_load_step():
             external_load = 0.0
 
         # IMPROVED Position controller with adaptive gain and deadband
-        pos_error = target_pos - motor.position
+        pos_error = target_pos - position
 
         # Adaptive gain: lower for small errors to reduce holding current
         if abs(pos_error) < 0.01:  # Within 0.01 rad (0.57°)
@@ -1400,31 +2031,34 @@ def simulate_adaptive_control_load_step():
         kd = 3.0  # Higher damping for stability
 
         # Controller outputs desired acceleration
-        accel = kp * pos_error - kd * motor.velocity
+        accel = kp * pos_error - kd * velocity
 
         # Convert to motor current: i_q = (J * α) / kt
-        desired_torque = motor_params.J * accel
-        i_q_base = desired_torque / motor_params.kt
-        i_q_base = np.clip(i_q_base, -10.0, 10.0)
+        desired_torque = J * accel
+        i_q_base = desired_torque / kt
+        i_q_base = min(10.0, max(-10.0, i_q_base))
 
-        # Update motor dynamics with realistic physics (including external load)
-        state = motor.update(i_q_base, external_load=external_load, dt=dt)
-        position = state["position"]
-        velocity = state["velocity"]
+        # Motor dynamics with external load (Euler, Stribeck friction)
+        if abs(velocity) > 1e-6:
+            sign = 1.0 if velocity > 0.0 else -1.0
+        else:
+            sign = 0.0
+        stribeck = tau_stribeck * math.exp(-((velocity / v_stribeck) ** 2))
+        tau_friction = tau_coulomb * sign + stribeck * sign + b_viscous * velocity
+        tau_net = kt * i_q_base - b * velocity - tau_friction - external_load
+        velocity += tau_net / J * dt
+        position += velocity * dt
 
         # IMPROVED Load estimation with baseline learning
         if not baseline_learned:
             # Learn baseline during first 0.15s (before load step at 0.2s)
             if t < 0.15:
-                baseline_samples.append(i_q_base)
+                baseline_sum += i_q_base
+                n_baseline += 1
             else:
-                # Calculate baseline from samples
-                if baseline_samples:
-                    i_q_baseline = np.mean(baseline_samples)
-                    print(
-                        f"   ✓ Learned baseline current: {i_q_baseline:.3f} A "
-                        f"(torque: {0.15 * i_q_baseline:.3f} Nm)"
-                    )
+                # Baseline is the mean current over the learning window
+                if n_baseline > 0:
+                    i_q_baseline = baseline_sum / n_baseline
                 else:
                     i_q_baseline = 0.0
                 baseline_learned = True
@@ -1442,185 +2076,286 @@ def simulate_adaptive_control_load_step():
             load_estimate = 0.0
 
         # coolStep: Reduce current when load is steady
-        if coolstep_enabled and baseline_learned:
-            # If load is stable and high, reduce current
-            if load_estimate > 0.1:
-                # Reduce by up to 30%
-                reduction = min(0.3, 0.1 * (load_estimate - 0.1))
-                current_reduction_factor = 1.0 - reduction
-            else:
-                current_reduction_factor = 1.0
+        if coolstep_enabled and baseline_learned and load_estimate > 0.1:
+            # If load is stable and high, reduce by up to 30%
+            reduction = min(0.3, 0.1 * (load_estimate - 0.1))
+            current_reduction_factor = 1.0 - reduction
         else:
             current_reduction_factor = 1.0
 
         i_q = i_q_base * current_reduction_factor
-        i_d = 0.0
 
-        # PWM
-        theta = position
-        duty_a = 0.5 + 0.3 * i_q * np.cos(theta)
-        duty_b = 0.5 + 0.3 * i_q * np.cos(theta - 2 * np.pi / 3)
-        duty_c = 0.5 + 0.3 * i_q * np.cos(theta + 2 * np.pi / 3)
+        # Record every 10th sample
+        if i % _RECORD_EVERY == 0:
+            row = trace[i // _RECORD_EVERY]
+            row[0] = position
+            row[1] = velocity
+            row[2] = i_q
+            row[3] = 0.0
+            row[7] = target_pos
+            row[8] = 0.0
+            row[9] = load_estimate
 
-        duty_a = np.clip(duty_a, 0.0, 1.0)
-        duty_b = np.clip(duty_b, 0.0, 1.0)
-        duty_c = np.clip(duty_c, 0.0, 1.0)
+    return trace, i_q_baseline
 
-        # Temperature rises with current
-        temp = 25.0 + 10.0 * (i_q / 2.0) ** 2
 
-        # Health degrades with high load
-        health = 100.0 - 10.0 * (load_estimate / 0.5) ** 2
-        health = max(health, 60.0)
+def simulate_adaptive_control_load_step():
+    """Simulate adaptive control response to load disturbance with improved load estimation."""
+    print("\n📊 Simulating Adaptive Control Load Step...")
 
-        # Record every 10th sample
-        if i % 10 == 0:
-            collector.add_from_peripherals(
-                encoder_position=position,
-                encoder_velocity=velocity,
-                adc_i_q=i_q,
-                adc_i_d=i_d,
-                motor_pwm_a=duty_a,
-                motor_pwm_b=duty_b,
-                motor_pwm_c=duty_c,
-                target_position=target_pos,
-                target_velocity=0.0,
-                load_estimate=load_estimate,
-                temperature=temp,
-                health_score=health,
-            )
+    collector = TestDataCollector("demo_adaptive_load_step")
+
+    dt = 0.0001
+    duration = 0.6  # 600 ms
+    n_samples = int(duration / dt)
+
+    # Initialize motor dynamics with realistic physics
+    # NEMA 17 56Ncm (0.56 Nm) stepper motor parameters
+    motor_params = MotorParameters(
+        J=0.000054,  # kg·m² - NEMA 17 rotor inertia (~54 gcm²)
+        kt=0.33,  # Nm/A - Torque constant (0.56Nm / 1.7A ≈ 0.33)
+        b=0.00005,  # Nm·s/rad - Very low damping (stepper has good bearings)
+        tau_coulomb=0.002,  # Nm - Low friction for stepper
+        tau_stribeck=0.001,  # Nm - Minimal stribeck
+        v_stribeck=0.1,  # rad/s
+        b_viscous=0.0001,  # Nm·s/rad - Low viscous friction
+    )
+    target_pos = 1.0  # Hold position at 1.0 rad
+
+    trace, i_q_baseline = _load_step_loop(
+        n_samples,
+        dt,
+        target_pos,
+        motor_params.J,
+        motor_params.kt,
+        motor_params.b,
+        motor_params.tau_coulomb,
+        motor_params.tau_stribeck,
+        motor_params.v_stribeck,
+        motor_params.b_viscous,
+    )
+    print(
+        f"   ✓ Learned baseline current: {i_q_baseline:.3f} A "
+        f"(torque: {0.15 * i_q_baseline:.3f} Nm)"
+    )
+
+    # Columns derived from the recorded current/load estimate
+    i_q = trace[:, 2]
+    load_estimate = trace[:, 9]
+    _pwm_duties(trace[:, 0], i_q, 0.3, out=trace[:, 4:7])
+    # Temperature rises with current
+    trace[:, 10] = 25.0 + 10.0 * (i_q / 2.0) ** 2
+    # Health degrades with high load
+    trace[:, 11] = np.maximum(100.0 - 10.0 * (load_estimate / 0.5) ** 2, 60.0)
+    _feed_collector(collector, trace, _RECORD_EVERY * dt)
 
     # Save
     output_dir = Path("demo_results")
     output_dir.mkdir(exist_ok=True)
 
     collector.save_json(str(output_dir / "demo_adaptive_load_step.json"))
+    collector.save_npz(str(output_dir / "demo_adaptive_load_step.npz"))
     collector.save_pandas_csv(str(output_dir / "demo_adaptive_load_step.csv"))
 
-    print(f"   ✓ Generated {len(collector.snapshots)} samples")
+    print(f"   ✓ Generated {len(collector)} samples")
     print(f"   ✓ Load step: 0→0.3→0 Nm")
 
     return str(output_dir / "demo_adaptive_load_step.json")
 
 
-def simulate_high_speed_motion():
-    """Simulate high-speed motion with saturation and thermal protection."""
-    print("\n📊 Simulating High-Speed Motion with Thermal Protection...")
+def _high_speed_profile(
+    t_arr: np.ndarray, target: float, max_vel: float, max_accel: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Simplified S-curve reference for simulate_high_speed_motion.
 
-    collector = TestDataCollector("demo_high_speed_motion")
+    Jerk phase (50 ms), constant acceleration up to max_vel, then coast;
+    the position is capped at the target.
 
-    dt = 0.0001
-    duration = 1.0
-    n_samples = int(duration / dt)
+    Args:
+        t_arr: Sample times (s)
+        target: Target position (rad)
+        max_vel: Cruise velocity (rad/s)
+        max_accel: Acceleration magnitude (rad/s²)
+
+    Returns:
+        Tuple of (position, velocity) arrays
+    """
+    t_jerk = 0.05
+    t_accel = max_vel / max_accel
+    jerk = max_accel / t_jerk
+
+    m1 = t_arr < t_jerk
+    m2 = ~m1 & (t_arr < t_accel)
+    m3 = ~m1 & ~m2
+
+    target_pos_arr = np.empty_like(t_arr)
+    target_vel_arr = np.empty_like(t_arr)
+
+    # Jerk phase
+    t = t_arr[m1]
+    target_vel_arr[m1] = 0.5 * jerk * t**2
+    target_pos_arr[m1] = (1 / 6) * jerk * t**3
+
+    # Constant accel
+    t = t_arr[m2]
+    target_vel_arr[m2] = max_accel * t
+    target_pos_arr[m2] = 0.5 * max_accel * t**2
+
+    # Coast/decel (simplified)
+    target_vel_arr[m3] = max_vel
+    target_pos_arr[m3] = 0.5 * max_accel * t_accel**2 + max_vel * (t_arr[m3] - t_accel)
+
+    np.minimum(target_pos_arr, target, out=target_pos_arr)
+    return target_pos_arr, target_vel_arr
+
+
+@njit(cache=True, fastmath=True)
+def _high_speed_loop(
+    target_pos_arr,
+    target_vel_arr,
+    dt,
+    max_vel,
+    max_accel,
+    peak_current,
+    derating_start_temp,
+    derating_full_temp,
+    derating_min_factor,
+    temp_nominal,
+    temp_shutdown,
+    heat_gain,
+    cooling_alpha,
+    kt,
+):
+    """Saturating kinematic loop + thermal model for simulate_high_speed_motion.
+
+    Tracks the precomputed reference arrays. HardwareConfig fields are
+    passed as scalars (see simulate_high_speed_motion).
+
+    Returns:
+        Tuple of ((n, len(_TRACE_FIELDS)) trace, final temperature,
+        number of current-saturated samples). The PWM columns are left for
+        the caller.
+    """
+    n_samples = len(target_pos_arr)
+    trace = np.empty(((n_samples - 1) // _RECORD_EVERY + 1, len(_TRACE_FIELDS)))
 
     position = 0.0
     velocity = 0.0
-    target = 6.28  # 360 degrees
-    max_vel = 10.0  # Very fast
-    max_accel = 50.0
 
-    # Hardware config and thermal state
-    hw_config = HardwareConfig()
-    temperature = hw_config.TEMP_NOMINAL
+    # Thermal state
+    temperature = temp_nominal
+    temp_max = temp_shutdown + 10.0
     saturation_count = 0
 
     for i in range(n_samples):
-        t = i * dt
-
-        # S-curve profile (simplified)
-        t_jerk = 0.05
-        t_accel = max_vel / max_accel
-
-        if t < t_jerk:
-            # Jerk phase
-            jerk = max_accel / t_jerk
-            target_accel = jerk * t
-            target_vel = 0.5 * jerk * t**2
-            target_pos = (1 / 6) * jerk * t**3
-        elif t < t_accel:
-            # Constant accel
-            target_accel = max_accel
-            target_vel = max_accel * t
-            target_pos = 0.5 * max_accel * t**2
-        else:
-            # Coast/decel (simplified)
-            target_accel = 0.0
-            target_vel = max_vel
-            target_pos = 0.5 * max_accel * t_accel**2 + max_vel * (t - t_accel)
-
-        target_pos = min(target_pos, target)
+        target_pos = target_pos_arr[i]
+        target_vel = target_vel_arr[i]
 
         # Controller (with saturation)
         pos_error = target_pos - position
         vel_error = target_vel - velocity
 
         accel = 30.0 * pos_error + 1.0 * vel_error
-        accel = np.clip(accel, -max_accel, max_accel)  # Saturation
+        accel = min(max_accel, max(-max_accel, accel))  # Saturation
 
         velocity += accel * dt
-        velocity = np.clip(velocity, -max_vel, max_vel)
+        velocity = min(max_vel, max(-max_vel, velocity))
         position += velocity * dt
 
         # Calculate requested current
         i_q_requested = 0.2 * accel + 0.1 * velocity
 
         # Apply hardware current limits with thermal protection
-        i_q, is_saturated = apply_current_limit(i_q_requested, temperature, hw_config)
-        i_d = 0.0
+        i_q, is_saturated = _limit_current(
+            i_q_requested,
+            temperature,
+            peak_current,
+            derating_start_temp,
+            derating_full_temp,
+            derating_min_factor,
+            temp_shutdown,
+        )
 
         if is_saturated:
             saturation_count += 1
 
         # Simulate temperature based on actual current
-        temperature = simulate_temperature(i_q, temperature, dt, hw_config)
+        temperature = _thermal_step(
+            i_q, temperature, temp_nominal, heat_gain, cooling_alpha, temp_max
+        )
 
-        # Load
-        load = hw_config.KT * i_q
+        # Record
+        if i % _RECORD_EVERY == 0:
+            row = trace[i // _RECORD_EVERY]
+            row[0] = position
+            row[1] = velocity
+            row[2] = i_q
+            row[3] = 0.0
+            row[7] = target_pos
+            row[8] = target_vel
+            row[9] = kt * i_q  # Load
+
+            # Health degrades with temperature and saturation
+            temp_factor = (temperature - temp_nominal) / (temp_shutdown - temp_nominal)
+            saturation_factor = saturation_count / (i + 1) if i > 0 else 0.0
+            health = 100.0 - 15.0 * temp_factor - 10.0 * saturation_factor
+            row[10] = temperature
+            row[11] = max(health, 60.0)
+
+    return trace, temperature, saturation_count
 
-        # PWM (with saturation)
-        theta = position
-        duty_a = 0.5 + 0.4 * i_q * np.cos(theta)
-        duty_b = 0.5 + 0.4 * i_q * np.cos(theta - 2 * np.pi / 3)
-        duty_c = 0.5 + 0.4 * i_q * np.cos(theta + 2 * np.pi / 3)
 
-        # Hard saturation
-        duty_a = np.clip(duty_a, 0.0, 1.0)
-        duty_b = np.clip(duty_b, 0.0, 1.0)
-        duty_c = np.clip(duty_c, 0.0, 1.0)
+def simulate_high_speed_motion():
+    """Simulate high-speed motion with saturation and thermal protection."""
+    print("\n📊 Simulating High-Speed Motion with Thermal Protection...")
 
-        # Health degrades with temperature and saturation
-        temp_factor = (temperature - hw_config.TEMP_NOMINAL) / (
-            hw_config.TEMP_SHUTDOWN - hw_config.TEMP_NOMINAL
-        )
-        saturation_factor = saturation_count / (i + 1) if i > 0 else 0
-        health = 100.0 - 15.0 * temp_factor - 10.0 * saturation_factor
-        health = max(health, 60.0)
+    collector = TestDataCollector("demo_high_speed_motion")
 
-        # Record
-        if i % 10 == 0:
-            collector.add_from_peripherals(
-                encoder_position=position,
-                encoder_velocity=velocity,
-                adc_i_q=i_q,
-                adc_i_d=i_d,
-                motor_pwm_a=duty_a,
-                motor_pwm_b=duty_b,
-                motor_pwm_c=duty_c,
-                target_position=target_pos,
-                target_velocity=target_vel,
-                load_estimate=load,
-                temperature=temperature,
-                health_score=health,
-            )
+    dt = 0.0001
+    duration = 1.0
+    n_samples = int(duration / dt)
+
+    target = 6.28  # 360 degrees
+    max_vel = 10.0  # Very fast
+    max_accel = 50.0
+
+    # Hardware config (thermal state is integrated by the kernel)
+    hw_config = HardwareConfig()
+
+    # Reference trajectory depends only on t: evaluate it up front
+    target_pos_arr, target_vel_arr = _high_speed_profile(
+        np.arange(n_samples) * dt, target, max_vel, max_accel
+    )
+
+    trace, temperature, saturation_count = _high_speed_loop(
+        target_pos_arr,
+        target_vel_arr,
+        dt,
+        max_vel,
+        max_accel,
+        hw_config.MAX_PEAK_CURRENT,
+        hw_config.DERATING_START_TEMP,
+        hw_config.DERATING_FULL_TEMP,
+        hw_config.DERATING_MIN_FACTOR,
+        hw_config.TEMP_NOMINAL,
+        hw_config.TEMP_SHUTDOWN,
+        hw_config.R_PHASE / hw_config.COOLING_RATE,
+        math.exp(-hw_config.COOLING_RATE * dt / hw_config.THERMAL_MASS),
+        hw_config.KT,
+    )
+    # PWM (with hard saturation)
+    _pwm_duties(trace[:, 0], trace[:, 2], 0.4, out=trace[:, 4:7])
+    _feed_collector(collector, trace, _RECORD_EVERY * dt)
 
     # Save
     output_dir = Path("demo_results")
     collector.save_json(str(output_dir / "demo_high_speed_motion.json"))
+    collector.save_npz(str(output_dir / "demo_high_speed_motion.npz"))
     collector.save_pandas_csv(str(output_dir / "demo_high_speed_motion.csv"))
 
     # Report thermal protection statistics
     saturation_percent = saturation_count / n_samples * 100
-    print(f"   ✓ Generated {len(collector.snapshots)} samples")
+    print(f"   ✓ Generated {len(collector)} samples")
     print(f"   ✓ Max velocity: {max_vel} rad/s")
     print(
         f"   ✓ Final temperature: {temperature:.1f}°C (started at {hw_config.TEMP_NOMINAL}°C)"
@@ -1632,8 +2367,311 @@ def simulate_high_speed_motion():
     return str(output_dir / "demo_high_speed_motion.json")
 
 
-def tune_controller_gains():
-    """Systematically tune controller gains and compare metrics."""
+def _call_captured(job: tuple) -> tuple:
+    """Process-pool entry point: call one function, capturing its output.
+
+    The console output is handed back so the parent can print each log in
+    one piece instead of interleaved.
+
+    Args:
+        job: (function, keyword arguments)
+
+    Returns:
+        Tuple of (function result, captured console output)
+    """
+    func, kwargs = job
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        result = func(**kwargs)
+    return result, log.getvalue()
+
+
+def map_in_workers(jobs: list, max_workers: int) -> list:
+    """Run (function, kwargs) jobs in worker processes.
+
+    Each job's console output is replayed in job order. With a single
+    worker the jobs simply run in this process.
+
+    Args:
+        jobs: (module-level function, keyword arguments) pairs
+        max_workers: Worker processes
+
+    Returns:
+        Job results, in job order
+    """
+    if max_workers <= 1:
+        return [func(**kwargs) for func, kwargs in jobs]
+
+    results = []
+    # spawn: each worker is a fresh interpreter that loads the kernels from
+    # numba's on-disk cache
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp.get_context("spawn")
+    ) as executor:
+        for result, log in executor.map(_call_captured, jobs):
+            print(log, end="", flush=True)
+            results.append(result)
+    return results
+
+
+def _report_config(
+    config: dict,
+    position_arr: np.ndarray,
+    velocity_arr: np.ndarray,
+    aborted: bool,
+    target: float,
+    dt: float,
+) -> dict:
+    """Print one tune_controller_gains configuration and its metrics.
+
+    Args:
+        config: Gain set (see tune_controller_gains)
+        position_arr: Simulated position, one entry per simulated sample
+        velocity_arr: Simulated velocity, one entry per simulated sample
+        aborted: Whether the run was stopped as unstable
+        target: Target position (rad)
+        dt: Simulation time step (s)
+
+    Returns:
+        calculate_control_metrics result plus config, omega_n and zeta
+    """
+    print(f"\n📊 Testing: {config['name']}")
+    kff_v = config.get("kff_vel", 1.0)
+    kff_a = config.get("kff_accel", 0.0)
+    print(
+        f"   Gains: kp_pos={config['kp_pos']}, kp_vel={config['kp_vel']}, "
+        f"ki_vel={config['ki_vel']}, kd_vel={config['kd_vel']}"
+    )
+    if kff_a > 0:
+        print(f"   Feedforward: kff_vel={kff_v}, kff_accel={kff_a}")
+
+    # Calculate theoretical damping ratio
+    omega_n = math.sqrt(config["kp_pos"])
+    zeta = config["kp_vel"] / (2 * omega_n) if omega_n > 0 else 0
+
+    print(f"   ωn={omega_n:.2f} rad/s, ζ={zeta:.3f}")
+
+    if aborted:
+        aborted_at = len(position_arr) * dt
+        print(
+            f"   ❌ Unstable: aborted at t={aborted_at:.3f}s "
+            f"(position {position_arr[-1]:.2f} rad, "
+            f"velocity {velocity_arr[-1]:.2f} rad/s)"
+        )
+        return {
+            "config": config,
+            "omega_n": omega_n,
+            "zeta": zeta,
+            "aborted": True,
+            "aborted_at": aborted_at,
+        }
+
+    # Calculate metrics
+    metrics = calculate_control_metrics(position_arr, target, velocity_arr, 2.0, dt)
+
+    metrics["config"] = config
+    metrics["omega_n"] = omega_n
+    metrics["zeta"] = zeta
+    metrics["aborted"] = False
+
+    # Print results
+    print(f"   Overshoot: {metrics['overshoot_percent']:.1f}%")
+    print(
+        f"   Max velocity: {metrics['max_velocity']:.2f} rad/s "
+        f"(violation: {metrics['velocity_violation_percent']:.1f}%)"
+    )
+    print(f"   RMS error: {metrics['rms_error_deg']:.3f}°")
+    print(
+        f"   Settling time: {metrics['settling_time']:.3f}s"
+        if metrics["settling_time"]
+        else "   Settling time: None"
+    )
+
+    # Pass/fail indicators
+    issues = []
+    if metrics["overshoot_percent"] > 10:
+        issues.append(f"❌ Overshoot too high ({metrics['overshoot_percent']:.1f}%)")
+    if metrics["velocity_violation_percent"] > 0:
+        issues.append(
+            f"❌ Velocity violation ({metrics['velocity_violation_percent']:.1f}%)"
+        )
+    if metrics["rms_error_deg"] > 1.0:
+        issues.append(f"⚠️  RMS error high ({metrics['rms_error_deg']:.3f}°)")
+
+    if issues:
+        for issue in issues:
+            print(f"   {issue}")
+    else:
+        print("   ✅ All criteria met!")
+
+    return metrics
+
+
+def _evaluate_configs(
+    configs: list,
+    reference: tuple,
+    target: float,
+    max_vel: float,
+    max_accel: float,
+    dt: float,
+) -> list:
+    """Simulate a batch of tune_controller_gains configurations in lockstep.
+
+    Args:
+        configs: Gain sets (see tune_controller_gains)
+        reference: (position, velocity, acceleration) target arrays, shared
+            by every configuration of the sweep
+        target: Target position (rad)
+        max_vel: Velocity limit (rad/s)
+        max_accel: Acceleration limit (rad/s²)
+        dt: Simulation time step (s)
+
+    Returns:
+        _report_config result for each configuration, in order
+    """
+
+    def gains(name, default=None):
+        return np.array([c.get(name, default) for c in configs], dtype=np.float64)
+
+    target_pos_arr, target_vel_arr, target_accel_arr = reference
+    # Abort bounds sit well past the acceptance criteria (overshoot < 10%,
+    # no velocity violation), so an aborted configuration is never chosen
+    position, velocity, n_run, aborted = _tuning_sweep(
+        target_pos_arr,
+        target_vel_arr,
+        target_accel_arr,
+        dt,
+        max_vel,
+        max_accel,
+        np.array([c["use_improved"] for c in configs], dtype=np.bool_),
+        gains("kp_pos"),
+        gains("kp_vel"),
+        gains("ki_vel"),
+        gains("kd_vel"),
+        gains("kff_vel", 1.0),
+        gains("kff_accel", 0.0),
+        1.5 * target,
+        1.2 * max_vel,
+    )
+
+    return [
+        _report_config(
+            config,
+            position[k, : n_run[k]],
+            velocity[k, : n_run[k]],
+            aborted[k],
+            target,
+            dt,
+        )
+        for k, config in enumerate(configs)
+    ]
+
+
+@njit(cache=True, fastmath=True)
+def _tuning_sweep(
+    target_pos_arr,
+    target_vel_arr,
+    target_accel_arr,
+    dt,
+    max_vel,
+    max_accel,
+    use_improved,
+    kp_pos,
+    kp_vel,
+    ki_vel,
+    kd_vel,
+    kff_vel,
+    kff_accel,
+    abort_position,
+    abort_velocity,
+):
+    """Kinematic cascade loop for a batch of tune_controller_gains configurations.
+
+    Gains are (n_configs,) arrays. Every configuration steps through the
+    shared reference in lockstep, so each time step is one short loop over
+    the state vectors. The velocity PID (max_integral=max_vel,
+    max_output=max_accel) mirrors PIDController.update. A configuration is
+    marked aborted once its position exceeds abort_position or |velocity|
+    exceeds abort_velocity and is not stepped any further; its history
+    after that sample is left unset.
+
+    Returns:
+        Tuple of ((n_configs, n_samples) position, (n_configs, n_samples)
+        velocity, (n_configs,) samples before the abort or n_samples,
+        (n_configs,) aborted flags)
+    """
+    n_samples = len(target_pos_arr)
+    n_configs = len(kp_pos)
+    position_hist = np.empty((n_configs, n_samples))
+    velocity_hist = np.empty((n_configs, n_samples))
+    n_run = np.full(n_configs, n_samples)
+    aborted = np.zeros(n_configs, dtype=np.bool_)
+
+    position = np.zeros(n_configs)
+    velocity = np.zeros(n_configs)
+    integral = np.zeros(n_configs)
+    prev_error = np.zeros(n_configs)
+    d_scale = 0.0  # No derivative kick on the first sample
+
+    for i in range(n_samples):
+        target_pos = target_pos_arr[i]
+        target_vel = target_vel_arr[i]
+        target_accel = target_accel_arr[i]
+
+        for k in range(n_configs):
+            if aborted[k]:
+                continue  # Frozen: its remaining samples are not reported
+
+            pos_error = target_pos - position[k]
+
+            if use_improved[k]:
+                target_vel_from_pos = kp_pos[k] * pos_error
+                target_vel_from_pos = min(max_vel, max(-max_vel, target_vel_from_pos))
+                target_vel_combined = kff_vel[k] * target_vel + target_vel_from_pos
+
+                vel_error = target_vel_combined - velocity[k]
+                integral[k] = min(max_vel, max(-max_vel, integral[k] + vel_error * dt))
+                d_term = d_scale * kd_vel[k] * (vel_error - prev_error[k]) / dt
+                prev_error[k] = vel_error
+                accel_fb = kp_vel[k] * vel_error + ki_vel[k] * integral[k] + d_term
+                accel_fb = min(max_accel, max(-max_accel, accel_fb))
+
+                accel = accel_fb + kff_accel[k] * target_accel
+                accel = min(max_accel, max(-max_accel, accel))
+
+                v = min(max_vel, max(-max_vel, velocity[k] + accel * dt))
+            else:
+                vel_error = target_vel - velocity[k]
+                v = velocity[k] + (kp_pos[k] * pos_error + kp_vel[k] * vel_error) * dt
+            p = position[k] + v * dt
+
+            velocity[k] = v
+            position[k] = p
+            position_hist[k, i] = p
+            velocity_hist[k, i] = v
+
+            if p > abort_position or abs(v) > abort_velocity:
+                aborted[k] = True
+                n_run[k] = i + 1
+
+        d_scale = 1.0
+
+    return position_hist, velocity_hist, n_run, aborted
+
+
+def tune_controller_gains(max_workers: int = 1) -> dict:
+    """Systematically tune controller gains and compare metrics.
+
+    Args:
+        max_workers: Worker processes for the configuration sweep; the
+            configurations are split into one lockstep batch per worker.
+            The default runs the whole sweep in-process as a single batch:
+            it is a few milliseconds of JIT-compiled code, far below the
+            cost of spawning a worker. Raise it for larger sweeps.
+
+    Returns:
+        The chosen configuration
+    """
     print("\n" + "=" * 80)
     print("🔧 CONTROLLER GAIN TUNING")
     print("=" * 80)
@@ -1840,158 +2878,34 @@ def tune_controller_gains():
         },
     ]
 
-    results = []
-
-    for config in test_configs:
-        print(f"\n📊 Testing: {config['name']}")
-        kff_v = config.get("kff_vel", 1.0)
-        kff_a = config.get("kff_accel", 0.0)
-        print(
-            f"   Gains: kp_pos={config['kp_pos']}, kp_vel={config['kp_vel']}, "
-            f"ki_vel={config['ki_vel']}, kd_vel={config['kd_vel']}"
-        )
-        if kff_a > 0:
-            print(f"   Feedforward: kff_vel={kff_v}, kff_accel={kff_a}")
-
-        # Run simulation with this config (without saving)
-        # We need to extract just the simulation part
-        target = 1.57
-        max_vel = 2.0
-        max_accel = 20.0  # For NEMA 17
-        dt = 0.0001
-
-        # Calculate motion phases
-        t_accel = max_vel / max_accel
-        t_coast = 0.0
-        t_decel = t_accel
-
-        x_accel = 0.5 * max_accel * t_accel**2
-        if 2 * x_accel < target:
-            t_coast = (target - 2 * x_accel) / max_vel
-        else:
-            t_accel = np.sqrt(target / max_accel)
-            t_decel = t_accel
-            max_vel = max_accel * t_accel
-
-        duration = t_accel + t_coast + t_decel + 0.2
-        n_samples = int(duration / dt)
-
-        position_arr = []
-        velocity_arr = []
-
-        position = 0.0
-        velocity = 0.0
-
-        if config["use_improved"]:
-            vel_controller = PIDController(
-                kp=config["kp_vel"],
-                ki=config["ki_vel"],
-                kd=config["kd_vel"],
-                max_integral=max_vel,
-                max_output=max_accel,
-            )
-
-        for i in range(n_samples):
-            t = i * dt
-
-            # Motion profile with acceleration
-            if t < t_accel:
-                target_vel = max_accel * t
-                target_pos = 0.5 * max_accel * t**2
-                target_accel = max_accel
-            elif t < t_accel + t_coast:
-                target_vel = max_vel
-                target_pos = 0.5 * max_accel * t_accel**2 + max_vel * (t - t_accel)
-                target_accel = 0.0
-            elif t < t_accel + t_coast + t_decel:
-                t_dec = t - t_accel - t_coast
-                target_vel = max_vel - max_accel * t_dec
-                target_pos = (
-                    0.5 * max_accel * t_accel**2
-                    + max_vel * t_coast
-                    + max_vel * t_dec
-                    - 0.5 * max_accel * t_dec**2
-                )
-                target_accel = -max_accel
-            else:
-                target_vel = 0.0
-                target_pos = target
-                target_accel = 0.0
-
-            # Controller
-            pos_error = target_pos - position
-
-            if config["use_improved"]:
-                target_vel_from_pos = config["kp_pos"] * pos_error
-                target_vel_from_pos = np.clip(target_vel_from_pos, -max_vel, max_vel)
-                target_vel_combined = kff_v * target_vel + target_vel_from_pos
-
-                vel_error = target_vel_combined - velocity
-                accel_fb = vel_controller.update(vel_error, dt, feedforward=0.0)
-                accel_ff = kff_a * target_accel
-                accel = accel_fb + accel_ff
-                accel = np.clip(accel, -max_accel, max_accel)
-
-                velocity += accel * dt
-                velocity = np.clip(velocity, -max_vel, max_vel)
-                position += velocity * dt
-            else:
-                vel_error = target_vel - velocity
-                velocity += (
-                    config["kp_pos"] * pos_error + config["kp_vel"] * vel_error
-                ) * dt
-                position += velocity * dt
-
-            position_arr.append(position)
-            velocity_arr.append(velocity)
-
-        # Calculate metrics
-        position_arr = np.array(position_arr)
-        velocity_arr = np.array(velocity_arr)
-        metrics = calculate_control_metrics(position_arr, target, velocity_arr, 2.0, dt)
-
-        # Calculate theoretical damping ratio
-        omega_n = np.sqrt(config["kp_pos"])
-        zeta = config["kp_vel"] / (2 * omega_n) if omega_n > 0 else 0
-
-        metrics["config"] = config
-        metrics["omega_n"] = omega_n
-        metrics["zeta"] = zeta
-
-        results.append(metrics)
-
-        # Print results
-        print(f"   ωn={omega_n:.2f} rad/s, ζ={zeta:.3f}")
-        print(f"   Overshoot: {metrics['overshoot_percent']:.1f}%")
-        print(
-            f"   Max velocity: {metrics['max_velocity']:.2f} rad/s "
-            f"(violation: {metrics['velocity_violation_percent']:.1f}%)"
-        )
-        print(f"   RMS error: {metrics['rms_error_deg']:.3f}°")
-        print(
-            f"   Settling time: {metrics['settling_time']:.3f}s"
-            if metrics["settling_time"]
-            else "   Settling time: None"
-        )
+    # Every configuration follows the same reference move: evaluate it once
+    target = 1.57
+    max_vel = 2.0
+    max_accel = 20.0  # For NEMA 17
+    dt = 0.0001
 
-        # Pass/fail indicators
-        issues = []
-        if metrics["overshoot_percent"] > 10:
-            issues.append(
-                f"❌ Overshoot too high ({metrics['overshoot_percent']:.1f}%)"
-            )
-        if metrics["velocity_violation_percent"] > 0:
-            issues.append(
-                f"❌ Velocity violation ({metrics['velocity_violation_percent']:.1f}%)"
-            )
-        if metrics["rms_error_deg"] > 1.0:
-            issues.append(f"⚠️  RMS error high ({metrics['rms_error_deg']:.3f}°)")
+    t_accel, t_coast, t_decel, max_vel = trapezoidal_phases(target, max_vel, max_accel)
+    n_samples = int((t_accel + t_coast + t_decel + 0.2) / dt)
+    reference = trapezoidal_profile(
+        np.arange(n_samples) * dt, target, max_vel, max_accel, t_accel, t_coast, t_decel
+    )
 
-        if issues:
-            for issue in issues:
-                print(f"   {issue}")
-        else:
-            print("   ✅ All criteria met!")
+    settings = {
+        "reference": reference,
+        "target": target,
+        "max_vel": max_vel,
+        "max_accel": max_accel,
+        "dt": dt,
+    }
+    # One lockstep batch per worker, in configuration order
+    batch = -(-len(test_configs) // max(1, max_workers))
+    jobs = [
+        (_evaluate_configs, {"configs": test_configs[i : i + batch], **settings})
+        for i in range(0, len(test_configs), batch)
+    ]
+    results = [
+        r for batch_results in map_in_workers(jobs, max_workers) for r in batch_results
+    ]
 
     # Summary table
     print("\n" + "=" * 80)
@@ -2001,6 +2915,11 @@ def tune_controller_gains():
     print("-" * 80)
 
     for r in results:
+        if r["aborted"]:
+            aborted = f"aborted at {r['aborted_at']:.3f}s"
+            print(f"{r['config']['name']:<40} {r['zeta']:>6.3f} {aborted:>30}")
+            continue
+
         settling = f"{r['settling_time']:.2f}s" if r["settling_time"] else "N/A"
         print(
             f"{r['config']['name']:<40} "
@@ -2020,7 +2939,8 @@ def tune_controller_gains():
     valid = [
         r
         for r in results
-        if r["velocity_violation_percent"] == 0
+        if not r["aborted"]
+        and r["velocity_violation_percent"] == 0
         and r["overshoot_percent"] < 10
         and r["config"]["use_improved"]
     ]
@@ -2050,6 +2970,60 @@ def tune_controller_gains():
         return test_configs[2]  # Option 2 as fallback
 
 
+def run_all_sims(best_config: dict, max_workers: Optional[int] = None) -> list[str]:
+    """Run the three demo simulations in parallel worker processes.
+
+    The simulations are independent; each worker builds its own
+    TestDataCollector and writes its own result files. Kernels are compiled
+    with cache=True, so workers load them from the on-disk cache.
+
+    Args:
+        best_config: Controller configuration from tune_controller_gains
+        max_workers: Worker processes (default: one per simulation, capped
+            at the CPU count). With 1 the simulations run in this process,
+            since spawning would only add interpreter start-up time.
+
+    Returns:
+        JSON result paths (trapezoidal, load step, high-speed)
+    """
+    jobs = [
+        (
+            simulate_trapezoidal_motion,
+            {
+                "use_improved_controller": best_config["use_improved"],
+                "kp_pos": best_config["kp_pos"],
+                "kp_vel": best_config["kp_vel"],
+                "ki_vel": best_config["ki_vel"],
+                "kd_vel": best_config["kd_vel"],
+                "kff_vel": best_config.get("kff_vel", 1.0),
+                "kff_accel": best_config.get("kff_accel", 0.0),
+            },
+        ),
+        (simulate_adaptive_control_load_step, {}),
+        (simulate_high_speed_motion, {}),
+    ]
+
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+
+    return map_in_workers(jobs, max_workers)
+
+
+def _render_report(json_file: str):
+    """Write the PDF report for one simulation result (process-pool job)."""
+    test_name = Path(json_file).stem
+    pdf_file = str(Path(json_file).with_suffix("")) + "_report.pdf"
+
+    print(f"\n   Generating: {test_name}_report.pdf")
+
+    try:
+        generator = FocTestReportGenerator(json_file)
+        generator.generate_pdf(pdf_file)
+        print(f"   ✓ Report saved")
+    except Exception as e:
+        print(f"   ❌ Failed: {e}")
+
+
 def main():
     """Generate demo data and reports."""
     print("=" * 60)
@@ -2062,36 +3036,16 @@ def main():
     # Generate demo data
     print("\n🔧 Generating demo FOC telemetry data...")
 
-    json_files = []
-    json_files.append(
-        simulate_trapezoidal_motion(
-            use_improved_controller=best_config["use_improved"],
-            kp_pos=best_config["kp_pos"],
-            kp_vel=best_config["kp_vel"],
-            ki_vel=best_config["ki_vel"],
-            kd_vel=best_config["kd_vel"],
-            kff_vel=best_config.get("kff_vel", 1.0),
-            kff_accel=best_config.get("kff_accel", 0.0),
-        )
-    )
-    json_files.append(simulate_adaptive_control_load_step())
-    json_files.append(simulate_high_speed_motion())
+    json_files = run_all_sims(best_config)
 
     # Generate reports
     print("\n📊 Generating visualization reports...")
 
-    for json_file in json_files:
-        test_name = Path(json_file).stem
-        pdf_file = str(Path(json_file).with_suffix("")) + "_report.pdf"
-
-        print(f"\n   Generating: {test_name}_report.pdf")
-
-        try:
-            generator = FocTestReportGenerator(json_file)
-            generator.generate_pdf(pdf_file)
-            print(f"   ✓ Report saved")
-        except Exception as e:
-            print(f"   ❌ Failed: {e}")
+    # Reports are independent and matplotlib-bound: one worker per report
+    map_in_workers(
+        [(_render_report, {"json_file": json_file}) for json_file in json_files],
+        min(len(json_files), os.cpu_count() or 1),
+    )
 
     # Generate suite summary
     print("\n📊 Generating test suite summary...")
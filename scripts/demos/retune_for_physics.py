@@ -5,6 +5,7 @@ Re-tune controller gains for realistic motor physics.
 This script re-runs controller tuning with MotorDynamics instead of kinematic model.
 """
 
+import math
 import sys
 import numpy as np
 from pathlib import Path
@@ -14,7 +15,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "physics"))
 sys.path.insert(0, str(Path(__file__).parent))
 
 from motor_model import MotorDynamics, MotorParameters
-from demo_visualization import PIDController, calculate_control_metrics
+from demo_visualization import (
+    PIDController,
+    calculate_control_metrics,
+    trapezoidal_phases,
+    trapezoidal_profile,
+)
 
 
 def test_controller_config(config: dict) -> dict:
@@ -26,21 +32,16 @@ def test_controller_config(config: dict) -> dict:
     dt = 0.0001
 
     # Calculate motion phases
-    t_accel = max_vel / max_accel
-    t_coast = 0.0
-    t_decel = t_accel
-
-    x_accel = 0.5 * max_accel * t_accel**2
-    if 2 * x_accel < target:
-        t_coast = (target - 2 * x_accel) / max_vel
-    else:
-        t_accel = np.sqrt(target / max_accel)
-        t_decel = t_accel
-        max_vel = max_accel * t_accel
+    t_accel, t_coast, t_decel, max_vel = trapezoidal_phases(target, max_vel, max_accel)
 
     duration = t_accel + t_coast + t_decel + 0.2
     n_samples = int(duration / dt)
 
+    # Reference trajectory depends only on t: evaluate it up front
+    target_pos_arr, target_vel_arr, target_accel_arr = trapezoidal_profile(
+        np.arange(n_samples) * dt, target, max_vel, max_accel, t_accel, t_coast, t_decel
+    )
+
     # Initialize motor with realistic physics (low friction for tuning)
     motor_params = MotorParameters(
         J=0.001,  # kg·m²
@@ -55,11 +56,19 @@ def test_controller_config(config: dict) -> dict:
     motor.reset(position=0.0, velocity=0.0)
 
     # Storage
-    position_arr = []
-    velocity_arr = []
+    position_arr = np.empty(n_samples)
+    velocity_arr = np.empty(n_samples)
+
+    # Loop constants bound once (no dict/attribute lookups per sample)
+    use_improved = config["use_improved"]
+    kp_pos = config["kp_pos"]
+    kff_vel = config.get("kff_vel", 1.0)
+    kff_accel = config.get("kff_accel", 0.0)
+    accel_to_current = motor_params.J / motor_params.kt
+    motor_update = motor.update
 
     # Initialize controller
-    if config["use_improved"]:
+    if use_improved:
         vel_controller = PIDController(
             kp=config["kp_vel"],
             ki=config["ki_vel"],
@@ -67,79 +76,48 @@ def test_controller_config(config: dict) -> dict:
             max_integral=max_vel,
             max_output=max_accel,
         )
+        pid_update = vel_controller.update
 
-    for i in range(n_samples):
-        t = i * dt
-
-        # Motion profile
-        if t < t_accel:
-            target_vel = max_accel * t
-            target_pos = 0.5 * max_accel * t**2
-            target_accel = max_accel
-        elif t < t_accel + t_coast:
-            target_vel = max_vel
-            target_pos = 0.5 * max_accel * t_accel**2 + max_vel * (t - t_accel)
-            target_accel = 0.0
-        elif t < t_accel + t_coast + t_decel:
-            t_dec = t - t_accel - t_coast
-            target_vel = max_vel - max_accel * t_dec
-            target_pos = (
-                0.5 * max_accel * t_accel**2
-                + max_vel * t_coast
-                + max_vel * t_dec
-                - 0.5 * max_accel * t_dec**2
-            )
-            target_accel = -max_accel
-        else:
-            target_vel = 0.0
-            target_pos = target
-            target_accel = 0.0
+    velocity = 0.0
+    position = 0.0
 
+    for i, (target_pos, target_vel, target_accel) in enumerate(
+        zip(target_pos_arr.tolist(), target_vel_arr.tolist(), target_accel_arr.tolist())
+    ):
         # Controller
-        pos_error = target_pos - motor.position
+        pos_error = target_pos - position
 
-        if config["use_improved"]:
+        if use_improved:
             # Cascade control
-            target_vel_from_pos = config["kp_pos"] * pos_error
-            target_vel_from_pos = np.clip(target_vel_from_pos, -max_vel, max_vel)
-
-            kff_vel = config.get("kff_vel", 1.0)
-            kff_accel = config.get("kff_accel", 0.0)
+            target_vel_from_pos = kp_pos * pos_error
+            target_vel_from_pos = min(max_vel, max(-max_vel, target_vel_from_pos))
 
             target_vel_combined = kff_vel * target_vel + target_vel_from_pos
 
-            vel_error = target_vel_combined - motor.velocity
-            accel_fb = vel_controller.update(vel_error, dt, feedforward=0.0)
+            vel_error = target_vel_combined - velocity
+            accel_fb = pid_update(vel_error, dt)
 
             accel_ff = kff_accel * target_accel
             accel = accel_fb + accel_ff
-            accel = np.clip(accel, -max_accel, max_accel)
-
-            # Convert to current
-            desired_torque = motor_params.J * accel
-            i_q = desired_torque / motor_params.kt
-            i_q = np.clip(i_q, -10.0, 10.0)
+            accel = min(max_accel, max(-max_accel, accel))
         else:
-            # Original broken controller
-            vel_error = target_vel - motor.velocity
-            kp_pos_orig = 20.0
-            kp_vel_orig = 0.5
+            # Original broken controller (kp_pos_orig=20.0, kp_vel_orig=0.5)
+            vel_error = target_vel - velocity
+            accel = 20.0 * pos_error + 0.5 * vel_error
 
-            accel = kp_pos_orig * pos_error + kp_vel_orig * vel_error
-            desired_torque = motor_params.J * accel
-            i_q = desired_torque / motor_params.kt
-            i_q = np.clip(i_q, -10.0, 10.0)
+        # Convert to current
+        i_q = accel * accel_to_current
+        i_q = min(10.0, max(-10.0, i_q))
 
         # Update motor dynamics
-        state = motor.update(i_q, external_load=0.0, dt=dt)
+        state = motor_update(i_q, external_load=0.0, dt=dt)
+        position = state["position"]
+        velocity = state["velocity"]
 
-        position_arr.append(state["position"])
-        velocity_arr.append(state["velocity"])
+        position_arr[i] = position
+        velocity_arr[i] = velocity
 
     # Calculate metrics
-    position_arr = np.array(position_arr)
-    velocity_arr = np.array(velocity_arr)
-
     metrics = calculate_control_metrics(
         position_arr,
         target,  # Scalar target
@@ -240,7 +218,7 @@ def main():
         metrics = test_controller_config(config)
 
         # Calculate damping ratio and natural frequency
-        omega_n = np.sqrt(config["kp_pos"])
+        omega_n = math.sqrt(config["kp_pos"])
         zeta = config["kp_vel"] / (2 * omega_n) if omega_n > 0 else 0
 
         print(f"   ωn={omega_n:.2f} rad/s, ζ={zeta:.3f}")
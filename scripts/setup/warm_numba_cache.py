@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Pre-compile the Numba simulation kernels into the on-disk cache.
+
+The demo, analysis and MPC scripts JIT-compile their kernels with cache=True, so
+only the very first run pays the compile time. Run this once after
+installing requirements-viz.txt (e.g. in a Docker/CI setup step) so that
+first run is fast too.
+
+Usage:
+    python3 scripts/setup/warm_numba_cache.py
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR / "demos"))
+sys.path.insert(0, str(SCRIPTS_DIR / "analysis"))
+sys.path.insert(0, str(SCRIPTS_DIR.parent / "mpc"))
+
+
+def warm_demo_kernels():
+    """Run the gain sweep and each demo simulation once.
+
+    Simulation results go to a temporary directory.
+    """
+    import demo_visualization as demo
+
+    demo.tune_controller_gains()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            demo.simulate_trapezoidal_motion()
+            demo.simulate_trapezoidal_motion(trajectory_type="scurve")
+            demo.simulate_adaptive_control_load_step()
+            demo.simulate_high_speed_motion()
+        finally:
+            os.chdir(cwd)
+
+    t = np.arange(200) * 1e-3
+    response = 1.0 - np.exp(-5.0 * t) * np.cos(30.0 * t)
+    demo.calculate_control_metrics(response, 1.0, np.gradient(response), 2.0, 1e-3)
+    demo.detect_resonance_frequency(t, response, 1.0, 1e-3)
+    demo.generate_scurve_trajectory(0.1, 1.57, 2.0, 5.0, 100.0)
+
+
+def warm_analysis_kernels():
+    """Compile the analysis kernels (compare_trajectories compiles on import)."""
+    import analyze_tracking_error
+    import compare_trajectories  # noqa: F401
+
+    x = np.zeros(4)
+    analyze_tracking_error._phase_stats(x)
+    analyze_tracking_error._zero_crossings(x)
+
+
+def warm_mpc_kernels():
+    """Compile the MPC simulation step (skipped when osqp is not installed)."""
+    try:
+        import mpc_controller
+    except ImportError:
+        return
+
+    x = np.zeros(3)
+    noise = np.zeros((1, 3))
+    mpc_controller._advance(x, np.eye(3), np.zeros(3), 0.0, noise[0], np.empty(3))
+
+
+def main():
+    """Warm every cached kernel and report the time taken."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        warm_demo_kernels()
+        warm_analysis_kernels()
+        warm_mpc_kernels()
+    print(f"✓ Numba kernel cache ready ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()